@@ -0,0 +1,176 @@
+import csv
+import math
+import os
+import time
+
+# Seleção adaptativa de operadores (multi-armed bandit).
+# Cada braço é um operador de um dos registros de main.py (CROSSOVERS,
+# MUTACOES); a recompensa é a melhoria de fitness por segundo de CPU
+# gasto no operador.
+
+
+class PoliticaUCB:
+    """
+    UCB1 com recompensas normalizadas pela maior recompensa já vista,
+    para que o termo de exploração fique na mesma escala.
+    """
+
+    def __init__(self, nomes, c=math.sqrt(2)):
+        self.c = c
+        self.usos = {nome: 0 for nome in nomes}
+        self.somas = {nome: 0.0 for nome in nomes}
+        self.maior = 0.0
+        self.total = 0
+
+    def escolhe(self, rng):
+        for nome, usos in self.usos.items():
+            if usos == 0:
+                return nome
+        escala = self.maior if self.maior > 0 else 1.0
+        log_total = math.log(self.total)
+        return max(
+            self.usos,
+            key=lambda nome: self.somas[nome] / (self.usos[nome] * escala)
+            + self.c * math.sqrt(log_total / self.usos[nome])
+        )
+
+    def atualiza(self, nome, recompensa):
+        self.usos[nome] += 1
+        self.somas[nome] += recompensa
+        self.maior = max(self.maior, recompensa)
+        self.total += 1
+
+
+class PoliticaProbabilidade:
+    """
+    Probability matching: a qualidade de cada operador é uma média móvel
+    das recompensas e a chance de escolha é proporcional a ela, com um
+    piso `p_min` para nenhum operador deixar de ser testado.
+    """
+
+    def __init__(self, nomes, p_min=0.05, alfa=0.3):
+        self.nomes = list(nomes)
+        self.p_min = min(p_min, 1.0 / len(self.nomes))
+        self.alfa = alfa
+        self.qualidade = {nome: 1.0 for nome in self.nomes}
+
+    def escolhe(self, rng):
+        soma = sum(self.qualidade.values())
+        k = len(self.nomes)
+        ponto = rng.random()
+        acumulado = 0.0
+        for nome in self.nomes:
+            if soma > 0:
+                acumulado += self.p_min + (1 - k * self.p_min) * self.qualidade[nome] / soma
+            else:
+                acumulado += 1.0 / k
+            if acumulado >= ponto:
+                return nome
+        return self.nomes[-1]
+
+    def atualiza(self, nome, recompensa):
+        self.qualidade[nome] += self.alfa * (recompensa - self.qualidade[nome])
+
+
+POLITICAS = {
+    'ucb': PoliticaUCB,
+    'probabilidade': PoliticaProbabilidade,
+}
+
+
+class OperadorAdaptativo:
+    """
+    Base dos operadores adaptativos: escolhe um operador do registro pela
+    política, mede o tempo de CPU da aplicação e acumula o traço por geração.
+    """
+
+    def __init__(self, operadores, politica='ucb', **politica_args):
+        self.operadores = dict(operadores)
+        self.politica = POLITICAS[politica](self.operadores, **politica_args)
+        self.avaliacoes = 0
+        self.traco = []
+        self._geracao = self._novo_acumulador()
+
+    def _novo_acumulador(self):
+        return {nome: [0, 0.0, 0.0] for nome in self.operadores}  # usos, recompensa, cpu
+
+    def _registra(self, nome, melhoria, cpu):
+        recompensa = max(melhoria, 0) / max(cpu, 1e-9)
+        self.politica.atualiza(nome, recompensa)
+        acumulado = self._geracao[nome]
+        acumulado[0] += 1
+        acumulado[1] += recompensa
+        acumulado[2] += cpu
+
+    def _avalia(self, ind):
+        if ind.conflitos is None:
+            self.avaliacoes += 1
+        return ind.fitness()
+
+    def fecha_geracao(self, geracao):
+        """Fecha a geração no traço: usos, recompensa média e CPU por operador."""
+        for nome, (usos, recompensa, cpu) in self._geracao.items():
+            self.traco.append({
+                'geracao': geracao,
+                'operador': nome,
+                'usos': usos,
+                'recompensa_media': recompensa / usos if usos else 0.0,
+                'tempo_cpu': cpu,
+            })
+        self._geracao = self._novo_acumulador()
+
+    def usos_totais(self):
+        totais = {nome: 0 for nome in self.operadores}
+        for registro in self.traco:
+            totais[registro['operador']] += registro['usos']
+        return totais
+
+
+class CrossoverAdaptativo(OperadorAdaptativo):
+    """
+    Usado no lugar de uma função de crossover: a recompensa é o quanto o
+    melhor filho supera o melhor pai, dividido pelo CPU do crossover.
+    """
+
+    def __call__(self, pai1, pai2, rng):
+        nome = self.politica.escolhe(rng)
+        inicio = time.process_time()
+        f1, f2 = self.operadores[nome](pai1, pai2, rng=rng)
+        cpu = time.process_time() - inicio
+        melhoria = max(self._avalia(f1), self._avalia(f2)) - max(self._avalia(pai1), self._avalia(pai2))
+        self._registra(nome, melhoria, cpu)
+        return f1, f2
+
+
+class MutacaoAdaptativa(OperadorAdaptativo):
+    """
+    Usado no lugar de uma função de mutação: a recompensa é a melhoria do
+    indivíduo causada pela mutação, dividida pelo CPU da mutação.
+    """
+
+    # O indivíduo sai da mutação já avaliado (e a avaliação já contada):
+    # a população não precisa descartar e recalcular o fitness
+    avalia_mutado = True
+
+    def __call__(self, individuo, rng):
+        nome = self.politica.escolhe(rng)
+        antes = self._avalia(individuo)
+        inicio = time.process_time()
+        self.operadores[nome](individuo, rng=rng)
+        cpu = time.process_time() - inicio
+        individuo.calc_conflitos()
+        self.avaliacoes += 1
+        self._registra(nome, individuo.fitness() - antes, cpu)
+
+
+def salva_traco_csv(operadores_adaptativos, n, filename='resultados_operadores_adaptativos.csv'):
+    """Acrescenta os traços de operadores de uma execução ao CSV, com o valor de n."""
+    file_exists = os.path.isfile(filename)
+    with open(filename, 'a', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['n', 'tipo', 'geracao', 'operador', 'usos',
+                                               'recompensa_media', 'tempo_cpu'])
+        if not file_exists:
+            writer.writeheader()
+        for tipo, operador in operadores_adaptativos.items():
+            for registro in operador.traco:
+                writer.writerow({'n': n, 'tipo': tipo, **registro})
@@ -0,0 +1,87 @@
+import numpy as np
+
+
+class FluxoAleatorio:
+    """
+    Fluxo de números aleatórios de uma execução do AG.
+
+    Usa um numpy.random.Generator próprio e sorteia os uniformes em blocos
+    vetorizados, entregando-os um a um. Expõe a mesma interface usada do
+    módulo random (random, uniform, randrange, choice, sample, shuffle),
+    então pode ser passado como `rng` para os operadores e a população.
+    """
+
+    def __init__(self, seed=None, tamanho_bloco=4096):
+        self.gerador = np.random.default_rng(seed)
+        self.tamanho_bloco = tamanho_bloco
+        self._bloco = []
+        self._pos = 0
+
+    def _recarrega(self):
+        self._bloco = self.gerador.random(self.tamanho_bloco).tolist()
+        self._pos = 0
+
+    def random(self):
+        """Uniforme em [0, 1), retirado do bloco pré-sorteado."""
+        if self._pos >= len(self._bloco):
+            self._recarrega()
+        valor = self._bloco[self._pos]
+        self._pos += 1
+        return valor
+
+    def uniform(self, a, b):
+        return a + (b - a) * self.random()
+
+    def randrange(self, start, stop=None):
+        if stop is None:
+            start, stop = 0, start
+        if stop <= start:
+            raise ValueError("Intervalo vazio em randrange")
+        return start + int(self.random() * (stop - start))
+
+    def randint(self, a, b):
+        return self.randrange(a, b + 1)
+
+    def choice(self, seq):
+        if not seq:
+            raise IndexError("Não é possível escolher de uma sequência vazia")
+        return seq[self.randrange(len(seq))]
+
+    def sample(self, population, k):
+        """Amostra k elementos distintos, sem reposição."""
+        n = len(population)
+        if not 0 <= k <= n:
+            raise ValueError("Amostra maior que a população")
+        if k * 4 <= n:
+            # Poucos elementos: rejeição de índices repetidos, sem copiar a sequência
+            escolhidos = set()
+            resultado = []
+            while len(resultado) < k:
+                j = self.randrange(n)
+                if j not in escolhidos:
+                    escolhidos.add(j)
+                    resultado.append(population[j])
+            return resultado
+        pool = list(population)
+        for i in range(k):
+            j = i + int(self.random() * (n - i))
+            pool[i], pool[j] = pool[j], pool[i]
+        return pool[:k]
+
+    def shuffle(self, x):
+        """Embaralha a lista no lugar (Fisher-Yates)."""
+        for i in range(len(x) - 1, 0, -1):
+            j = int(self.random() * (i + 1))
+            x[i], x[j] = x[j], x[i]
+
+
+def cria_fluxo(seed=None, *ids, tamanho_bloco=4096):
+    """
+    Cria o fluxo de uma execução a partir da semente e de identificadores
+    extras (índice da execução, do worker etc.). O mesmo par (seed, ids)
+    gera sempre a mesma sequência, independente de quantos processos rodam.
+    """
+    if seed is None:
+        return FluxoAleatorio(tamanho_bloco=tamanho_bloco)
+    sequencia = np.random.SeedSequence(seed, spawn_key=tuple(ids))
+    return FluxoAleatorio(sequencia, tamanho_bloco=tamanho_bloco)
@@ -0,0 +1,209 @@
+import os
+import numpy as np
+from individuo import Individuo
+from aleatorio import cria_fluxo
+from inicializacao import gera_genes
+from lote import fitness_lote, permutacoes_lote, elites_indices, reproduz_bloco
+
+# Layout binário fixo de um arquivo de população (little-endian):
+#   cabeçalho de 64 bytes (CABECALHO_DTYPE + preenchimento)
+#   genes:   int32[tamanho, n], em ordem de linhas
+#   fitness: int64[tamanho]
+MAGICO = b'NRAINHAS'
+VERSAO = 1
+TAMANHO_CABECALHO = 64
+CABECALHO_DTYPE = np.dtype([
+    ('magico', 'S8'),
+    ('versao', '<u4'),
+    ('n', '<u4'),
+    ('tamanho', '<u8'),
+    ('geracao', '<u8'),
+])
+GENES_DTYPE = np.dtype('<i4')
+FITNESS_DTYPE = np.dtype('<i8')
+
+
+class ArmazenamentoMemmap:
+    """
+    Genes e fitness de uma população mapeados em um arquivo via np.memmap.
+    Os dados ficam no disco e só as páginas acessadas vão para a memória,
+    então outros processos podem abrir o mesmo arquivo e ler sem cópia.
+    """
+
+    def __init__(self, caminho, modo='r'):
+        self.caminho = caminho
+        self._cabecalho = np.memmap(caminho, dtype=CABECALHO_DTYPE, mode=modo, shape=(1,))
+        if self._cabecalho['magico'][0] != MAGICO:
+            raise ValueError(f"{caminho} não é um arquivo de população")
+        if self._cabecalho['versao'][0] != VERSAO:
+            raise ValueError(f"Versão de arquivo não suportada: {self._cabecalho['versao'][0]}")
+        self.n = int(self._cabecalho['n'][0])
+        self.tamanho = int(self._cabecalho['tamanho'][0])
+        offset_fitness = TAMANHO_CABECALHO + self.tamanho * self.n * GENES_DTYPE.itemsize
+        self.genes = np.memmap(caminho, dtype=GENES_DTYPE, mode=modo,
+                               offset=TAMANHO_CABECALHO, shape=(self.tamanho, self.n))
+        self.fitness = np.memmap(caminho, dtype=FITNESS_DTYPE, mode=modo,
+                                 offset=offset_fitness, shape=(self.tamanho,))
+
+    @classmethod
+    def cria(cls, caminho, n, tamanho):
+        """Cria (ou sobrescreve) o arquivo com o tamanho final, sem preencher os dados."""
+        cabecalho = np.zeros(1, dtype=CABECALHO_DTYPE)
+        cabecalho['magico'] = MAGICO
+        cabecalho['versao'] = VERSAO
+        cabecalho['n'] = n
+        cabecalho['tamanho'] = tamanho
+        total = TAMANHO_CABECALHO + tamanho * (n * GENES_DTYPE.itemsize + FITNESS_DTYPE.itemsize)
+        with open(caminho, 'wb') as f:
+            f.write(cabecalho.tobytes().ljust(TAMANHO_CABECALHO, b'\0'))
+            f.truncate(total)
+        return cls(caminho, modo='r+')
+
+    @classmethod
+    def abre(cls, caminho):
+        """Abre um snapshot somente para leitura (ex.: em plotar_results.py)."""
+        return cls(caminho, modo='r')
+
+    @property
+    def geracao(self):
+        return int(self._cabecalho['geracao'][0])
+
+    @geracao.setter
+    def geracao(self, valor):
+        self._cabecalho['geracao'] = valor
+
+    def flush(self):
+        """Garante que o arquivo em disco reflete o estado atual."""
+        self._cabecalho.flush()
+        self.genes.flush()
+        self.fitness.flush()
+
+
+class PopulacaoMemmap:
+    """
+    População fora da memória, com a mesma interface de Populacao.
+
+    Mantém dois arquivos (geração atual e próxima) e processa os indivíduos
+    em blocos de `tamanho_bloco` linhas, de forma que só o vetor de fitness
+    e um bloco de genes precisam estar na memória ao mesmo tempo.
+    """
+
+    def __init__(self, n, tamanho, diretorio, rng=None, tamanho_bloco=4096):
+        if n < 4:
+            raise ValueError("Para n-rainhas, n deve ser >= 4")
+        self.n = n
+        self.tamanho = tamanho
+        self.rng = rng if rng is not None else cria_fluxo()
+        self.tamanho_bloco = tamanho_bloco
+        # Contadores da execução (ver contadores())
+        self.avaliacoes = 0
+        self.avaliacoes_cache = 0
+        self.filhos = 0
+        self.crossovers = 0
+        self.mutacoes = 0
+        os.makedirs(diretorio, exist_ok=True)
+        self.atual = ArmazenamentoMemmap.cria(os.path.join(diretorio, 'populacao_a.bin'), n, tamanho)
+        self.proxima = ArmazenamentoMemmap.cria(os.path.join(diretorio, 'populacao_b.bin'), n, tamanho)
+
+    def _blocos(self, inicio=0):
+        for ini in range(inicio, self.tamanho, self.tamanho_bloco):
+            yield ini, min(ini + self.tamanho_bloco, self.tamanho)
+
+    def inicializa(self, estrategia=None, proporcao_heuristica=1.0, **estrategia_args):
+        """
+        Gera a população inicial bloco a bloco: permutações aleatórias ou,
+        com `estrategia`, como em Populacao.inicializa.
+        """
+        for ini, fim in self._blocos():
+            if estrategia is None:
+                self.atual.genes[ini:fim] = permutacoes_lote(self.rng.gerador, fim - ini, self.n)
+            else:
+                self.atual.genes[ini:fim] = gera_genes(
+                    self.n, fim - ini, estrategia, self.rng, proporcao_heuristica, **estrategia_args
+                )
+        self.atual.geracao = 0
+
+    def avalia(self):
+        """Avalia o fitness de todos os indivíduos da geração atual."""
+        for ini, fim in self._blocos():
+            self.atual.fitness[ini:fim] = fitness_lote(self.atual.genes[ini:fim])
+        self.avaliacoes += self.tamanho
+
+    def contadores(self):
+        """Avaliações, acertos de cache, filhos, crossovers e mutações até agora."""
+        return {
+            'avaliacoes': self.avaliacoes,
+            'avaliacoes_cache': self.avaliacoes_cache,
+            'filhos': self.filhos,
+            'crossovers': self.crossovers,
+            'mutacoes': self.mutacoes,
+        }
+
+    def melhor(self):
+        """Retorna o indivíduo com maior fitness como um Individuo."""
+        idx = int(np.argmax(self.atual.fitness))
+        ind = Individuo(self.n, self.atual.genes[idx].tolist())
+        ind.fitness()
+        return ind
+
+    def estatisticas(self):
+        """Retorna (máximo, média, mínimo) do fitness da geração atual."""
+        fitness = self.atual.fitness
+        return int(fitness.max()), float(fitness.mean()), int(fitness.min())
+
+    def snapshot(self):
+        """Grava a geração atual em disco e retorna o caminho do arquivo."""
+        self.atual.flush()
+        return self.atual.caminho
+
+    def injeta_imigrantes(self, quantidade):
+        """Substitui os `quantidade` piores indivíduos por novos aleatórios."""
+        quantidade = min(quantidade, self.tamanho)
+        if quantidade <= 0:
+            return
+        piores = np.sort(np.argpartition(self.atual.fitness, quantidade - 1)[:quantidade])
+        novos = permutacoes_lote(self.rng.gerador, quantidade, self.n)
+        self.atual.genes[piores] = novos
+        self.atual.fitness[piores] = fitness_lote(novos)
+        self.avaliacoes += quantidade
+
+    def gera_nova_geracao(
+        self,
+        selecao,
+        crossover,
+        p_crossover,
+        mutacao,
+        p_mutacao,
+        elitismo,
+        elitismo_args=None
+    ):
+        """
+        Mesmos parâmetros de Populacao.gera_nova_geracao. A seleção e o
+        elitismo são feitos por índices sobre o vetor de fitness (ver lote.py);
+        crossover e mutação usam os operadores escalares de operadores.py.
+        """
+        atual, proxima = self.atual, self.proxima
+        fitness = np.asarray(atual.fitness)
+
+        elites = elites_indices(fitness, elitismo, elitismo_args)[:self.tamanho]
+        k = len(elites)
+        self.avaliacoes_cache += k
+        for ini in range(0, k, self.tamanho_bloco):
+            idx = np.sort(elites[ini:ini + self.tamanho_bloco])
+            proxima.genes[ini:ini + len(idx)] = atual.genes[idx]
+            proxima.fitness[ini:ini + len(idx)] = fitness[idx]
+
+        for ini, fim in self._blocos(k):
+            filhos, crossovers, mutacoes = reproduz_bloco(
+                atual.genes, fitness, fim - ini, selecao, crossover, p_crossover,
+                mutacao, p_mutacao, self.rng
+            )
+            proxima.genes[ini:fim] = filhos
+            proxima.fitness[ini:fim] = fitness_lote(filhos)
+            self.avaliacoes += fim - ini
+            self.filhos += fim - ini
+            self.crossovers += crossovers
+            self.mutacoes += mutacoes
+
+        proxima.geracao = atual.geracao + 1
+        self.atual, self.proxima = proxima, atual
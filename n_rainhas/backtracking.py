@@ -0,0 +1,138 @@
+import argparse
+import csv
+import multiprocessing
+import os
+import time
+from banco import BancoResultados
+
+# Solver exato por backtracking com bitmasks, usado como referência para
+# comparar com o AG. As colunas são preenchidas em ordem; para cada coluna,
+# os bits livres indicam as linhas que não são atacadas pelas anteriores.
+
+
+def _conta(n, linhas, diag1, diag2):
+    """Conta as soluções que completam o tabuleiro a partir das máscaras."""
+    completo = (1 << n) - 1
+    if linhas == completo:
+        return 1
+    total = 0
+    livres = ~(linhas | diag1 | diag2) & completo
+    while livres:
+        bit = livres & -livres
+        livres ^= bit
+        total += _conta(n, linhas | bit, ((diag1 | bit) << 1) & completo, (diag2 | bit) >> 1)
+    return total
+
+
+def _primeira(n, linhas, diag1, diag2, genes):
+    """Busca em profundidade pela primeira solução; preenche `genes` e retorna True se achar."""
+    completo = (1 << n) - 1
+    if linhas == completo:
+        return True
+    livres = ~(linhas | diag1 | diag2) & completo
+    while livres:
+        bit = livres & -livres
+        livres ^= bit
+        genes.append(bit.bit_length() - 1)
+        if _primeira(n, linhas | bit, ((diag1 | bit) << 1) & completo, (diag2 | bit) >> 1, genes):
+            return True
+        genes.pop()
+    return False
+
+
+def _resolve_ramo(args):
+    """
+    Resolve o ramo com a rainha da primeira coluna na linha `linha0`:
+    devolve a primeira solução, o instante em que foi achada e o total.
+    """
+    n, linha0, peso = args
+    bit = 1 << linha0
+    mascaras = (bit, (bit << 1) & ((1 << n) - 1), bit >> 1)
+    genes = [linha0]
+    achou = _primeira(n, *mascaras, genes)
+    instante_primeira = time.time() if achou else None
+    total = _conta(n, *mascaras)
+    return {
+        'genes': genes if achou else None,
+        'instante_primeira': instante_primeira,
+        'total': total * peso,
+    }
+
+
+def resolve(n, processos=None):
+    """
+    Conta as soluções de n-rainhas e acha uma delas, dividindo o trabalho por
+    linha da rainha na primeira coluna. Pela simetria de espelho, só a metade
+    de cima é explorada e conta em dobro (a linha do meio, se n for ímpar, conta uma vez).
+    """
+    tarefas = [(n, linha, 2) for linha in range(n // 2)]
+    if n % 2 == 1:
+        tarefas.append((n, n // 2, 1))
+
+    inicio = time.time()
+    with multiprocessing.Pool(processes=processos) as pool:
+        ramos = pool.map(_resolve_ramo, tarefas)
+    fim = time.time()
+
+    achados = [r for r in ramos if r['genes'] is not None]
+    primeiro = min(achados, key=lambda r: r['instante_primeira']) if achados else None
+    return {
+        'total_solucoes': sum(r['total'] for r in ramos),
+        'genes': primeiro['genes'] if primeiro else None,
+        'tempo_primeira_solucao': primeiro['instante_primeira'] - inicio if primeiro else None,
+        'tempo_execucao': fim - inicio,
+    }
+
+
+def registro_resultado(n, resultado):
+    """
+    Converte o resultado para as mesmas colunas de resultados_variacoes.csv
+    (gerações = 0, fitness máximo = max_pairs), mais o total de soluções e
+    o tempo até a primeira solução.
+    """
+    max_pairs = n * (n - 1) // 2
+    solucionado = resultado['genes'] is not None
+    fitness = max_pairs if solucionado else None
+    return {
+        'variacao': 'BACKTRACKING',
+        'n': n,
+        'max_fitness': fitness,
+        'mean_fitness': fitness,
+        'min_fitness': fitness,
+        'gens_to_solve': 0 if solucionado else None,
+        'solved': solucionado,
+        'tempo_execucao': resultado['tempo_execucao'],
+        'tempo_primeira_solucao': resultado['tempo_primeira_solucao'],
+        'total_solucoes': resultado['total_solucoes'],
+    }
+
+
+def salvar_resultado_em_csv(dados, filename='resultados_backtracking.csv'):
+    file_exists = os.path.isfile(filename)
+    with open(filename, 'a', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=dados.keys())
+        if not file_exists:
+            writer.writeheader()
+        writer.writerow(dados)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Backtracking exato (bitmask) para n-Rainhas')
+    parser.add_argument('--n-min', type=int, default=4)
+    parser.add_argument('--n-max', type=int, default=14)
+    parser.add_argument('--processos', type=int, default=None)
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    banco = BancoResultados()
+    for n in range(args.n_min, args.n_max + 1):
+        resultado = resolve(n, processos=args.processos)
+        registro = registro_resultado(n, resultado)
+        salvar_resultado_em_csv(registro)
+        banco.registra('backtracking', 'BACKTRACKING', registro, {'n': n, 'processos': args.processos})
+        banco.flush()  # cada n pode levar minutos: grava já
+        print(f"n={n}: {resultado['total_solucoes']} soluções, primeira em "
+              f"{resultado['tempo_primeira_solucao']:.4f}s, total {resultado['tempo_execucao']:.2f}s")
+    banco.fecha()
@@ -0,0 +1,299 @@
+import argparse
+import csv
+import glob
+import json
+import math
+import os
+import sqlite3
+from cache import chave_execucao, _serializavel
+
+# Banco SQLite único para os resultados de todos os runners, no lugar dos
+# CSVs com esquemas diferentes. Esquema normalizado:
+#   configs  - uma linha por configuração distinta (hash do JSON)
+#   runs     - uma linha por execução: experimento, variante, n, seed e as
+#              métricas comuns; o que não tem coluna própria vai em `extras`
+#   geracoes - estatísticas por geração de cada execução
+# As escritas são agrupadas em transações de `tamanho_lote` execuções e o
+# banco usa WAL, então workers de um Pool podem gravar ao mesmo tempo.
+
+BANCO_PADRAO = 'resultados.db'
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS configs (
+    id INTEGER PRIMARY KEY,
+    hash TEXT UNIQUE NOT NULL,
+    parametros TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    experimento TEXT NOT NULL,
+    variante TEXT,
+    config_id INTEGER REFERENCES configs(id),
+    n INTEGER,
+    seed INTEGER,
+    execucao INTEGER,
+    max_fitness REAL,
+    mean_fitness REAL,
+    min_fitness REAL,
+    gens_to_solve INTEGER,
+    solved INTEGER,
+    tempo REAL,
+    evaluations INTEGER,
+    evals_per_sec REAL,
+    gens_per_sec REAL,
+    extras TEXT
+);
+CREATE TABLE IF NOT EXISTS geracoes (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    geracao INTEGER NOT NULL,
+    f_max REAL,
+    f_medio REAL,
+    f_min REAL,
+    PRIMARY KEY (run_id, geracao)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_runs_variante ON runs(experimento, variante);
+CREATE INDEX IF NOT EXISTS idx_runs_n ON runs(n);
+CREATE INDEX IF NOT EXISTS idx_runs_seed ON runs(seed);
+"""
+
+# Nomes aceitos para cada coluna de `runs` (CSVs em inglês e em português,
+# resumos de main.executar)
+SINONIMOS = {
+    'n': ['n', 'n_rainhas'],
+    'seed': ['seed', 'semente'],
+    'execucao': ['execucao'],
+    'max_fitness': ['max_fitness', 'fitness_maximo', 'melhor_fitness'],
+    'mean_fitness': ['mean_fitness', 'fitness_medio'],
+    'min_fitness': ['min_fitness', 'fitness_minimo'],
+    'gens_to_solve': ['gens_to_solve', 'geracoes_para_solucao'],
+    'solved': ['solved', 'solucionado'],
+    'tempo': ['tempo', 'tempo_s', 'tempo_execucao'],
+    'evaluations': ['evaluations', 'avaliacoes'],
+    'evals_per_sec': ['evals_per_sec', 'avaliacoes_por_s'],
+    'gens_per_sec': ['gens_per_sec', 'geracoes_por_s'],
+}
+COLUNAS_RUN = list(SINONIMOS)
+# Coluna que identifica a variante em cada CSV (a primeira presente)
+COLUNAS_VARIANTE = ['variante', 'variacao', 'selecao', 'crossover', 'elitismo',
+                    'mutacao', 'inicializacao', 'max_gens', 'pop_size']
+
+
+def variante_de(config):
+    """Nome da variante de uma config: 'variante' se houver, senão os operadores."""
+    if config.get('variante'):
+        return config['variante']
+    partes = [str(config[chave]) for chave in ('selecao', 'crossover', 'mutacao', 'elitismo') if chave in config]
+    return '/'.join(partes) or None
+
+
+def _booleano(valor):
+    if isinstance(valor, bool) or valor is None:
+        return valor
+    return str(valor).strip().lower() in ('true', 'sim', '1')
+
+
+def _numero(valor):
+    """Converte texto de CSV em número; vazio, 'None' e NaN viram None."""
+    if valor is None or valor == '' or valor == 'None':
+        return None
+    if isinstance(valor, (int, float)):
+        return None if isinstance(valor, float) and math.isnan(valor) else valor
+    try:
+        numero = float(valor)
+    except ValueError:
+        return None
+    if math.isnan(numero):
+        return None
+    return int(numero) if numero.is_integer() else numero
+
+
+def normaliza_registro(registro):
+    """
+    Separa um registro (linha de CSV ou resumo de execução) nas colunas de
+    `runs` e num dict de extras com o resto.
+    """
+    colunas = {}
+    usados = set()
+    for coluna, nomes in SINONIMOS.items():
+        for nome in nomes:
+            if nome in registro:
+                colunas[coluna] = registro[nome]
+                usados.add(nome)
+                break
+    for coluna in COLUNAS_RUN:
+        if coluna == 'solved':
+            colunas[coluna] = _booleano(colunas.get(coluna))
+        else:
+            colunas[coluna] = _numero(colunas.get(coluna))
+    if colunas['gens_to_solve'] is not None and colunas['gens_to_solve'] < 0:
+        colunas['gens_to_solve'] = None  # -1 marca "não resolveu" em parte0
+    extras = {chave: valor for chave, valor in registro.items() if chave not in usados}
+    return colunas, extras
+
+
+class BancoResultados:
+    """
+    Acesso ao banco de resultados. registra() acumula as execuções e
+    flush() grava o lote pendente numa única transação (também chamado
+    a cada `tamanho_lote` execuções e ao fechar).
+    """
+
+    def __init__(self, caminho=BANCO_PADRAO, tamanho_lote=100):
+        self.caminho = caminho
+        self.tamanho_lote = tamanho_lote
+        self.conexao = sqlite3.connect(caminho, timeout=60)
+        self.conexao.execute('PRAGMA journal_mode=WAL')
+        self.conexao.execute('PRAGMA synchronous=NORMAL')
+        self.conexao.executescript(ESQUEMA)
+        self._pendentes = []
+
+    def registra(self, experimento, variante, registro, config=None, geracoes=None):
+        """
+        Enfileira uma execução. `registro` é o dict de resultados (nomes em
+        inglês ou português), `config` os parâmetros da execução e
+        `geracoes` uma lista de (geração, f_max, f_medio, f_min).
+        """
+        # Cópias: os runners reaproveitam o mesmo dict de config entre execuções
+        self._pendentes.append((experimento, variante, dict(registro), dict(config or {}), list(geracoes or [])))
+        if len(self._pendentes) >= self.tamanho_lote:
+            self.flush()
+
+    def _config_id(self, config):
+        # A seed fica em runs: execuções que só diferem nela compartilham a config
+        config = {chave: valor for chave, valor in config.items() if chave != 'seed'}
+        chave = chave_execucao(config, None, None)
+        self.conexao.execute(
+            'INSERT OR IGNORE INTO configs (hash, parametros) VALUES (?, ?)',
+            (chave, json.dumps(config, sort_keys=True, default=_serializavel))
+        )
+        return self.conexao.execute('SELECT id FROM configs WHERE hash = ?', (chave,)).fetchone()[0]
+
+    def flush(self):
+        if not self._pendentes:
+            return
+        with self.conexao:  # uma transação para o lote todo
+            for experimento, variante, registro, config, geracoes in self._pendentes:
+                colunas, extras = normaliza_registro(registro)
+                if colunas['n'] is None and 'n' in config:
+                    colunas['n'] = config['n']
+                if colunas['seed'] is None and config.get('seed') is not None:
+                    colunas['seed'] = config['seed']
+                cursor = self.conexao.execute(
+                    f"INSERT INTO runs (experimento, variante, config_id, {', '.join(COLUNAS_RUN)}, extras) "
+                    f"VALUES (?, ?, ?, {', '.join('?' * len(COLUNAS_RUN))}, ?)",
+                    (experimento, None if variante is None else str(variante), self._config_id(config),
+                     *(colunas[c] for c in COLUNAS_RUN),
+                     json.dumps(extras, default=_serializavel) if extras else None)
+                )
+                if geracoes:
+                    self.conexao.executemany(
+                        'INSERT OR REPLACE INTO geracoes VALUES (?, ?, ?, ?, ?)',
+                        [(cursor.lastrowid, *linha) for linha in geracoes]
+                    )
+        self._pendentes = []
+
+    def importa_csv(self, caminho, experimento=None):
+        """
+        Importa um resultados_*.csv; o experimento padrão vem do nome do
+        arquivo (resultados_selecao.csv -> 'selecao'). Retorna quantas linhas.
+        """
+        if experimento is None:
+            experimento = os.path.splitext(os.path.basename(caminho))[0].replace('resultados_', '', 1)
+        with open(caminho, newline='', encoding='utf-8') as f:
+            linhas = list(csv.DictReader(f))
+        if not linhas:
+            return 0
+        col_variante = next((c for c in COLUNAS_VARIANTE if c in linhas[0]), None)
+        for linha in linhas:
+            variante = linha.get(col_variante) if col_variante else None
+            config = {'experimento': experimento, 'origem': os.path.basename(caminho)}
+            if col_variante:
+                config[col_variante] = variante
+            self.registra(experimento, variante, linha, config)
+        self.flush()
+        return len(linhas)
+
+    def consulta(self, sql, parametros=()):
+        """Executa uma consulta e retorna as linhas como dicts."""
+        self.flush()
+        cursor = self.conexao.execute(sql, parametros)
+        nomes = [d[0] for d in cursor.description]
+        return [dict(zip(nomes, linha)) for linha in cursor]
+
+    def fecha(self):
+        self.flush()
+        self.conexao.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fecha()
+
+
+def _expressao_coluna(nome):
+    """Expressão SQL que lê `nome` de runs: coluna própria, sinônimo ou campo de extras."""
+    if nome in COLUNAS_RUN:
+        return nome
+    for coluna, nomes in SINONIMOS.items():
+        if nome in nomes:
+            return f'{coluna} AS {nome}'
+    return f"json_extract(extras, '$.{nome}') AS {nome}"
+
+
+def consulta_runs(caminho, experimento, colunas, coluna_variante='variante', n=None):
+    """
+    DataFrame com só as `colunas` pedidas das execuções de um experimento
+    (e, opcionalmente, de um n). Nomes fora do esquema são lidos de
+    `extras`; a variante vem com o nome `coluna_variante`.
+    """
+    import pandas as pd
+    sql = (f"SELECT variante AS {coluna_variante}, {', '.join(_expressao_coluna(c) for c in colunas)} "
+           "FROM runs WHERE experimento = ?")
+    parametros = [experimento]
+    if n is not None:
+        sql += ' AND n = ?'
+        parametros.append(n)
+    conexao = sqlite3.connect(caminho)
+    try:
+        return pd.read_sql_query(sql + ' ORDER BY id', conexao, params=parametros)
+    finally:
+        conexao.close()
+
+
+class ColetorGeracoes:
+    """
+    Renderizador para RegistroEventos que guarda as estatísticas por
+    geração da execução corrente (reiniciadas a cada evento 'inicio').
+    """
+
+    def __init__(self):
+        self.geracoes = []
+
+    def __call__(self, evento):
+        if evento['evento'] == 'inicio':
+            self.geracoes = []
+        elif evento['evento'] == 'geracao':
+            self.geracoes.append((evento['geracao'], evento['f_max'], evento['f_medio'], evento['f_min']))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Banco SQLite de resultados')
+    parser.add_argument('--banco', default=BANCO_PADRAO)
+    sub = parser.add_subparsers(dest='comando', required=True)
+    importa = sub.add_parser('importa', help='Importa CSVs de resultados')
+    importa.add_argument('arquivos', nargs='*', help='CSVs (padrão: resultados_*.csv do diretório atual)')
+    sub.add_parser('resumo', help='Execuções por experimento e variante')
+    args = parser.parse_args()
+
+    with BancoResultados(args.banco) as banco:
+        if args.comando == 'importa':
+            for arquivo in args.arquivos or sorted(glob.glob('resultados_*.csv')):
+                print(f'{arquivo}: {banco.importa_csv(arquivo)} execuções importadas')
+        else:
+            for linha in banco.consulta(
+                'SELECT experimento, variante, COUNT(*) AS execucoes, AVG(solved) AS taxa_sucesso, '
+                'AVG(tempo) AS tempo_medio FROM runs GROUP BY experimento, variante ORDER BY experimento, variante'
+            ):
+                print(f"{linha['experimento']:<16} {str(linha['variante']):<32} {linha['execucoes']:>6} "
+                      f"{linha['taxa_sucesso'] or 0:>6.2f} {linha['tempo_medio'] or 0:>9.3f}s")
@@ -0,0 +1,338 @@
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+from main import executar
+from cache import versao_motor
+from banco import BancoResultados
+
+# Benchmark de tempo até a solução com portão de regressão. Uma matriz fixa
+# de (n, pop_size, operadores) roda com as mesmas sementes, em sequência num
+# único processo (sem Pool, para não disputar CPU entre execuções), com
+# execuções de aquecimento descartadas em cada célula. Para cada célula:
+# taxa de sucesso e mediana/percentis do tempo (perf_counter) e das
+# avaliações até a solução.
+#
+# Comparação com a linha de base: para cada célula, teste exato de Fisher
+# unilateral sobre a taxa de sucesso e teste unilateral (tempo atual maior
+# que o da base) sobre os tempos das execuções resolvidas, pareado por
+# semente quando as trajetórias não mudaram. É regressão se a taxa de
+# sucesso cai com p < alfa, ou se o tempo piora com p < alfa e a mediana
+# piorou mais que a tolerância. Regressões e células da base ausentes
+# nesta rodada fazem o comando sair com código 1.
+
+MATRIZ_N = [8, 12, 16]
+MATRIZ_POP = [50, 100]
+MATRIZ_OPERADORES = [
+    ('torneio', 'pmx', 'swap'),
+    ('torneio', 'ordem', 'inversao'),
+    ('roleta', 'ponto_unico', 'scramble'),
+]
+BASE_CONFIG = {
+    'max_gens': 1000,
+    'elitismo': 'percentual',
+    'elitismo_taxa': 0.1,
+    'p_crossover': 0.8,
+    'p_mutacao': 0.1,
+}
+PERCENTIS = (10, 90)
+ARQUIVO_BASELINE = 'benchmark_baseline.json'
+SEMENTE_AQUECIMENTO = 10 ** 6
+
+
+def celulas(valores_n, valores_pop, operadores):
+    """(nome da célula, config) para cada combinação da matriz."""
+    return [
+        (f'n={n} pop={pop} {selecao}/{crossover}/{mutacao}',
+         {**BASE_CONFIG, 'n': n, 'pop_size': pop, 'selecao': selecao, 'crossover': crossover, 'mutacao': mutacao})
+        for n in valores_n for pop in valores_pop for selecao, crossover, mutacao in operadores
+    ]
+
+
+def percentil(valores, p):
+    """Percentil p (0-100) com interpolação linear, ou None se não houver valores."""
+    if not valores:
+        return None
+    ordenados = sorted(valores)
+    posicao = (len(ordenados) - 1) * p / 100
+    baixo, alto = math.floor(posicao), math.ceil(posicao)
+    return ordenados[baixo] + (ordenados[alto] - ordenados[baixo]) * (posicao - baixo)
+
+
+def resume_amostras(execucoes):
+    """Estatísticas de uma célula a partir das execuções [{'tempo_s', 'avaliacoes', 'solucionado'}]."""
+    resolvidas = [e for e in execucoes if e['solucionado']]
+    tempos = [e['tempo_s'] for e in resolvidas]
+    avaliacoes = [e['avaliacoes'] for e in resolvidas]
+    resumo = {
+        'execucoes': len(execucoes),
+        'taxa_sucesso': len(resolvidas) / len(execucoes) if execucoes else 0.0,
+        'tempo_mediano_s': statistics.median(tempos) if tempos else None,
+        'avaliacoes_medianas': statistics.median(avaliacoes) if avaliacoes else None,
+    }
+    for p in PERCENTIS:
+        resumo[f'tempo_p{p}_s'] = percentil(tempos, p)
+        resumo[f'avaliacoes_p{p}'] = percentil(avaliacoes, p)
+    return resumo
+
+
+def roda_celula(config, sementes, aquecimento, banco=None, nome=None):
+    """
+    Executa as rodadas de aquecimento (descartadas, com sementes fora das
+    medidas) e uma execução por semente.
+    """
+    for i in range(aquecimento):
+        executar({**config, 'seed': SEMENTE_AQUECIMENTO + i}, verbose=False)
+    execucoes = []
+    for seed in sementes:
+        inicio = time.perf_counter()
+        resumo = executar({**config, 'seed': seed}, verbose=False)
+        tempo = time.perf_counter() - inicio
+        execucoes.append({
+            'seed': seed,
+            'tempo_s': tempo,
+            'avaliacoes': resumo['avaliacoes'],
+            'geracoes': resumo['geracoes'],
+            'solucionado': resumo['solucionado'],
+        })
+        if banco:
+            banco.registra('benchmark', nome, {**resumo, 'tempo_s': tempo}, {**config, 'seed': seed})
+    return execucoes
+
+
+def mann_whitney_maior(atual, base):
+    """
+    p-valor unilateral do teste de Mann-Whitney para `atual` tender a valores
+    maiores que `base` (aproximação normal com correção de empates e de
+    continuidade; adequada a partir de ~8 amostras por grupo).
+    """
+    m, n = len(atual), len(base)
+    todos = sorted([(v, 0) for v in atual] + [(v, 1) for v in base])
+    postos = [0.0] * len(todos)
+    correcao_empates = 0
+    i = 0
+    while i < len(todos):
+        j = i
+        while j + 1 < len(todos) and todos[j + 1][0] == todos[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            postos[k] = (i + j) / 2 + 1
+        empatados = j - i + 1
+        correcao_empates += empatados ** 3 - empatados
+        i = j + 1
+    soma_atual = sum(posto for posto, (_, grupo) in zip(postos, todos) if grupo == 0)
+    u = soma_atual - m * (m + 1) / 2
+    total = m + n
+    variancia = m * n / 12 * ((total + 1) - correcao_empates / (total * (total - 1)))
+    if variancia <= 0:
+        return 1.0
+    z = (u - m * n / 2 - 0.5) / math.sqrt(variancia)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def wilcoxon_maior(diferencas):
+    """
+    p-valor unilateral do teste de postos sinalizados de Wilcoxon para as
+    `diferencas` pareadas tenderem a ser positivas (aproximação normal com
+    correção de empates e de continuidade; diferenças nulas são descartadas).
+    """
+    diferencas = [d for d in diferencas if d != 0]
+    m = len(diferencas)
+    if m == 0:
+        return 1.0
+    todos = sorted((abs(d), d > 0) for d in diferencas)
+    soma_positivos = 0.0
+    correcao_empates = 0
+    i = 0
+    while i < m:
+        j = i
+        while j + 1 < m and todos[j + 1][0] == todos[i][0]:
+            j += 1
+        posto = (i + j) / 2 + 1
+        soma_positivos += posto * sum(1 for k in range(i, j + 1) if todos[k][1])
+        empatados = j - i + 1
+        correcao_empates += empatados ** 3 - empatados
+        i = j + 1
+    variancia = m * (m + 1) * (2 * m + 1) / 24 - correcao_empates / 48
+    if variancia <= 0:
+        return 1.0
+    z = (soma_positivos - m * (m + 1) / 4 - 0.5) / math.sqrt(variancia)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def fisher_menor(sucessos, total, sucessos_base, total_base):
+    """
+    p-valor unilateral do teste exato de Fisher para a taxa de sucesso atual
+    ser menor que a da base: P(X <= sucessos) na hipergeométrica.
+    """
+    k = sucessos + sucessos_base
+    n = total + total_base
+    denominador = math.comb(n, total)
+    return sum(math.comb(k, x) * math.comb(n - k, total - x)
+               for x in range(max(0, total - (n - k)), sucessos + 1)) / denominador
+
+
+def _pareaveis(execucoes, execucoes_base):
+    """
+    Execuções resolvidas de mesma semente cuja trajetória não mudou (mesmas
+    avaliações), ou None se a célula não puder ser pareada por inteiro.
+    """
+    por_semente = {e['seed']: e for e in execucoes_base}
+    pares = []
+    for e in execucoes:
+        b = por_semente.get(e['seed'])
+        if b is None or (b['avaliacoes'], b['solucionado']) != (e['avaliacoes'], e['solucionado']):
+            return None
+        if e['solucionado']:
+            pares.append((e['tempo_s'], b['tempo_s']))
+    return pares
+
+
+def compara(atual, base, alfa=0.01, tolerancia=0.05, minimo_amostras=5):
+    """
+    Compara cada célula com a linha de base. Primeiro a taxa de sucesso
+    (Fisher exato unilateral): menos execuções resolvidas é regressão mesmo
+    que sobrem poucas para comparar tempos. Depois o tempo: se o motor
+    repete as mesmas trajetórias por semente, Wilcoxon pareado sobre o log
+    da razão dos tempos (bem mais sensível, já que a variação entre
+    sementes some); senão, Mann-Whitney entre os tempos das execuções
+    resolvidas. Células da base que faltam nesta rodada são 'ausente'.
+    Retorna a lista de (célula, razão das medianas, p-valor, teste,
+    veredito), com veredito em 'regressao', 'melhora', 'ok', 'sem dados'
+    ou 'ausente'.
+    """
+    linhas = []
+    for nome in base['celulas']:
+        if nome not in atual['celulas']:
+            linhas.append((nome, None, None, '-', 'ausente'))
+    for nome, dados in atual['celulas'].items():
+        referencia = base['celulas'].get(nome)
+        execucoes_base = referencia['execucoes'] if referencia else []
+        if referencia:
+            sucessos = sum(1 for e in dados['execucoes'] if e['solucionado'])
+            sucessos_base = sum(1 for e in execucoes_base if e['solucionado'])
+            p_sucesso = fisher_menor(sucessos, len(dados['execucoes']), sucessos_base, len(execucoes_base))
+            if p_sucesso < alfa:
+                linhas.append((nome, None, p_sucesso, 'fisher', 'regressao'))
+                continue
+        pares = _pareaveis(dados['execucoes'], execucoes_base) if referencia else None
+        if pares is not None:
+            tempos = [t for t, _ in pares]
+            tempos_base = [t for _, t in pares]
+            log_razoes = [math.log(t / t_base) for t, t_base in pares]
+            teste = 'wilcoxon'
+            p_pior = wilcoxon_maior(log_razoes)
+            p_melhor = wilcoxon_maior([-r for r in log_razoes])
+        else:
+            tempos = [e['tempo_s'] for e in dados['execucoes'] if e['solucionado']]
+            tempos_base = [e['tempo_s'] for e in execucoes_base if e['solucionado']]
+            teste = 'mann-whitney'
+            p_pior = p_melhor = None
+        if len(tempos) < minimo_amostras or len(tempos_base) < minimo_amostras:
+            linhas.append((nome, None, None, teste, 'sem dados'))
+            continue
+        if p_pior is None:
+            p_pior = mann_whitney_maior(tempos, tempos_base)
+            p_melhor = mann_whitney_maior(tempos_base, tempos)
+        razao = statistics.median(tempos) / statistics.median(tempos_base)
+        if p_pior < alfa and razao > 1 + tolerancia:
+            veredito = 'regressao'
+        elif p_melhor < alfa and razao < 1 - tolerancia:
+            veredito = 'melhora'
+        else:
+            veredito = 'ok'
+        linhas.append((nome, razao, p_pior, teste, veredito))
+    return linhas
+
+
+def _formata(valor, formato):
+    return '-' if valor is None else format(valor, formato)
+
+
+def imprime_resultados(resultado):
+    print(f"\n{'célula':<42} {'sucesso':>7} {'t med':>8} {'t p10':>8} {'t p90':>8} "
+          f"{'aval med':>9} {'aval p10':>9} {'aval p90':>9}")
+    for nome, dados in resultado['celulas'].items():
+        r = dados['resumo']
+        print(f"{nome:<42} {r['taxa_sucesso']:>7.2f} {_formata(r['tempo_mediano_s'], '.4f'):>8} "
+              f"{_formata(r['tempo_p10_s'], '.4f'):>8} {_formata(r['tempo_p90_s'], '.4f'):>8} "
+              f"{_formata(r['avaliacoes_medianas'], '.0f'):>9} {_formata(r['avaliacoes_p10'], '.0f'):>9} "
+              f"{_formata(r['avaliacoes_p90'], '.0f'):>9}")
+
+
+def imprime_comparacao(linhas):
+    print(f"\n{'célula':<42} {'razão':>7} {'p':>8} {'teste':>12}  veredito")
+    for nome, razao, p, teste, veredito in linhas:
+        print(f"{nome:<42} {_formata(razao, '.3f'):>7} {_formata(p, '.4f'):>8} {teste:>12}  {veredito}")
+
+
+def executa_benchmark(valores_n, valores_pop, operadores, n_sementes, aquecimento, max_gens, banco=None):
+    """Roda a matriz e retorna o resultado completo (metadados, execuções e resumos por célula)."""
+    resultado = {
+        'versao_motor': versao_motor(),
+        'python': sys.version.split()[0],
+        'plataforma': platform.platform(),
+        'data': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'sementes': n_sementes,
+        'aquecimento': aquecimento,
+        'celulas': {},
+    }
+    for nome, config in celulas(valores_n, valores_pop, operadores):
+        config['max_gens'] = max_gens
+        execucoes = roda_celula(config, range(n_sementes), aquecimento, banco, nome)
+        resultado['celulas'][nome] = {'config': config, 'execucoes': execucoes, 'resumo': resume_amostras(execucoes)}
+        resumo = resultado['celulas'][nome]['resumo']
+        print(f"{nome}: sucesso {resumo['taxa_sucesso']:.2f}, "
+              f"tempo mediano {_formata(resumo['tempo_mediano_s'], '.4f')}s")
+    return resultado
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark de tempo até a solução com portão de regressão')
+    parser.add_argument('--n', type=int, nargs='+', default=MATRIZ_N)
+    parser.add_argument('--pop', type=int, nargs='+', default=MATRIZ_POP)
+    parser.add_argument('--sementes', type=int, default=30, help='Execuções medidas por célula')
+    parser.add_argument('--aquecimento', type=int, default=2, help='Execuções descartadas por célula')
+    parser.add_argument('--max-gens', type=int, default=BASE_CONFIG['max_gens'])
+    parser.add_argument('--baseline', default=ARQUIVO_BASELINE, help='Arquivo JSON da linha de base')
+    parser.add_argument('--salvar-baseline', action='store_true', help='Grava este resultado como a nova linha de base')
+    parser.add_argument('--saida', default='benchmark_resultado.json', help='Arquivo JSON com o resultado desta rodada')
+    parser.add_argument('--alfa', type=float, default=0.01, help='Nível de significância do teste')
+    parser.add_argument('--tolerancia', type=float, default=0.05,
+                        help='Piora relativa mínima da mediana para contar como regressão')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    with BancoResultados() as banco:
+        resultado = executa_benchmark(args.n, args.pop, MATRIZ_OPERADORES, args.sementes,
+                                      args.aquecimento, args.max_gens, banco)
+    imprime_resultados(resultado)
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, indent=1)
+    print(f'\nResultado salvo em {args.saida}')
+
+    if args.salvar_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(resultado, f, indent=1)
+        print(f'Linha de base salva em {args.baseline}')
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            base = json.load(f)
+        if base['versao_motor'] != resultado['versao_motor']:
+            print(f"Motor mudou desde a linha de base ({base['versao_motor'][:12]} -> "
+                  f"{resultado['versao_motor'][:12]})")
+        linhas = compara(resultado, base, args.alfa, args.tolerancia)
+        imprime_comparacao(linhas)
+        regressoes = [nome for nome, _, _, _, veredito in linhas if veredito in ('regressao', 'ausente')]
+        if regressoes:
+            print(f'\n{len(regressoes)} célula(s) com regressão significativa ou ausentes desta rodada')
+            sys.exit(1)
+        print('\nSem regressões significativas')
+    else:
+        print(f'Sem linha de base em {args.baseline}; use --salvar-baseline para criá-la')
@@ -0,0 +1,187 @@
+import argparse
+import functools
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+# Cache de resultados endereçado por conteúdo: a chave de cada execução é o
+# hash de (configuração, seed, versão do motor). Os runners consultam o
+# cache antes de executar e pulam as execuções já concluídas.
+#
+# Cada resultado fica em <diretorio>/<2 primeiros hex>/<hash>.json e é
+# gravado em um arquivo temporário no mesmo diretório e renomeado com
+# os.replace, que é atômico: vários processos de um Pool podem gravar ao
+# mesmo tempo sem que um leitor veja um arquivo pela metade.
+
+DIRETORIO_PADRAO = 'cache_resultados'
+
+# Módulos cujo código define o resultado de uma execução; mudar qualquer um
+# deles muda a versão do motor e, com ela, todas as chaves. Entram também
+# main (monta_operadores, o laço de executar, as regras de parada) e os
+# runners, que têm os próprios laços de execução: uma mudança em qualquer
+# um deles invalida o cache de todos.
+MODULOS_MOTOR = [
+    'individuo', 'operadores', 'populacao', 'aleatorio', 'lote', 'inicializacao',
+    'armazenamento', 'paralelo', 'adaptativo', 'controle', 'colheita', 'tempering',
+    'celular', 'indice_conflitos', 'main',
+    'passo_0', 'passo_1', 'passo_2', 'passo_3', 'passo_4', 'passo_5', 'passo_6',
+]
+
+
+@functools.lru_cache(maxsize=None)
+def versao_motor():
+    """Hash curto do código-fonte de MODULOS_MOTOR."""
+    h = hashlib.sha256()
+    pasta = os.path.dirname(os.path.abspath(__file__))
+    for modulo in MODULOS_MOTOR:
+        with open(os.path.join(pasta, modulo + '.py'), 'rb') as f:
+            h.update(modulo.encode() + b'\0' + f.read())
+    return h.hexdigest()[:12]
+
+
+def _serializavel(valor):
+    """Funções (operadores) entram na chave pelo nome qualificado."""
+    if callable(valor):
+        return f'{getattr(valor, "__module__", "")}.{getattr(valor, "__qualname__", repr(valor))}'
+    return repr(valor)
+
+
+def chave_execucao(config, seed, versao):
+    conteudo = json.dumps({'config': config, 'seed': seed, 'versao': versao},
+                          sort_keys=True, default=_serializavel)
+    return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+
+class CacheResultados:
+    """
+    Resultados de execuções já concluídas. `versao` é a versão do motor
+    (por padrão, versao_motor()); `ativo=False` desliga o cache sem mudar
+    o código dos runners.
+    """
+
+    def __init__(self, diretorio=DIRETORIO_PADRAO, versao=None, ativo=True):
+        self.diretorio = diretorio
+        self.versao = versao or versao_motor()
+        self.ativo = ativo
+
+    def _caminho(self, chave):
+        return os.path.join(self.diretorio, chave[:2], chave + '.json')
+
+    def obtem(self, config, seed):
+        """Retorna o resultado guardado ou None."""
+        if not self.ativo:
+            return None
+        try:
+            with open(self._caminho(chave_execucao(config, seed, self.versao)), encoding='utf-8') as f:
+                return json.load(f)['resultado']
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def grava(self, config, seed, resultado):
+        if not self.ativo:
+            return
+        chave = chave_execucao(config, seed, self.versao)
+        destino = self._caminho(chave)
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        registro = {'versao': self.versao, 'seed': seed, 'config': config, 'resultado': resultado}
+        fd, temporario = tempfile.mkstemp(dir=os.path.dirname(destino), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(registro, f, default=_serializavel)
+            os.replace(temporario, destino)
+        except BaseException:
+            os.unlink(temporario)
+            raise
+
+    def executa(self, config, seed, funcao):
+        """
+        Retorna (resultado, veio_do_cache). Sem resultado guardado, chama
+        funcao() e grava o que ela retornar. Execuções sem seed não são
+        reprodutíveis e nunca passam pelo cache.
+        """
+        if seed is None:
+            return funcao(), False
+        resultado = self.obtem(config, seed)
+        if resultado is not None:
+            return resultado, True
+        resultado = funcao()
+        self.grava(config, seed, resultado)
+        return resultado, False
+
+    def registros(self):
+        """Percorre (caminho, registro) de todas as entradas do cache."""
+        if not os.path.isdir(self.diretorio):
+            return
+        for raiz, _, arquivos in os.walk(self.diretorio):
+            for nome in arquivos:
+                if not nome.endswith('.json'):
+                    continue
+                caminho = os.path.join(raiz, nome)
+                try:
+                    with open(caminho, encoding='utf-8') as f:
+                        yield caminho, json.load(f)
+                except (FileNotFoundError, json.JSONDecodeError):
+                    continue
+
+    def invalida(self, tudo=False, obsoletas=False, versao=None, filtros=None):
+        """
+        Remove entradas: todas, as de outras versões do motor (`obsoletas`),
+        as de uma `versao` específica, ou as cuja config tem todos os pares
+        de `filtros` (valores comparados como texto). Retorna quantas removeu.
+        """
+        if tudo:
+            total = sum(1 for _ in self.registros())
+            shutil.rmtree(self.diretorio, ignore_errors=True)
+            return total
+        filtros = filtros or {}
+        removidas = 0
+        for caminho, registro in self.registros():
+            if obsoletas and registro.get('versao') == self.versao:
+                continue
+            if versao is not None and registro.get('versao') != versao:
+                continue
+            config = registro.get('config', {})
+            if any(str(config.get(k)) != v for k, v in filtros.items()):
+                continue
+            try:
+                os.unlink(caminho)
+                removidas += 1
+            except FileNotFoundError:
+                pass
+        return removidas
+
+
+def _filtro(texto):
+    chave, _, valor = texto.partition('=')
+    return chave, valor
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Cache de resultados das execuções')
+    parser.add_argument('--diretorio', default=DIRETORIO_PADRAO)
+    sub = parser.add_subparsers(dest='comando', required=True)
+    sub.add_parser('lista', help='Conta as entradas por versão do motor')
+    invalida = sub.add_parser('invalida', help='Remove entradas do cache')
+    grupo = invalida.add_mutually_exclusive_group(required=True)
+    grupo.add_argument('--tudo', action='store_true')
+    grupo.add_argument('--obsoletas', action='store_true',
+                       help='Entradas de versões do motor diferentes da atual')
+    grupo.add_argument('--versao')
+    grupo.add_argument('--onde', type=_filtro, action='append', metavar='CHAVE=VALOR',
+                       help='Entradas cuja config tem CHAVE=VALOR (pode repetir)')
+    args = parser.parse_args()
+
+    cache = CacheResultados(args.diretorio)
+    if args.comando == 'lista':
+        por_versao = {}
+        for _, registro in cache.registros():
+            por_versao[registro.get('versao')] = por_versao.get(registro.get('versao'), 0) + 1
+        print(f'Versão atual do motor: {cache.versao}')
+        for versao, total in sorted(por_versao.items(), key=lambda item: str(item[0])):
+            print(f"  {versao}: {total} resultados{' (atual)' if versao == cache.versao else ''}")
+    else:
+        removidas = cache.invalida(tudo=args.tudo, obsoletas=args.obsoletas,
+                                   versao=args.versao, filtros=dict(args.onde or []))
+        print(f'{removidas} entradas removidas de {args.diretorio}')
@@ -0,0 +1,403 @@
+import argparse
+import csv
+import functools
+import math
+import multiprocessing
+import random
+import statistics
+import numpy as np
+from individuo import Individuo
+from inicializacao import gera_genes
+from aleatorio import cria_fluxo
+from trajetoria import matrizes_populacao
+
+# AG celular: os indivíduos ficam numa grade 2-D toroidal (largura x altura,
+# guardada em ordem de linhas) e cada célula só cruza com a sua vizinhança.
+# A cada geração, para cada célula: seleção dos pais entre os vizinhos (com
+# os mesmos operadores de seleção de operadores.py, aplicados à lista de
+# vizinhos), crossover e mutação gerando um filho, e o filho substitui a
+# célula se não for pior. Não há elitismo nem ordenação global: a
+# substituição "se não for pior" já preserva o melhor de cada célula.
+#
+# Atualização:
+#   sincrona   - todas as células leem a geração anterior
+#   assincrona - varredura em ordem de linhas; cada célula já vê os
+#                vizinhos atualizados antes dela
+# Com `processos`, a grade é dividida em blocos de tamanho_bloco x
+# tamanho_bloco processados em paralelo. Cada bloco lê as bordas (vizinhos
+# fora do bloco) da geração anterior; no modo assíncrono a varredura é
+# assíncrona dentro do bloco. Os fluxos aleatórios dependem só da seed, da
+# geração e do bloco, então o resultado não depende do número de processos.
+
+# Deslocamentos (linha, coluna) de cada vizinhança, incluindo a própria célula
+VIZINHANCAS = {
+    'L5': [(0, 0), (-1, 0), (1, 0), (0, -1), (0, 1)],
+    'L9': [(0, 0), (-1, 0), (1, 0), (0, -1), (0, 1), (-2, 0), (2, 0), (0, -2), (0, 2)],
+    'C9': [(dl, dc) for dl in (-1, 0, 1) for dc in (-1, 0, 1)],
+    'C13': [(dl, dc) for dl in (-1, 0, 1) for dc in (-1, 0, 1)] + [(-2, 0), (2, 0), (0, -2), (0, 2)],
+}
+ATUALIZACOES = ('sincrona', 'assincrona')
+
+
+@functools.lru_cache(maxsize=None)
+def vizinhos_grade(largura, altura, forma):
+    """Para cada célula, a tupla dos índices dos vizinhos na grade toroidal."""
+    deslocamentos = VIZINHANCAS[forma]
+    return tuple(
+        tuple(((linha + dl) % altura) * largura + (coluna + dc) % largura for dl, dc in deslocamentos)
+        for linha in range(altura) for coluna in range(largura)
+    )
+
+
+def blocos_grade(largura, altura, tamanho_bloco):
+    """Células de cada bloco tamanho_bloco x tamanho_bloco, em ordem de linhas."""
+    return [
+        [linha * largura + coluna
+         for linha in range(l0, min(l0 + tamanho_bloco, altura))
+         for coluna in range(c0, min(c0 + tamanho_bloco, largura))]
+        for l0 in range(0, altura, tamanho_bloco)
+        for c0 in range(0, largura, tamanho_bloco)
+    ]
+
+
+def diversidade(pop):
+    """
+    Entropia posicional média da população, normalizada em [0, 1]: para cada
+    coluna, a entropia das linhas ocupadas pelas rainhas nos indivíduos.
+    0 = todos iguais; 1 = linhas uniformemente distribuídas em cada coluna.
+    """
+    genes, _ = matrizes_populacao(pop)
+    tamanho, n = genes.shape
+    if tamanho < 2:
+        return 0.0
+    deslocados = genes.T.astype(np.int64) + (np.arange(n, dtype=np.int64) * n)[:, None]
+    frequencias = np.bincount(deslocados.ravel(), minlength=n * n).reshape(n, n) / tamanho
+    with np.errstate(divide='ignore', invalid='ignore'):
+        entropias = -np.where(frequencias > 0, frequencias * np.log(frequencias), 0.0).sum(axis=1)
+    return float(entropias.mean() / math.log(min(tamanho, n)))
+
+
+def _atualiza_celulas(grade, celulas, vizinhos, selecao, crossover, p_crossover,
+                      mutacao, p_mutacao, sincrona, rng):
+    """
+    Gera um filho para cada célula de `celulas` e aplica a substituição.
+    `grade` é indexável por célula (lista ou dict de Individuo); no modo
+    assíncrono é atualizada no lugar. Retorna ({célula: indivíduo},
+    avaliações, acertos de cache, crossovers, mutações).
+    """
+    novos = {}
+    avaliacoes = cache = crossovers = mutacoes = 0
+    for i in celulas:
+        pai1, pai2 = selecao([grade[j] for j in vizinhos[i]], rng=rng)
+        if rng.random() < p_crossover:
+            filho, _ = crossover(pai1, pai2, rng=rng)
+            crossovers += 1
+        else:
+            filho = Individuo(pai1.n, pai1.genes)
+            filho.conflitos = pai1.conflitos
+        if rng.random() < p_mutacao:
+            mutacao(filho, rng=rng)
+            if not getattr(mutacao, 'avalia_mutado', False):
+                filho.conflitos = None
+            mutacoes += 1
+        if filho.conflitos is None:
+            avaliacoes += 1
+        else:
+            cache += 1
+        filho.fitness()
+        escolhido = filho if filho.fitness_value >= grade[i].fitness_value else grade[i]
+        novos[i] = escolhido
+        if not sincrona:
+            grade[i] = escolhido
+    return novos, avaliacoes, cache, crossovers, mutacoes
+
+
+def _processa_bloco(tarefa):
+    """
+    Worker: recebe os genes e conflitos das células do bloco e das suas
+    bordas, atualiza o bloco e devolve [(célula, genes, conflitos)].
+    """
+    (largura, altura, forma, celulas, dados, seed, geracao, indice_bloco, selecao, crossover,
+     p_crossover, mutacao, p_mutacao, sincrona) = tarefa
+    grade = {}
+    for j, (genes, conflitos) in dados.items():
+        ind = Individuo(len(genes), genes)
+        ind.conflitos = conflitos
+        ind.fitness()
+        grade[j] = ind
+    novos, *contagens = _atualiza_celulas(
+        grade, celulas, vizinhos_grade(largura, altura, forma), selecao, crossover, p_crossover,
+        mutacao, p_mutacao, sincrona, cria_fluxo(seed, geracao, indice_bloco)
+    )
+    return [(i, ind.genes, ind.conflitos) for i, ind in novos.items()], contagens
+
+
+class PopulacaoCelular:
+    """
+    População em grade toroidal, com a mesma interface de Populacao
+    (ver o comentário no topo do módulo). `processos` > 0 ativa os blocos
+    paralelos; com processos=1 os blocos rodam no próprio processo.
+    """
+
+    def __init__(self, n, largura, altura, rng=None, vizinhanca='L5', atualizacao='sincrona',
+                 seed=None, processos=None, tamanho_bloco=16):
+        if n < 4:
+            raise ValueError("Para n-rainhas, n deve ser >= 4")
+        if vizinhanca not in VIZINHANCAS:
+            raise ValueError(f"Vizinhança desconhecida: {vizinhanca}")
+        if atualizacao not in ATUALIZACOES:
+            raise ValueError(f"Atualização desconhecida: {atualizacao}")
+        self.n = n
+        self.largura = largura
+        self.altura = altura
+        self.tamanho = largura * altura
+        self.rng = rng if rng is not None else random
+        self.vizinhanca = vizinhanca
+        self.sincrona = atualizacao == 'sincrona'
+        self.seed = seed if seed is not None else np.random.SeedSequence().entropy
+        self.processos = processos
+        self.blocos = blocos_grade(largura, altura, tamanho_bloco)
+        self.vizinhos = vizinhos_grade(largura, altura, vizinhanca)
+        self.individuos = []
+        self.geracao = 0
+        self._pool = None
+        # Contadores da execução (ver contadores())
+        self.avaliacoes = 0
+        self.avaliacoes_cache = 0
+        self.filhos = 0
+        self.crossovers = 0
+        self.mutacoes = 0
+
+    @classmethod
+    def from_config(cls, config, rng=None):
+        """
+        Cria a população a partir do bloco 'celular' da config. Sem largura e
+        altura, usa a grade mais quadrada com pelo menos pop_size células.
+        """
+        params = config['celular']
+        largura = params.get('largura') or max(1, math.isqrt(config['pop_size']))
+        altura = params.get('altura') or math.ceil(config['pop_size'] / largura)
+        return cls(
+            config['n'], largura, altura, rng=rng,
+            vizinhanca=params.get('vizinhanca', 'L5'),
+            atualizacao=params.get('atualizacao', 'sincrona'),
+            seed=config.get('seed'),
+            processos=params.get('processos'),
+            tamanho_bloco=params.get('tamanho_bloco', 16),
+        )
+
+    def inicializa(self, estrategia=None, proporcao_heuristica=1.0, **estrategia_args):
+        """Preenche a grade como em Populacao.inicializa."""
+        if estrategia is None:
+            self.individuos = [Individuo(self.n, rng=self.rng) for _ in range(self.tamanho)]
+        else:
+            self.individuos = [
+                Individuo(self.n, genes) for genes in gera_genes(
+                    self.n, self.tamanho, estrategia, self.rng, proporcao_heuristica, **estrategia_args
+                )
+            ]
+        self.geracao = 0
+
+    def avalia(self):
+        """Avalia os indivíduos ainda sem fitness (ver Populacao.avalia)."""
+        for ind in self.individuos:
+            if ind.conflitos is None:
+                self.avaliacoes += 1
+            else:
+                self.avaliacoes_cache += 1
+            ind.fitness()
+
+    def contadores(self):
+        """Avaliações, acertos de cache, filhos, crossovers e mutações até agora."""
+        return {
+            'avaliacoes': self.avaliacoes,
+            'avaliacoes_cache': self.avaliacoes_cache,
+            'filhos': self.filhos,
+            'crossovers': self.crossovers,
+            'mutacoes': self.mutacoes,
+        }
+
+    def melhor(self):
+        """Retorna o indivíduo com maior fitness."""
+        return max(self.individuos, key=lambda ind: ind.fitness_value)
+
+    def estatisticas(self):
+        """Retorna (máximo, média, mínimo) do fitness da população."""
+        fitness_vals = [ind.fitness_value for ind in self.individuos]
+        return max(fitness_vals), sum(fitness_vals) / len(fitness_vals), min(fitness_vals)
+
+    def injeta_imigrantes(self, quantidade):
+        """Substitui os `quantidade` piores indivíduos por novos aleatórios, nas mesmas células."""
+        quantidade = min(quantidade, self.tamanho)
+        if quantidade <= 0:
+            return
+        piores = sorted(range(self.tamanho), key=lambda i: self.individuos[i].fitness_value)[:quantidade]
+        for i in piores:
+            self.individuos[i] = Individuo(self.n, rng=self.rng)
+        self.avalia()
+
+    def gera_nova_geracao(
+        self,
+        selecao,
+        crossover,
+        p_crossover,
+        mutacao,
+        p_mutacao,
+        elitismo=None,
+        elitismo_args=None
+    ):
+        """
+        Mesmos parâmetros de Populacao.gera_nova_geracao; `selecao` é aplicada
+        à lista de vizinhos de cada célula. O elitismo é ignorado (ver o topo
+        do módulo). Com blocos paralelos, os operadores precisam ser funções
+        de módulo (picláveis por nome).
+        """
+        self.geracao += 1
+        if self.processos:
+            contagens = self._gera_em_blocos(selecao, crossover, p_crossover, mutacao, p_mutacao)
+        else:
+            grade = self.individuos if not self.sincrona else self.individuos.copy()
+            novos, *contagens = _atualiza_celulas(
+                grade, range(self.tamanho), self.vizinhos, selecao, crossover, p_crossover,
+                mutacao, p_mutacao, self.sincrona, self.rng
+            )
+            if self.sincrona:
+                self.individuos = [novos[i] for i in range(self.tamanho)]
+            contagens = [contagens]
+        for avaliacoes, cache, crossovers, mutacoes in contagens:
+            self.avaliacoes += avaliacoes
+            self.avaliacoes_cache += cache
+            self.crossovers += crossovers
+            self.mutacoes += mutacoes
+        self.filhos += self.tamanho
+
+    def _gera_em_blocos(self, selecao, crossover, p_crossover, mutacao, p_mutacao):
+        tarefas = []
+        for indice, celulas in enumerate(self.blocos):
+            necessarias = {j for i in celulas for j in self.vizinhos[i]}
+            dados = {j: (self.individuos[j].genes, self.individuos[j].conflitos) for j in necessarias}
+            tarefas.append((self.largura, self.altura, self.vizinhanca, celulas, dados, self.seed,
+                            self.geracao, indice, selecao, crossover, p_crossover, mutacao,
+                            p_mutacao, self.sincrona))
+        if self.processos > 1:
+            if self._pool is None:
+                self._pool = multiprocessing.Pool(processes=self.processos)
+            resultados = self._pool.map(_processa_bloco, tarefas)
+        else:
+            resultados = map(_processa_bloco, tarefas)
+        contagens = []
+        for celulas, contagem in resultados:
+            for i, genes, conflitos in celulas:
+                if genes != self.individuos[i].genes:
+                    ind = Individuo(self.n, genes)
+                    ind.conflitos = conflitos
+                    ind.fitness()
+                    self.individuos[i] = ind
+            contagens.append(contagem)
+        return contagens
+
+    def fecha(self):
+        """Encerra os workers dos blocos paralelos, se houver."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fecha()
+
+
+# --- Comparação com o modo padrão ---
+
+MODOS_COMPARACAO = [
+    ('padrao', None),
+    ('celular_sincrona', 'sincrona'),
+    ('celular_assincrona', 'assincrona'),
+]
+GERACOES_DIVERSIDADE = (0, 10, 50, 100)
+
+
+def _diversidade_em(serie, geracao):
+    """Diversidade registrada na geração pedida, ou None se a execução parou antes."""
+    return next((valor for g, valor in serie if g == geracao), None)
+
+
+def compara(base_config, sementes, processos=None, vizinhanca='L5', banco=None):
+    """
+    Roda cada modo (padrão, celular síncrono e assíncrono) com as mesmas
+    sementes e retorna uma linha de resumo por modo: taxa de sucesso,
+    medianas de tempo, gerações e avaliações, e a diversidade média nas
+    gerações de GERACOES_DIVERSIDADE e no fim. Com `banco`
+    (BancoResultados), cada execução também é registrada nele.
+    """
+    from main import executar
+    linhas = []
+    for nome, atualizacao in MODOS_COMPARACAO:
+        resumos = []
+        for seed in sementes:
+            config = {**base_config, 'seed': seed, 'diversidade': {'intervalo': 10}}
+            if atualizacao:
+                config['celular'] = {'atualizacao': atualizacao, 'vizinhanca': vizinhanca, 'processos': processos}
+            resumos.append(executar(config, verbose=False))
+            if banco:
+                banco.registra('celular', nome, resumos[-1], config)
+            print(f"{nome} seed={seed}: {resumos[-1]['tempo_s']:.2f}s, "
+                  f"{resumos[-1]['geracoes']} gerações, solucionado={resumos[-1]['solucionado']}")
+        resolvidos = [r for r in resumos if r['solucionado']]
+        linha = {
+            'modo': nome,
+            'execucoes': len(resumos),
+            'taxa_sucesso': len(resolvidos) / len(resumos),
+            'tempo_mediano_s': statistics.median(r['tempo_s'] for r in resumos),
+            'tempo_mediano_solucao_s': statistics.median(r['tempo_s'] for r in resolvidos) if resolvidos else None,
+            'geracoes_medianas': statistics.median(r['geracoes'] for r in resumos),
+            'avaliacoes_medianas': statistics.median(r['avaliacoes'] for r in resumos),
+        }
+        for geracao in GERACOES_DIVERSIDADE:
+            valores = [v for v in (_diversidade_em(r['diversidade'], geracao) for r in resumos) if v is not None]
+            linha[f'diversidade_g{geracao}'] = statistics.mean(valores) if valores else None
+        linha['diversidade_final'] = statistics.mean(r['diversidade'][-1][1] for r in resumos)
+        linhas.append(linha)
+    return linhas
+
+
+def _formata(valor, formato):
+    return '-' if valor is None else format(valor, formato)
+
+
+def imprime_comparacao(linhas):
+    print(f"\n{'modo':<20} {'sucesso':>8} {'tempo':>8} {'t.sol.':>8} {'gerações':>9} {'avaliações':>11}  "
+          + ' '.join(f'{"div.g" + str(g):>8}' for g in GERACOES_DIVERSIDADE) + f" {'div.fim':>8}")
+    for linha in linhas:
+        print(f"{linha['modo']:<20} {linha['taxa_sucesso']:>8.2f} {linha['tempo_mediano_s']:>8.2f} "
+              f"{_formata(linha['tempo_mediano_solucao_s'], '.2f'):>8} {linha['geracoes_medianas']:>9} "
+              f"{linha['avaliacoes_medianas']:>11}  "
+              + ' '.join(f"{_formata(linha[f'diversidade_g{g}'], '.3f'):>8}" for g in GERACOES_DIVERSIDADE)
+              + f" {linha['diversidade_final']:>8.3f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compara o AG celular com o modo padrão')
+    parser.add_argument('--config', default='config.json', help='Configuração base (seed é substituída)')
+    parser.add_argument('--sementes', type=int, default=10, help='Número de sementes por modo')
+    parser.add_argument('--vizinhanca', default='L5', choices=sorted(VIZINHANCAS))
+    parser.add_argument('--processos', type=int, default=None, help='Processos para os blocos da grade')
+    parser.add_argument('--saida', default='resultados_celular.csv')
+    args = parser.parse_args()
+
+    from main import load_config
+    from banco import BancoResultados
+    base = load_config(args.config)
+    for chave in ('log_eventos', 'celular', 'armazenamento', 'processos_reproducao'):
+        base.pop(chave, None)
+    with BancoResultados() as banco:
+        linhas = compara(base, range(args.sementes), args.processos, args.vizinhanca, banco)
+    imprime_comparacao(linhas)
+    with open(args.saida, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=linhas[0].keys())
+        writer.writeheader()
+        writer.writerows(linhas)
+    print(f'Comparação salva em {args.saida}')
@@ -0,0 +1,103 @@
+import time
+from individuo import Individuo
+
+# Colheita de várias soluções distintas em uma única execução do AG.
+# As soluções são identificadas pela forma canônica sob as 8 simetrias
+# do tabuleiro (rotações e reflexões).
+
+
+def simetrias(genes):
+    """
+    Retorna as 8 variantes simétricas de um tabuleiro, onde genes[col] = linha.
+    Inversão das colunas, inversão das linhas e transposição geram o grupo.
+    """
+    n = len(genes)
+    transposta = [0] * n
+    for col, linha in enumerate(genes):
+        transposta[linha] = col
+    variantes = []
+    for base in (list(genes), transposta):
+        espelhada = [n - 1 - linha for linha in base]
+        variantes.extend([base, base[::-1], espelhada, espelhada[::-1]])
+    return variantes
+
+
+def canonica(genes):
+    """Forma canônica: a menor variante (em ordem lexicográfica) entre as 8."""
+    return min(tuple(variante) for variante in simetrias(genes))
+
+
+class IndiceSolucoes:
+    """
+    Índice de soluções distintas pela forma canônica. Para cada nova
+    solução guarda a geração, o tempo e o custo desde a anterior.
+    """
+
+    def __init__(self):
+        self.solucoes = {}
+        self.registros = []
+        self._ultimo_tempo = 0.0
+        self._ultimas_avaliacoes = 0
+
+    def __len__(self):
+        return len(self.solucoes)
+
+    def __contains__(self, genes):
+        return canonica(genes) in self.solucoes
+
+    def adiciona(self, genes, geracao, tempo_s, avaliacoes):
+        """Adiciona a solução se for nova; retorna True nesse caso."""
+        chave = canonica(genes)
+        if chave in self.solucoes:
+            return False
+        self.solucoes[chave] = list(genes)
+        self.registros.append({
+            'indice': len(self.solucoes),
+            'geracao': geracao,
+            'tempo_s': tempo_s,
+            'avaliacoes': avaliacoes,
+            'custo_tempo_s': tempo_s - self._ultimo_tempo,
+            'custo_avaliacoes': avaliacoes - self._ultimas_avaliacoes,
+            'genes': list(genes),
+        })
+        self._ultimo_tempo = tempo_s
+        self._ultimas_avaliacoes = avaliacoes
+        return True
+
+
+def colhe(pop, operadores, k, tempo_limite=None, max_gens=None, verbose=True, parada=None):
+    """
+    Evolui `pop` (uma Populacao já avaliada) coletando soluções distintas até
+    ter `k` soluções únicas, estourar `tempo_limite` segundos ou `max_gens`,
+    ou até `parada` (um multiprocessing.Event) ser sinalizado.
+    Indivíduos que repetem soluções já colhidas são trocados por novos
+    aleatórios, para a população não ficar presa nelas.
+    Retorna (indice, geracoes).
+    """
+    n = pop.n
+    max_pairs = n * (n - 1) // 2
+    indice = IndiceSolucoes()
+    inicio = time.perf_counter()
+    gen = 0
+    while True:
+        decorrido = time.perf_counter() - inicio
+        for pos, ind in enumerate(pop.individuos):
+            if ind.fitness_value != max_pairs:
+                continue
+            if indice.adiciona(ind.genes, gen, decorrido, pop.avaliacoes) and verbose:
+                print(f'Solução única {len(indice)} na geração {gen} ({decorrido:.2f}s)')
+            novo = Individuo(n, rng=pop.rng)
+            novo.fitness()
+            pop.avaliacoes += 1
+            pop.individuos[pos] = novo
+        if len(indice) >= k:
+            break
+        if tempo_limite is not None and decorrido >= tempo_limite:
+            break
+        if max_gens is not None and gen >= max_gens:
+            break
+        if parada is not None and parada.is_set():
+            break
+        gen += 1
+        pop.gera_nova_geracao(**operadores)
+    return indice, gen
@@ -0,0 +1,90 @@
+import math
+
+# Reações disponíveis, na ordem padrão de escalonamento
+ACOES = ('mutacao', 'imigrantes', 'reinicio')
+
+
+class ControladorEstagnacao:
+    """
+    Detecta estagnação (o melhor fitness não melhora por `janela` gerações)
+    e reage escalonando as ações configuradas:
+    - 'mutacao': multiplica p_mutacao por `fator_mutacao` (até `p_mutacao_max`)
+    - 'imigrantes': troca a fração `taxa_imigrantes` dos piores por aleatórios
+    - 'reinicio': reinício parcial, mantendo só a fração `taxa_elite` melhor
+    Cada reação abre uma nova janela; ao melhorar, p_mutacao volta ao valor
+    original e o escalonamento recomeça. Todos os eventos ficam em `eventos`.
+    """
+
+    def __init__(self, janela=50, fator_mutacao=2.0, p_mutacao_max=0.5,
+                 taxa_imigrantes=0.2, taxa_elite=0.1, acoes=ACOES):
+        for acao in acoes:
+            if acao not in ACOES:
+                raise ValueError(f"Ação de estagnação desconhecida: {acao}")
+        self.janela = janela
+        self.fator_mutacao = fator_mutacao
+        self.p_mutacao_max = p_mutacao_max
+        self.taxa_imigrantes = taxa_imigrantes
+        self.taxa_elite = taxa_elite
+        self.acoes = tuple(acoes)
+        self.eventos = []
+        self.melhor = None
+        self.ultima_melhoria = 0
+        self.ultima_adaptacao = None
+        self.nivel = 0
+        self.p_mutacao_base = None
+
+    @classmethod
+    def from_config(cls, config):
+        """Cria o controlador a partir do bloco 'estagnacao' do config.json (ou None)."""
+        params = config.get('estagnacao')
+        if not params:
+            return None
+        return cls(**params)
+
+    def _registra(self, geracao, evento, **detalhes):
+        self.eventos.append({'geracao': geracao, 'evento': evento,
+                             'melhor_fitness': self.melhor, **detalhes})
+
+    def observa(self, geracao, melhor_fitness, pop, operadores):
+        """
+        Chamado ao fim de cada geração. Pode alterar operadores['p_mutacao']
+        e a população (via pop.injeta_imigrantes).
+        """
+        if self.p_mutacao_base is None:
+            self.p_mutacao_base = operadores['p_mutacao']
+
+        if self.melhor is None or melhor_fitness > self.melhor:
+            self.melhor = melhor_fitness
+            self.ultima_melhoria = geracao
+            if self.ultima_adaptacao is not None:
+                self._registra(geracao, 'melhoria',
+                               geracoes_desde_adaptacao=geracao - self.ultima_adaptacao)
+                self.ultima_adaptacao = None
+            if operadores['p_mutacao'] != self.p_mutacao_base:
+                operadores['p_mutacao'] = self.p_mutacao_base
+                self._registra(geracao, 'restaura_mutacao', p_mutacao=self.p_mutacao_base)
+            self.nivel = 0
+            return
+
+        if geracao - self.ultima_melhoria < self.janela:
+            return
+
+        acao = self.acoes[min(self.nivel, len(self.acoes) - 1)]
+        self.nivel += 1
+        if acao == 'mutacao':
+            p_mutacao = min(self.p_mutacao_max, operadores['p_mutacao'] * self.fator_mutacao)
+            operadores['p_mutacao'] = p_mutacao
+            self._registra(geracao, 'aumenta_mutacao', p_mutacao=p_mutacao)
+        elif acao == 'imigrantes':
+            quantidade = max(1, math.floor(pop.tamanho * self.taxa_imigrantes))
+            pop.injeta_imigrantes(quantidade)
+            self._registra(geracao, 'imigrantes', quantidade=quantidade)
+        else:
+            quantidade = pop.tamanho - max(1, math.ceil(pop.tamanho * self.taxa_elite))
+            pop.injeta_imigrantes(quantidade)
+            operadores['p_mutacao'] = self.p_mutacao_base
+            self.nivel = 0
+            self._registra(geracao, 'reinicio_parcial', quantidade=quantidade)
+        # Nova janela para medir o efeito da reação
+        self.ultima_melhoria = geracao
+        self.ultima_adaptacao = geracao
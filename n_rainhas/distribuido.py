@@ -0,0 +1,259 @@
+import collections
+import ipaddress
+import itertools
+import os
+import socket
+import threading
+import time
+import traceback
+from multiprocessing.managers import BaseManager
+
+# Distribuição de execuções entre máquinas: um coordenador mantém a fila de
+# tarefas num servidor multiprocessing.managers (TCP) e os trabalhadores se
+# conectam, pegam uma tarefa por vez e devolvem o resultado. Enquanto
+# executa, o trabalhador envia batimentos; se um trabalhador fica mais de
+# `tempo_limite` segundos sem bater, as tarefas dele voltam para a fila.
+# Se um resultado chegar duas vezes (trabalhador lento, não morto), vale o
+# primeiro. Uma tarefa que falha (exceção no trabalhador ou trabalhador
+# perdido) volta para a fila até `max_tentativas` vezes; depois disso o
+# coordenador a entrega como resultado {'erro': ...}.
+#
+# O protocolo dos managers desserializa (pickle) o que recebe: quem tem a
+# chave executa código no coordenador. Por isso o padrão é escutar só no
+# loopback, com uma chave aleatória por execução, e escutar em outra
+# interface exige uma chave explícita.
+
+HOST_PADRAO = '127.0.0.1'
+INTERVALO_BATIMENTO = 2.0
+
+
+class Coordenador:
+    """Fila de tarefas com controle de trabalhadores; vive no processo servidor."""
+
+    def __init__(self, tempo_limite=10.0, max_tentativas=3):
+        self.tempo_limite = tempo_limite
+        self.max_tentativas = max_tentativas
+        self._trava = threading.Lock()
+        self._ids = itertools.count()
+        self._fila = collections.deque()
+        self._specs = {}
+        self._em_execucao = {}        # id da tarefa -> trabalhador
+        self._batimentos = {}         # trabalhador -> instante do último batimento
+        self._concluidas = set()
+        self._falhas = collections.Counter()  # id da tarefa -> tentativas que falharam
+        self._novos_resultados = []
+        self._coletadas = 0
+        self._reenfileiradas = 0
+        self._encerrado = False
+
+    def _expira(self):
+        """Devolve à fila as tarefas de trabalhadores sem batimento recente."""
+        agora = time.monotonic()
+        perdidos = {t for t, instante in self._batimentos.items() if agora - instante > self.tempo_limite}
+        for tarefa, trabalhador in list(self._em_execucao.items()):
+            if trabalhador in perdidos:
+                del self._em_execucao[tarefa]
+                self._falhou(tarefa, f'trabalhador {trabalhador} perdido')
+        for trabalhador in perdidos:
+            del self._batimentos[trabalhador]
+
+    def _falhou(self, tarefa, erro):
+        """Reenfileira a tarefa ou, esgotadas as tentativas, a conclui com erro."""
+        if tarefa in self._concluidas:
+            return
+        self._falhas[tarefa] += 1
+        if self._falhas[tarefa] < self.max_tentativas:
+            self._fila.appendleft(tarefa)
+            self._reenfileiradas += 1
+            return
+        self._concluidas.add(tarefa)
+        self._novos_resultados.append((self._specs[tarefa], {'erro': erro, 'tentativas': self._falhas[tarefa]}))
+
+    def adiciona(self, spec):
+        with self._trava:
+            tarefa = next(self._ids)
+            self._specs[tarefa] = spec
+            self._fila.append(tarefa)
+            return tarefa
+
+    def pega(self, trabalhador):
+        """Retorna (id, spec) da próxima tarefa, ou None se a fila está vazia."""
+        with self._trava:
+            self._batimentos[trabalhador] = time.monotonic()
+            self._expira()
+            while self._fila:
+                tarefa = self._fila.popleft()
+                if tarefa not in self._concluidas:
+                    self._em_execucao[tarefa] = trabalhador
+                    return tarefa, self._specs[tarefa]
+            return None
+
+    def batimento(self, trabalhador):
+        with self._trava:
+            self._batimentos[trabalhador] = time.monotonic()
+
+    def entrega(self, trabalhador, tarefa, resultado):
+        with self._trava:
+            self._batimentos[trabalhador] = time.monotonic()
+            if self._em_execucao.get(tarefa) == trabalhador:
+                del self._em_execucao[tarefa]
+            if tarefa in self._concluidas:
+                return
+            self._concluidas.add(tarefa)
+            self._novos_resultados.append((self._specs[tarefa], resultado))
+
+    def falha(self, trabalhador, tarefa, erro):
+        """Registra uma exceção do trabalhador ao executar a tarefa."""
+        with self._trava:
+            self._batimentos[trabalhador] = time.monotonic()
+            if self._em_execucao.get(tarefa) == trabalhador:
+                del self._em_execucao[tarefa]
+            self._falhou(tarefa, erro)
+
+    def coleta(self):
+        """Resultados recebidos desde a última coleta, como [(spec, resultado)]."""
+        with self._trava:
+            self._expira()
+            novos, self._novos_resultados = self._novos_resultados, []
+            self._coletadas += len(novos)
+            return novos
+
+    def pendentes(self):
+        """Tarefas cujo resultado ainda não foi coletado (inclui fila e em execução)."""
+        with self._trava:
+            return len(self._specs) - self._coletadas
+
+    def estado(self):
+        with self._trava:
+            return {
+                'fila': len(self._fila),
+                'em_execucao': len(self._em_execucao),
+                'concluidas': len(self._concluidas),
+                'trabalhadores': sorted(self._batimentos),
+                'reenfileiradas': self._reenfileiradas,
+                'falhas': sum(self._falhas.values()),
+            }
+
+    def encerra(self):
+        with self._trava:
+            self._encerrado = True
+
+    def encerrado(self):
+        with self._trava:
+            return self._encerrado
+
+
+# Instância única, criada no processo servidor pelo inicializador do gerente
+_coordenador = None
+
+
+def _cria_coordenador(tempo_limite, max_tentativas):
+    global _coordenador
+    _coordenador = Coordenador(tempo_limite, max_tentativas)
+
+
+def _obtem_coordenador():
+    return _coordenador
+
+
+class GerenteCoordenador(BaseManager):
+    pass
+
+
+GerenteCoordenador.register('coordenador', callable=_obtem_coordenador)
+
+
+def eh_loopback(host):
+    """Se `host` resolve para um endereço de loopback ('' = todas as interfaces, não é)."""
+    if not host:
+        return False
+    try:
+        return ipaddress.ip_address(socket.gethostbyname(host)).is_loopback
+    except (OSError, ValueError):
+        return False
+
+
+def chave_coordenador(host, chave=None):
+    """
+    Chave de autenticação do coordenador: a dada ou, só no loopback, uma
+    aleatória desta execução. Fora do loopback a chave é obrigatória.
+    """
+    if chave:
+        return chave
+    if not eh_loopback(host):
+        raise ValueError(f"Coordenador escutando em {host or 'todas as interfaces'!r} exige uma chave (--chave)")
+    return os.urandom(32)
+
+
+def inicia_coordenador(porta=0, host=HOST_PADRAO, chave=None, tempo_limite=10.0, max_tentativas=3):
+    """
+    Sobe o servidor do coordenador (em um processo próprio) e retorna
+    (gerente, proxy do Coordenador). Com porta=0 o sistema escolhe uma;
+    o endereço real fica em gerente.address e a chave em gerente.chave
+    (ver chave_coordenador).
+    """
+    chave = chave_coordenador(host, chave)
+    gerente = GerenteCoordenador(address=(host, porta), authkey=chave)
+    gerente.chave = chave
+    gerente.start(_cria_coordenador, (tempo_limite, max_tentativas))
+    return gerente, gerente.coordenador()
+
+
+def conecta(endereco, chave):
+    """Conecta a um coordenador em `endereco` = (host, porta) e retorna o proxy."""
+    gerente = GerenteCoordenador(address=endereco, authkey=chave)
+    gerente.connect()
+    return gerente.coordenador()
+
+
+def trabalhador(endereco, funcao, chave, espera=0.5):
+    """
+    Laço de um trabalhador: pega tarefas até o coordenador encerrar,
+    executa funcao(spec) e entrega o resultado. Uma thread envia batimentos
+    enquanto a tarefa roda. Exceções de funcao(spec) são relatadas ao
+    coordenador (que decide se tenta de novo) sem derrubar o trabalhador.
+    Retorna quantas tarefas executou.
+    """
+    coordenador = conecta(endereco, chave)
+    nome = f'{socket.gethostname()}:{os.getpid()}'
+    executando = threading.Event()
+    parar = threading.Event()
+
+    def bate():
+        while not parar.wait(INTERVALO_BATIMENTO):
+            if executando.is_set():
+                try:
+                    coordenador.batimento(nome)
+                except (EOFError, ConnectionError):
+                    return
+
+    threading.Thread(target=bate, daemon=True).start()
+    executadas = 0
+    try:
+        while not coordenador.encerrado():
+            tarefa = coordenador.pega(nome)
+            if tarefa is None:
+                time.sleep(espera)
+                continue
+            indice, spec = tarefa
+            executando.set()
+            try:
+                resultado = funcao(spec)
+            except Exception:
+                coordenador.falha(nome, indice, traceback.format_exc())
+                continue
+            finally:
+                executando.clear()
+            coordenador.entrega(nome, indice, resultado)
+            executadas += 1
+    except (EOFError, ConnectionError):
+        pass  # coordenador saiu
+    finally:
+        parar.set()
+    return executadas
+
+
+def endereco_de_texto(texto):
+    """'host:porta' -> (host, porta)."""
+    host, _, porta = texto.rpartition(':')
+    return host or 'localhost', int(porta)
@@ -0,0 +1,156 @@
+import argparse
+import gzip
+import json
+import time
+
+# Log estruturado de execuções do AG em JSONL. Cada linha é um evento:
+#   inicio    - configuração da execução
+#   geracao   - estatísticas (amostradas a cada `intervalo` gerações e sempre que o melhor melhora)
+#   estagnacao, solucao, fim
+# A saída legível no console é só um renderizador sobre os mesmos eventos.
+
+
+def print_tabuleiro(genes):
+    """
+    Imprime o tabuleiro n x n usando:
+    'R' para rainha e '.' para casas vazias.
+    genes[i] indica a linha da rainha na coluna i.
+    """
+    n = len(genes)
+    for linha in range(n):
+        linha_str = ''
+        for col in range(n):
+            if genes[col] == linha:
+                linha_str += 'R '
+            else:
+                linha_str += '. '
+        print(linha_str.rstrip())
+
+
+class RenderizadorConsole:
+    """Mostra os eventos no console no formato usado antes por main.py."""
+
+    def __init__(self, mostra_tabuleiro=True):
+        self.mostra_tabuleiro = mostra_tabuleiro
+
+    def __call__(self, evento):
+        tipo = evento['evento']
+        if tipo == 'inicio':
+            config = evento.get('config', {})
+            print(f"Execução {evento.get('execucao', '')}: n = {config.get('n')}, seed = {config.get('seed')}")
+        elif tipo == 'geracao':
+            print(f"Geração {evento['geracao']}: f_max = {evento['f_max']}, "
+                  f"f_medio = {evento['f_medio']:.2f}, f_min = {evento['f_min']}")
+        elif tipo == 'estagnacao':
+            detalhes = {k: v for k, v in evento.items() if k not in ('evento', 'tipo', 'geracao', 't')}
+            print(f"  [estagnação] geração {evento['geracao']}: {evento['tipo']} {detalhes}")
+        elif tipo == 'solucao':
+            print(f"\nSolução encontrada na geração {evento['geracao']}:")
+            if self.mostra_tabuleiro:
+                print_tabuleiro(evento['genes'])
+        elif tipo == 'fim' and not evento['solucionado']:
+            print('Nenhuma solução perfeita encontrada até o limite de gerações.')
+
+
+class RegistroEventos:
+    """
+    Registro de eventos com escrita bufferizada. Os eventos vão para
+    `caminho` (JSONL; comprimido com gzip se terminar em .gz) em lotes de
+    `tamanho_buffer` e são repassados aos `renderizadores`.
+    """
+
+    def __init__(self, caminho=None, intervalo=1, tamanho_buffer=1024, renderizadores=()):
+        self.caminho = caminho
+        self.intervalo = max(1, intervalo)
+        self.tamanho_buffer = tamanho_buffer
+        self.renderizadores = list(renderizadores)
+        self._buffer = []
+        self._arquivo = None
+        self._melhor = None
+        self._execucao = 0
+        if caminho is not None:
+            abre = gzip.open if caminho.endswith('.gz') else open
+            self._arquivo = abre(caminho, 'at', encoding='utf-8')
+
+    @classmethod
+    def from_config(cls, config, verbose=True):
+        """Cria o registro a partir do bloco 'log_eventos' da config."""
+        params = config.get('log_eventos', {})
+        return cls(
+            caminho=params.get('arquivo'),
+            intervalo=params.get('intervalo', 1),
+            tamanho_buffer=params.get('tamanho_buffer', 1024),
+            renderizadores=[RenderizadorConsole()] if verbose else (),
+        )
+
+    def emite(self, evento, **dados):
+        registro = {'evento': evento, 't': time.time(), **dados}
+        for renderizador in self.renderizadores:
+            renderizador(registro)
+        if self._arquivo is not None:
+            self._buffer.append(registro)
+            if len(self._buffer) >= self.tamanho_buffer:
+                self.flush()
+
+    def inicio(self, config):
+        self._execucao += 1
+        self._melhor = None
+        self.emite('inicio', execucao=self._execucao, config=config)
+
+    def geracao(self, geracao, f_max, f_medio, f_min):
+        """Emite as estatísticas só nas gerações amostradas ou quando o melhor melhora."""
+        melhorou = self._melhor is None or f_max > self._melhor
+        if melhorou:
+            self._melhor = f_max
+        elif geracao % self.intervalo != 0:
+            return
+        self.emite('geracao', execucao=self._execucao, geracao=geracao,
+                   f_max=f_max, f_medio=f_medio, f_min=f_min, melhoria=melhorou)
+
+    def estagnacao(self, evento):
+        dados = dict(evento)
+        self.emite('estagnacao', execucao=self._execucao, tipo=dados.pop('evento'), **dados)
+
+    def solucao(self, geracao, genes):
+        self.emite('solucao', execucao=self._execucao, geracao=geracao, genes=list(genes))
+
+    def fim(self, geracoes, solucionado, tempo_s, **dados):
+        self.emite('fim', execucao=self._execucao, geracoes=geracoes,
+                   solucionado=solucionado, tempo_s=tempo_s, **dados)
+
+    def flush(self):
+        if self._arquivo is not None and self._buffer:
+            self._arquivo.write(''.join(json.dumps(r) + '\n' for r in self._buffer))
+            self._buffer = []
+            self._arquivo.flush()
+
+    def fecha(self):
+        self.flush()
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fecha()
+
+
+def le_eventos(caminho):
+    """Lê um log de eventos (JSONL ou JSONL.gz), um evento por vez."""
+    abre = gzip.open if caminho.endswith('.gz') else open
+    with abre(caminho, 'rt', encoding='utf-8') as f:
+        for linha in f:
+            if linha.strip():
+                yield json.loads(linha)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Mostra um log de eventos do AG no console')
+    parser.add_argument('arquivo', help='Arquivo .jsonl ou .jsonl.gz gerado por RegistroEventos')
+    parser.add_argument('--sem-tabuleiro', action='store_true')
+    args = parser.parse_args()
+    renderizador = RenderizadorConsole(mostra_tabuleiro=not args.sem_tabuleiro)
+    for evento in le_eventos(args.arquivo):
+        renderizador(evento)
@@ -0,0 +1,144 @@
+import random
+
+# Índice de conflitos por rainha, para as mutações dirigidas de
+# operadores.py. Guarda quantas rainhas há em cada diagonal (e quais),
+# quantas rainhas atacam cada coluna e uma árvore de Fenwick sobre essas
+# contagens: sortear uma coluna com probabilidade proporcional aos seus
+# conflitos custa O(log n), e uma troca de colunas atualiza tudo em
+# O(k log n), com k o número de rainhas nas diagonais tocadas (pequeno
+# perto da solução). Vale para permutações (sem duas rainhas na mesma linha).
+
+
+class IndiceConflitos:
+    """
+    Conflitos por rainha de um indivíduo. `energia` é o total de pares em
+    conflito, igual a Individuo.calc_conflitos; o índice fica em
+    `individuo.indice` até a próxima avaliação, que usa a energia no lugar
+    do laço O(n²) (se os genes ainda coincidirem com `linhas`) e o libera.
+    """
+
+    def __init__(self, individuo):
+        n = individuo.n
+        self.n = n
+        self.individuo = individuo
+        self.linhas = list(individuo.genes)
+        self.principal = [0] * (2 * n - 1)
+        self.secundaria = [0] * (2 * n - 1)
+        self.membros_principal = [[] for _ in range(2 * n - 1)]
+        self.membros_secundaria = [[] for _ in range(2 * n - 1)]
+        for col, linha in enumerate(self.linhas):
+            self.principal[linha + col] += 1
+            self.secundaria[linha - col + n - 1] += 1
+            self.membros_principal[linha + col].append(col)
+            self.membros_secundaria[linha - col + n - 1].append(col)
+        self.pesos = [
+            self.principal[linha + col] + self.secundaria[linha - col + n - 1] - 2
+            for col, linha in enumerate(self.linhas)
+        ]
+        self.energia = sum(self.pesos) // 2
+        # Fenwick 1-indexada, construída em O(n)
+        self.arvore = [0] + self.pesos
+        for i in range(1, n + 1):
+            pai = i + (i & -i)
+            if pai <= n:
+                self.arvore[pai] += self.arvore[i]
+        self.mascara = 1 << (n.bit_length() - 1)
+
+    @classmethod
+    def de(cls, individuo):
+        """Índice do indivíduo: o que já está em individuo.indice, se ainda valer, ou um novo."""
+        indice = individuo.indice
+        if indice is None or indice.individuo is not individuo or indice.linhas != individuo.genes:
+            indice = cls(individuo)
+            individuo.indice = indice
+        return indice
+
+    def _ajusta(self, col, delta):
+        self.pesos[col] += delta
+        i = col + 1
+        while i <= self.n:
+            self.arvore[i] += delta
+            i += i & -i
+
+    def sorteia(self, rng=random, exceto=None):
+        """
+        Coluna sorteada com probabilidade proporcional aos seus conflitos
+        (O(log n)), ou None se nenhuma tiver conflito. `exceto` tira uma
+        coluna do sorteio.
+        """
+        peso_excluido = 0
+        if exceto is not None and self.pesos[exceto]:
+            peso_excluido = self.pesos[exceto]
+            self._ajusta(exceto, -peso_excluido)
+        total = 2 * self.energia - peso_excluido
+        if total <= 0:
+            if peso_excluido:
+                self._ajusta(exceto, peso_excluido)
+            return None
+        alvo = rng.randrange(total)
+        pos = 0
+        mascara = self.mascara
+        while mascara:
+            proximo = pos + mascara
+            if proximo <= self.n and self.arvore[proximo] <= alvo:
+                pos = proximo
+                alvo -= self.arvore[proximo]
+            mascara >>= 1
+        if peso_excluido:
+            self._ajusta(exceto, peso_excluido)
+        return pos
+
+    def _tira(self, col):
+        linha = self.linhas[col]
+        for membros, contagem, d in ((self.membros_principal, self.principal, linha + col),
+                                     (self.membros_secundaria, self.secundaria, linha - col + self.n - 1)):
+            membros[d].remove(col)
+            contagem[d] -= 1
+            for outra in membros[d]:
+                self._ajusta(outra, -1)
+            self._ajusta(col, -contagem[d])
+            self.energia -= contagem[d]
+
+    def _poe(self, col, linha):
+        self.linhas[col] = linha
+        for membros, contagem, d in ((self.membros_principal, self.principal, linha + col),
+                                     (self.membros_secundaria, self.secundaria, linha - col + self.n - 1)):
+            for outra in membros[d]:
+                self._ajusta(outra, 1)
+            self._ajusta(col, contagem[d])
+            self.energia += contagem[d]
+            membros[d].append(col)
+            contagem[d] += 1
+
+    def variacao_troca(self, i, j):
+        """Variação de energia se as colunas i e j fossem trocadas, em O(1) e sem alterar o índice."""
+        n = self.n
+        a, b = self.linhas[i], self.linhas[j]
+        diagonais = ((self.principal, a + i), (self.secundaria, a - i + n - 1),
+                     (self.principal, b + j), (self.secundaria, b - j + n - 1))
+        delta = 0
+        for contagem, d in diagonais:
+            contagem[d] -= 1
+            delta -= contagem[d]
+        novas = ((self.principal, b + i), (self.secundaria, b - i + n - 1),
+                 (self.principal, a + j), (self.secundaria, a - j + n - 1))
+        for contagem, d in novas:
+            delta += contagem[d]
+            contagem[d] += 1
+        for contagem, d in novas:
+            contagem[d] -= 1
+        for contagem, d in diagonais:
+            contagem[d] += 1
+        return delta
+
+    def troca(self, i, j):
+        """Troca as colunas i e j no índice e nos genes do indivíduo; retorna a variação de energia."""
+        antes = self.energia
+        a, b = self.linhas[i], self.linhas[j]
+        self._tira(i)
+        self._tira(j)
+        self._poe(i, b)
+        self._poe(j, a)
+        genes = self.individuo.genes
+        genes[i], genes[j] = b, a
+        return self.energia - antes
@@ -7,20 +7,22 @@ class Individuo:
     é a linha da rainha.
     """
 
-    def __init__(self, n, genes=None):
+    def __init__(self, n, genes=None, rng=random):
         if n < 4:
             raise ValueError("Para n-rainhas, n deve ser ≥ 4")
         self.n = n
         if genes is None:
             # Gera uma permutação aleatória de 0 a n-1
             self.genes = list(range(n))
-            random.shuffle(self.genes)
+            rng.shuffle(self.genes)
         else:
             if len(genes) != n:
                 raise ValueError(f"Genes deve ter tamanho {n}")
             self.genes = genes.copy()
         self.conflitos = None
         self.fitness_value = None
+        # IndiceConflitos das mutações dirigidas (ver indice_conflitos.py)
+        self.indice = None
 
     def calc_conflitos(self):
         """
@@ -28,6 +30,14 @@ class Individuo:
         O conflito aceontece quando temos mais de uma rainha
         em uma mesma linha ou mesma diagonal.
         """
+        if self.indice is not None and self.indice.individuo is self and self.indice.linhas == self.genes:
+            # Mantido em dia pelas mutações dirigidas: sem o laço O(n²). O
+            # índice só serve à mutação que o criou e é liberado aqui, para
+            # não ficar um por indivíduo da população
+            self.conflitos = self.indice.energia
+            self.indice = None
+            return self.conflitos
+        self.indice = None
         n = self.n
         conflitos = 0
         for i in range(n):
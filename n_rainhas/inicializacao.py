@@ -0,0 +1,147 @@
+import random
+import numpy as np
+from lote import conflitos_lote
+
+# Estratégias de inicialização: cada uma recebe (n, rng) e devolve a lista
+# de genes de um indivíduo (uma permutação de 0..n-1).
+
+
+def inicializa_aleatoria(n, rng=random):
+    """Permutação uniforme, como em Individuo(n)."""
+    genes = list(range(n))
+    rng.shuffle(genes)
+    return genes
+
+
+def inicializa_gulosa(n, rng=random, candidatos=8):
+    """
+    Construção gulosa aleatorizada, atenta às diagonais: percorre as colunas
+    em ordem aleatória e, para cada uma, sorteia até `candidatos` linhas
+    ainda livres e fica com a que menos ocupa diagonais já usadas.
+    Custo O(n * candidatos) por indivíduo.
+    """
+    genes = [None] * n
+    livres = list(range(n))
+    diag_principal = [0] * (2 * n - 1)
+    diag_secundaria = [0] * (2 * n - 1)
+    colunas = list(range(n))
+    rng.shuffle(colunas)
+    for col in colunas:
+        melhor_pos = None
+        melhor_custo = None
+        for _ in range(min(candidatos, len(livres))):
+            pos = rng.randrange(len(livres))
+            linha = livres[pos]
+            custo = diag_principal[linha + col] + diag_secundaria[linha - col + n - 1]
+            if melhor_custo is None or custo < melhor_custo:
+                melhor_pos, melhor_custo = pos, custo
+                if custo == 0:
+                    break
+        linha = livres[melhor_pos]
+        # Remove em O(1) trocando com o último
+        livres[melhor_pos] = livres[-1]
+        livres.pop()
+        genes[col] = linha
+        diag_principal[linha + col] += 1
+        diag_secundaria[linha - col + n - 1] += 1
+    return genes
+
+
+def solucao_construtiva(n):
+    """
+    Solução explícita clássica para n-rainhas (n >= 4): linhas pares seguidas
+    das ímpares, com os ajustes conhecidos quando n % 6 é 2 ou 3.
+    """
+    pares = list(range(2, n + 1, 2))
+    impares = list(range(1, n + 1, 2))
+    if n % 6 == 2:
+        impares[0], impares[1] = impares[1], impares[0]
+        impares.remove(5)
+        impares.append(5)
+    elif n % 6 == 3:
+        pares.remove(2)
+        pares.append(2)
+        impares.remove(1)
+        impares.remove(3)
+        impares.extend([1, 3])
+    return [linha - 1 for linha in pares + impares]
+
+
+def inicializa_construtiva(n, rng=random, trocas=None):
+    """
+    Parte da solução construtiva, aplica uma das 8 simetrias do tabuleiro
+    e `trocas` swaps aleatórios (padrão: max(2, n // 20)) para perturbá-la.
+    """
+    genes = solucao_construtiva(n)
+    if rng.random() < 0.5:
+        genes.reverse()
+    if rng.random() < 0.5:
+        genes = [n - 1 - linha for linha in genes]
+    if rng.random() < 0.5:
+        # Transposição: a coluna vira linha
+        transposta = [0] * n
+        for col, linha in enumerate(genes):
+            transposta[linha] = col
+        genes = transposta
+    if trocas is None:
+        trocas = max(2, n // 20)
+    for _ in range(trocas):
+        i, j = rng.sample(range(n), 2)
+        genes[i], genes[j] = genes[j], genes[i]
+    return genes
+
+
+INICIALIZACOES = {
+    'aleatoria': inicializa_aleatoria,
+    'gulosa': inicializa_gulosa,
+    'construtiva': inicializa_construtiva,
+}
+
+
+def gera_genes(n, quantidade, estrategia='aleatoria', rng=random,
+               proporcao_heuristica=1.0, **estrategia_args):
+    """
+    Gera os genes de `quantidade` indivíduos: a fração `proporcao_heuristica`
+    vem da estratégia escolhida e o restante é aleatório, para manter
+    diversidade na população inicial.
+    """
+    funcao = INICIALIZACOES[estrategia]
+    heuristicos = round(quantidade * proporcao_heuristica)
+    return [
+        funcao(n, rng=rng, **estrategia_args) if i < heuristicos else inicializa_aleatoria(n, rng=rng)
+        for i in range(quantidade)
+    ]
+
+
+def estende_genes(genes, rng=random):
+    """
+    Estende uma permutação de n para n + 1 rainhas, inserindo uma coluna nova
+    com a rainha na linha nova (n, acima de todas, ou 0, deslocando as
+    demais). Das 2 * (n + 1) posições possíveis, fica com a de menos
+    conflitos no tabuleiro resultante (empates sorteados).
+    """
+    n = len(genes)
+    base = np.asarray(genes, dtype=np.int64)
+    candidatos = np.empty((2 * (n + 1), n + 1), dtype=np.int64)
+    for coluna in range(n + 1):
+        candidatos[2 * coluna] = np.insert(base, coluna, n)
+        candidatos[2 * coluna + 1] = np.insert(base + 1, coluna, 0)
+    conflitos = conflitos_lote(candidatos)
+    melhores = np.flatnonzero(conflitos == conflitos.min())
+    return candidatos[melhores[rng.randrange(len(melhores))]].tolist()
+
+
+def estende_populacao(genes_anteriores, quantidade, rng=random, proporcao=1.0):
+    """
+    Genes da população inicial para n + 1 a partir da população final de
+    n (warm start). A fração `proporcao` estende os indivíduos anteriores na
+    ordem dada (passe os melhores primeiro), repetindo-os se faltarem; o
+    restante é aleatório, como em gera_genes.
+    """
+    n = len(genes_anteriores[0]) + 1
+    estendidos = round(quantidade * proporcao)
+    return [
+        estende_genes(genes_anteriores[i % len(genes_anteriores)], rng=rng) if i < estendidos
+        else inicializa_aleatoria(n, rng=rng)
+        for i in range(quantidade)
+    ]
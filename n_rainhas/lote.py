@@ -0,0 +1,297 @@
+import math
+import numpy as np
+from individuo import Individuo
+
+# Operações vetorizadas sobre populações guardadas como arrays NumPy,
+# onde cada linha de `genes` (tamanho x n) é um indivíduo.
+
+
+def _pares_repetidos(valores, amplitude):
+    """
+    Conta, por linha, quantos pares de posições têm o mesmo valor.
+    `valores` deve estar em [0, amplitude).
+    """
+    m = valores.shape[0]
+    deslocados = valores + (np.arange(m, dtype=np.int64) * amplitude)[:, None]
+    contagem = np.bincount(deslocados.ravel(), minlength=m * amplitude).reshape(m, amplitude)
+    return (contagem * (contagem - 1) // 2).sum(axis=1)
+
+
+def conflitos_lote(genes):
+    """
+    Número de pares de rainhas em conflito para cada linha de `genes`,
+    com o mesmo critério de Individuo.calc_conflitos (mesma linha ou diagonal).
+    """
+    genes = np.asarray(genes, dtype=np.int64)
+    if genes.ndim == 1:
+        genes = genes[None, :]
+    n = genes.shape[1]
+    colunas = np.arange(n, dtype=np.int64)
+    return (
+        _pares_repetidos(genes, n)
+        + _pares_repetidos(genes + colunas, 2 * n - 1)
+        + _pares_repetidos(genes - colunas + (n - 1), 2 * n - 1)
+    )
+
+
+def fitness_lote(genes):
+    """Fitness (pares sem conflito) de cada linha de `genes`."""
+    genes = np.asarray(genes)
+    n = genes.shape[-1]
+    return n * (n - 1) // 2 - conflitos_lote(genes)
+
+
+def permutacoes_lote(gerador, quantidade, n):
+    """Gera `quantidade` permutações aleatórias de 0..n-1 de uma só vez."""
+    return np.argsort(gerador.random((quantidade, n)), axis=1).astype(np.int32)
+
+
+def nome_operador(operador, prefixo):
+    """Aceita o nome curto ('torneio') ou a função de operadores.py (selecao_torneio)."""
+    if isinstance(operador, str):
+        return operador
+    return operador.__name__[len(prefixo):] if operador.__name__.startswith(prefixo) else operador.__name__
+
+
+def selecao_indices(fitness, metodo, quantidade, gerador, k=3, taxa=0.5):
+    """
+    Versão por índices dos métodos de seleção de operadores.py:
+    retorna `quantidade` índices de pais sorteados a partir do vetor de fitness.
+    """
+    metodo = nome_operador(metodo, 'selecao_')
+    fitness = np.asarray(fitness)
+    tamanho = fitness.shape[0]
+    if metodo == 'torneio':
+        competidores = gerador.integers(0, tamanho, size=(quantidade, k))
+        vencedor = np.argmax(fitness[competidores], axis=1)
+        return competidores[np.arange(quantidade), vencedor]
+    if metodo == 'roleta':
+        acumulado = np.cumsum(fitness, dtype=np.float64)
+        pontos = gerador.random(quantidade) * acumulado[-1]
+        return np.minimum(np.searchsorted(acumulado, pontos, side='left'), tamanho - 1)
+    if metodo == 'truncamento':
+        k_melhores = min(tamanho, max(2, int(tamanho * taxa)))
+        pool = np.argpartition(-fitness, k_melhores - 1)[:k_melhores]
+        return pool[gerador.integers(0, k_melhores, size=quantidade)]
+    if metodo == 'ranking':
+        ordem = np.argsort(fitness, kind='stable')
+        acumulado = np.cumsum(np.arange(1, tamanho + 1, dtype=np.float64))
+        pontos = 1 + gerador.random(quantidade) * (acumulado[-1] - 1)
+        return ordem[np.minimum(np.searchsorted(acumulado, pontos, side='left'), tamanho - 1)]
+    raise ValueError(f"Método de seleção desconhecido: {metodo}")
+
+
+def elites_indices(fitness, elitismo, elitismo_args=None):
+    """
+    Índices dos elitistas, do melhor para o pior, com o mesmo critério
+    das funções de elitismo de operadores.py.
+    """
+    nome = nome_operador(elitismo, 'elitismo_')
+    args = elitismo_args or {}
+    fitness = np.asarray(fitness)
+    tamanho = fitness.shape[0]
+    if nome == 'threshold':
+        return np.flatnonzero(fitness >= args['threshold'])
+    if nome == 'none':
+        k = 0
+    elif nome == 'fixo':
+        k = min(args['k'], tamanho)
+    elif nome == 'percentual':
+        k = min(tamanho, max(1, math.ceil(tamanho * args['taxa'])))
+    else:
+        raise ValueError(f"Elitismo desconhecido: {nome}")
+    if k == 0:
+        return np.empty(0, dtype=np.int64)
+    indices = np.argpartition(-fitness, k - 1)[:k]
+    return indices[np.argsort(-fitness[indices], kind='stable')]
+
+
+# Operadores em lote: cada um recebe arrays (pares, n) de permutações e uma
+# máscara booleana das linhas em que o operador é aplicado; as demais linhas
+# ficam como estão. Os pontos de corte são sorteados como nas versões
+# escalares de operadores.py (duas posições distintas, segmento [i, j)),
+# então as distribuições dos filhos são as mesmas.
+
+
+def _pontos_lote(gerador, quantidade, n):
+    """Sorteia `quantidade` pares de posições distintas; retorna (i, j) com i < j."""
+    i = gerador.integers(0, n, size=quantidade)
+    j = gerador.integers(0, n - 1, size=quantidade)
+    j += j >= i
+    return np.minimum(i, j), np.maximum(i, j)
+
+
+def _no_segmento(i, j, n):
+    """Máscara (linhas x n) das posições dentro de [i, j) em cada linha."""
+    posicoes = np.arange(n)
+    return (posicoes >= i[:, None]) & (posicoes < j[:, None])
+
+
+def _posicoes(genes):
+    """Inversa de cada permutação: posicoes[r, v] é a coluna do valor v na linha r."""
+    linhas = np.arange(genes.shape[0])[:, None]
+    posicoes = np.empty_like(genes)
+    posicoes[linhas, genes] = np.arange(genes.shape[1])
+    return posicoes
+
+
+def mutacao_swap_lote(genes, mascara, gerador):
+    """Troca duas posições em cada linha selecionada (altera `genes`)."""
+    linhas = np.flatnonzero(mascara)
+    i, j = _pontos_lote(gerador, linhas.size, genes.shape[1])
+    genes[linhas, i], genes[linhas, j] = genes[linhas, j], genes[linhas, i]
+    return genes
+
+
+def mutacao_inversao_lote(genes, mascara, gerador):
+    """Inverte o segmento [i, j) de cada linha selecionada (altera `genes`)."""
+    linhas = np.flatnonzero(mascara)
+    n = genes.shape[1]
+    i, j = _pontos_lote(gerador, linhas.size, n)
+    posicoes = np.arange(n)
+    origem = np.where(_no_segmento(i, j, n), (i + j - 1)[:, None] - posicoes, posicoes)
+    genes[linhas] = np.take_along_axis(genes[linhas], origem, axis=1)
+    return genes
+
+
+def mutacao_scramble_lote(genes, mascara, gerador):
+    """Embaralha o segmento [i, j) de cada linha selecionada (altera `genes`)."""
+    linhas = np.flatnonzero(mascara)
+    n = genes.shape[1]
+    i, j = _pontos_lote(gerador, linhas.size, n)
+    # Fora do segmento a chave é a própria posição; dentro, i + U[0, 1),
+    # que fica entre i - 1 e j: ordenar as chaves embaralha só o segmento.
+    chaves = np.broadcast_to(np.arange(n, dtype=np.float64), (linhas.size, n)).copy()
+    segmento = _no_segmento(i, j, n)
+    chaves[segmento] = np.repeat(i, j - i) + gerador.random(int((j - i).sum()))
+    genes[linhas] = np.take_along_axis(genes[linhas], np.argsort(chaves, axis=1), axis=1)
+    return genes
+
+
+def _ox_lote(p1, p2, i, j):
+    """Filhos OX de p1 x p2: segmento de p1 e o restante na ordem de p2."""
+    m, n = p1.shape
+    segmento = _no_segmento(i, j, n)
+    filhos = np.where(segmento, p1, 0)
+    # Genes de p2 que não estão no segmento de p1, em ordem
+    pos_em_p1 = np.take_along_axis(_posicoes(p1), p2, axis=1)
+    resto = ~((pos_em_p1 >= i[:, None]) & (pos_em_p1 < j[:, None]))
+    ordem = np.cumsum(resto, axis=1) - 1
+    destino = np.where(ordem < i[:, None], ordem, ordem + (j - i)[:, None])
+    destino += (np.arange(m) * n)[:, None]
+    filhos.ravel()[destino[resto]] = p2[resto]
+    return filhos
+
+
+def _pmx_lote(p1, p2, i, j):
+    """
+    Filhos PMX de p1 x p2: segmento de p1 e o resto de p2, seguindo o
+    mapeamento p1[k] -> p2[k] do segmento enquanto o gene de p2 repetir
+    algum do segmento.
+    """
+    m, n = p1.shape
+    segmento = _no_segmento(i, j, n)
+    filhos = np.where(segmento, p1, p2)
+    pos_em_p1 = _posicoes(p1)
+    linhas, colunas = np.nonzero(~segmento)
+    valores = filhos[linhas, colunas]
+    while True:
+        pos = pos_em_p1[linhas, valores]
+        repetido = (pos >= i[linhas]) & (pos < j[linhas])
+        if not repetido.any():
+            break
+        linhas, colunas, valores, pos = (
+            linhas[repetido], colunas[repetido], valores[repetido], pos[repetido])
+        valores = p2[linhas, pos]
+        filhos[linhas, colunas] = valores
+    return filhos
+
+
+def _aplica_crossover(filho_de, pais1, pais2, mascara, gerador):
+    filhos1, filhos2 = pais1.copy(), pais2.copy()
+    linhas = np.flatnonzero(mascara)
+    i, j = _pontos_lote(gerador, linhas.size, pais1.shape[1])
+    p1, p2 = pais1[linhas], pais2[linhas]
+    filhos1[linhas] = filho_de(p1, p2, i, j)
+    filhos2[linhas] = filho_de(p2, p1, i, j)
+    return filhos1, filhos2
+
+
+def crossover_ordem_lote(pais1, pais2, mascara, gerador):
+    """OX em lote: retorna (filhos1, filhos2); fora da máscara, cópias dos pais."""
+    return _aplica_crossover(_ox_lote, pais1, pais2, mascara, gerador)
+
+
+def crossover_pmx_lote(pais1, pais2, mascara, gerador):
+    """PMX em lote: retorna (filhos1, filhos2); fora da máscara, cópias dos pais."""
+    return _aplica_crossover(_pmx_lote, pais1, pais2, mascara, gerador)
+
+
+# Nomes curtos (como em main.py) dos operadores que têm versão em lote
+CROSSOVERS_LOTE = {
+    'ordem': crossover_ordem_lote,
+    'pmx': crossover_pmx_lote,
+}
+
+MUTACOES_LOTE = {
+    'swap': mutacao_swap_lote,
+    'inversao': mutacao_inversao_lote,
+    'scramble': mutacao_scramble_lote,
+}
+
+
+def _versao_lote(operador, prefixo, registro):
+    if not isinstance(operador, str) and not hasattr(operador, '__name__'):
+        return None  # p.ex. operadores adaptativos
+    return registro.get(nome_operador(operador, prefixo))
+
+
+def reproduz_bloco(genes, fitness, quantidade, selecao, crossover, p_crossover,
+                   mutacao, p_mutacao, rng):
+    """
+    Gera `quantidade` filhos a partir da população (genes, fitness):
+    seleção por índices e crossover/mutação com as versões em lote quando
+    existirem (CROSSOVERS_LOTE / MUTACOES_LOTE), senão com os operadores
+    escalares de operadores.py. `rng` deve ser um aleatorio.FluxoAleatorio.
+    Retorna o array de genes dos filhos e o número de crossovers e de
+    mutações aplicados.
+    """
+    n = genes.shape[1]
+    pares = (quantidade + 1) // 2
+    pais = selecao_indices(fitness, selecao, 2 * pares, rng.gerador)
+    # Lê os pais em ordem crescente de posição (acesso sequencial em memmap)
+    ordem = np.argsort(pais)
+    genes_pais = np.empty((2 * pares, n), dtype=genes.dtype)
+    genes_pais[ordem] = genes[pais[ordem]]
+    sorteios = rng.gerador.random((pares, 3))
+    crossover_lote = _versao_lote(crossover, 'crossover_', CROSSOVERS_LOTE)
+    mutacao_lote = _versao_lote(mutacao, 'mutacao_', MUTACOES_LOTE)
+    if crossover_lote is not None and mutacao_lote is not None:
+        cruzar = sorteios[:, 0] < p_crossover
+        filhos1, filhos2 = crossover_lote(genes_pais[0::2], genes_pais[1::2], cruzar, rng.gerador)
+        filhos = np.empty((2 * pares, n), dtype=genes.dtype)
+        filhos[0::2], filhos[1::2] = filhos1, filhos2
+        mutar = np.empty(2 * pares, dtype=bool)
+        mutar[0::2], mutar[1::2] = sorteios[:, 1] < p_mutacao, sorteios[:, 2] < p_mutacao
+        mutacao_lote(filhos, mutar, rng.gerador)
+        return filhos[:quantidade], int(cruzar.sum()), int(mutar.sum())
+
+    filhos = np.empty((2 * pares, n), dtype=genes.dtype)
+    crossovers = mutacoes = 0
+    for p in range(pares):
+        pai1 = Individuo(n, genes_pais[2 * p].tolist())
+        pai2 = Individuo(n, genes_pais[2 * p + 1].tolist())
+        if sorteios[p, 0] < p_crossover:
+            f1, f2 = crossover(pai1, pai2, rng=rng)
+            crossovers += 1
+        else:
+            f1, f2 = pai1, pai2
+        if sorteios[p, 1] < p_mutacao:
+            mutacao(f1, rng=rng)
+            mutacoes += 1
+        if sorteios[p, 2] < p_mutacao:
+            mutacao(f2, rng=rng)
+            mutacoes += 1
+        filhos[2 * p] = f1.genes
+        filhos[2 * p + 1] = f2.genes
+    return filhos[:quantidade], crossovers, mutacoes
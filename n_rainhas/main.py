@@ -1,16 +1,39 @@
 import argparse
-import random
 import json
+import os
+import queue
+import signal
 import sys
+import time
+import multiprocessing
 from individuo import Individuo
 from populacao import Populacao
+from armazenamento import PopulacaoMemmap
+from paralelo import PopulacaoCompartilhada
+from celular import PopulacaoCelular, diversidade
+from aleatorio import cria_fluxo
+from colheita import colhe
+from tempering import resolve as resolve_tempering
+from cache import CacheResultados, DIRETORIO_PADRAO
+from banco import BancoResultados, ColetorGeracoes, BANCO_PADRAO, variante_de
+from memoria import PerfilMemoria
+from perfilador import perfila
+from trajetoria import GravadorTrajetoria
+from eventos import RegistroEventos, print_tabuleiro
+from controle import ControladorEstagnacao
+from adaptativo import OperadorAdaptativo, CrossoverAdaptativo, MutacaoAdaptativa, salva_traco_csv
 from operadores import (
     selecao_roleta, selecao_torneio, selecao_truncamento, selecao_ranking,
     crossover_ponto_unico, crossover_ordem, crossover_pmx, crossover_uniforme,
     mutacao_swap, mutacao_deslocamento, mutacao_inversao, mutacao_scramble,
+    mutacao_swap_conflitos, mutacao_par_conflitos, mutacao_min_conflitos,
     elitismo_none, elitismo_fixo, elitismo_percentual, elitismo_threshold
 )
 
+LOG_PORTFOLIO = 'portfolio.jsonl'
+# Intervalo (s) entre as checagens de membros mortos no modo portfólio
+INTERVALO_PORTFOLIO = 0.5
+
 # Mapeamento de nome para função
 SELECOES = {
     'roleta': selecao_roleta,
@@ -29,7 +52,13 @@ MUTACOES = {
     'deslocamento': mutacao_deslocamento,
     'inversao': mutacao_inversao,
     'scramble': mutacao_scramble,
+    'swap_conflitos': mutacao_swap_conflitos,
+    'par_conflitos': mutacao_par_conflitos,
+    'min_conflitos': mutacao_min_conflitos,
 }
+# Braços padrão da mutação adaptativa: só as clássicas (as dirigidas a
+# conflitos entram pedindo-as em 'operadores_mutacao')
+MUTACOES_ADAPTATIVAS = ['swap', 'deslocamento', 'inversao', 'scramble']
 ELITISMOS = {
     'none': elitismo_none,
     'fixo': elitismo_fixo,
@@ -37,26 +66,23 @@ ELITISMOS = {
     'threshold': elitismo_threshold,
 }
 
-def print_tabuleiro(genes):
-    """
-    Imprime o tabuleiro n x n usando:
-    'R' para rainha e '.' para casas vazias.
-    genes[i] indica a linha da rainha na coluna i.
-    """
-    n = len(genes)
-    for linha in range(n):
-        linha_str = ''
-        for col in range(n):
-            if genes[col] == linha:
-                linha_str += 'R '
-            else:
-                linha_str += '. '
-        print(linha_str.rstrip())
-
-
 def parse_args():
     parser = argparse.ArgumentParser(description='Algoritmo Genético para n-Rainhas')
-    parser.add_argument('--config', required=True, help='Caminho para arquivo de configuração JSON')
+    grupo = parser.add_mutually_exclusive_group(required=True)
+    grupo.add_argument('--config', help='Caminho para arquivo de configuração JSON')
+    grupo.add_argument('--lote', help='Arquivo JSONL ou lista JSON com várias configurações')
+    grupo.add_argument('--portfolio',
+                       help='Configurações (JSONL ou lista JSON) que correm em paralelo; a primeira solução vence')
+    parser.add_argument('--workers', type=int, default=1, help='Número de processos no modo lote')
+    parser.add_argument('--saida', default='resultados_lote.jsonl', help='Arquivo JSONL com o resumo de cada execução')
+    parser.add_argument('--cache', default=DIRETORIO_PADRAO, help='Diretório do cache de resultados (modo lote)')
+    parser.add_argument('--sem-cache', action='store_true', help='Reexecuta tudo, sem consultar nem gravar o cache')
+    parser.add_argument('--perfil', metavar='DIRETORIO',
+                        help='Roda cada execução do lote sob cProfile e grava um .pstats por execução')
+    parser.add_argument('--banco', default=BANCO_PADRAO, help='Banco SQLite onde as execuções são registradas')
+    parser.add_argument('--sem-banco', action='store_true', help='Não registra as execuções no banco')
+    parser.add_argument('--log-portfolio', default=LOG_PORTFOLIO,
+                        help='JSONL com o vencedor e o estado de cada membro de cada corrida')
     return parser.parse_args()
 
 
@@ -65,29 +91,24 @@ def load_config(path):
         return json.load(f)
 
 
-def main():
-    args = parse_args()
-    config = load_config(args.config)
-
-    # Fixar seed, se fornecida
-    seed = config.get('seed')
-    if seed is not None:
-        random.seed(seed)
-
-    n = config['n']
-    pop_size = config['pop_size']
-    max_gens = config['max_gens']
-
-    # Seleção e operadores
-    selecao = SELECOES[config.get('selecao', 'torneio')]
-    crossover = CROSSOVERS[config.get('crossover', 'ponto_unico')]
-    mutacao = MUTACOES[config.get('mutacao', 'swap')]
-    elitismo = ELITISMOS[config.get('elitismo', 'none')]
+def load_configs_lote(path):
+    """
+    Lê as configurações do modo lote: aceita uma lista JSON
+    ou um arquivo JSONL com uma configuração por linha.
+    """
+    with open(path) as f:
+        conteudo = f.read()
+    try:
+        dados = json.loads(conteudo)
+    except json.JSONDecodeError:
+        dados = [json.loads(linha) for linha in conteudo.splitlines() if linha.strip()]
+    if isinstance(dados, dict):
+        dados = [dados]
+    return dados
 
-    p_crossover = config.get('p_crossover', 0.8)
-    p_mutacao = config.get('p_mutacao', 0.1)
 
-    # Parâmetros extras para elitismo
+def monta_operadores(config):
+    """Resolve os nomes da configuração para as funções e parâmetros do AG."""
     elitismo_args = None
     tipo = config.get('elitismo')
     if tipo == 'fixo':
@@ -97,46 +118,522 @@ def main():
     elif tipo == 'threshold':
         elitismo_args = {'threshold': config.get('elitismo_threshold', 0)}
 
-    # Inicializa população
-    pop = Populacao(n, pop_size)
+    # 'adaptativo' escolhe o operador a cada filho entre os do registro
+    politica = config.get('politica_adaptativa', 'ucb')
+    if config.get('crossover') == 'adaptativo':
+        nomes = config.get('operadores_crossover', list(CROSSOVERS))
+        crossover = CrossoverAdaptativo({nome: CROSSOVERS[nome] for nome in nomes}, politica)
+    else:
+        crossover = CROSSOVERS[config.get('crossover', 'ponto_unico')]
+    if config.get('mutacao') == 'adaptativo':
+        nomes = config.get('operadores_mutacao', MUTACOES_ADAPTATIVAS)
+        mutacao = MutacaoAdaptativa({nome: MUTACOES[nome] for nome in nomes}, politica)
+    else:
+        mutacao = MUTACOES[config.get('mutacao', 'swap')]
+
+    return {
+        'selecao': SELECOES[config.get('selecao', 'torneio')],
+        'crossover': crossover,
+        'p_crossover': config.get('p_crossover', 0.8),
+        'mutacao': mutacao,
+        'p_mutacao': config.get('p_mutacao', 0.1),
+        'elitismo': ELITISMOS[config.get('elitismo', 'none')],
+        'elitismo_args': elitismo_args,
+    }
+
+
+def executar(config, verbose=True, registro=None, parada=None):
+    """
+    Executa uma rodada do AG para a configuração e retorna um resumo com
+    melhor fitness, gerações, avaliações e tempo de parede.
+    Os eventos vão para `registro` (ou para o log do bloco 'log_eventos'
+    da config); com verbose, também são mostrados no console.
+    `parada` (um multiprocessing.Event) interrompe o loop ao fim da
+    geração corrente quando sinalizado (modo portfólio).
+    """
+    inicio = time.perf_counter()
+    proprio_registro = registro is None
+    if proprio_registro:
+        registro = RegistroEventos.from_config(config, verbose)
+    registro.inicio(config)
+
+    # Cada execução tem o seu próprio fluxo aleatório, derivado da seed
+    seed = config.get('seed')
+    rng = cria_fluxo(seed)
+
+    n = config['n']
+    pop_size = config['pop_size']
+    max_gens = config['max_gens']
+    operadores = monta_operadores(config)
+    adaptativos = {
+        tipo: operadores[tipo] for tipo in ('crossover', 'mutacao')
+        if isinstance(operadores[tipo], OperadorAdaptativo)
+    }
+
+    # Perfil de memória (opcional, bloco 'perfil_memoria' da config)
+    perfil = PerfilMemoria.from_config(config)
+    if perfil and (config.get('processos_reproducao') or (config.get('celular') or {}).get('processos', 0) > 1):
+        # Os operadores medidos não vão para os workers (e lá não seriam medidos)
+        raise ValueError("O perfil de memória não suporta reprodução paralela nem blocos celulares paralelos")
+    if perfil:
+        perfil.inicio()
+        operadores['crossover'] = perfil.mede(operadores['crossover'])
+        operadores['mutacao'] = perfil.mede(operadores['mutacao'])
+
+    # Gravação da trajetória da população (opcional, bloco 'trajetoria' da config)
+    gravador = GravadorTrajetoria.from_config(config)
+
+    # Inicializa população (em memória, em grade celular, em arquivos memmap
+    # ou em memória compartilhada com reprodução paralela). Em memória, a
+    # chave 'reproducao' escolhe entre operadores escalares e em lote
+    if config.get('celular'):
+        if adaptativos and config['celular'].get('processos'):
+            raise ValueError("Operadores adaptativos não suportam blocos paralelos")
+        pop = PopulacaoCelular.from_config(config, rng=rng)
+    elif config.get('armazenamento', 'memoria') == 'memmap':
+        pop = PopulacaoMemmap(n, pop_size, config.get('diretorio_memmap', 'populacao_memmap'), rng=rng)
+    elif config.get('processos_reproducao'):
+        if adaptativos:
+            raise ValueError("Operadores adaptativos não suportam reprodução paralela")
+        pop = PopulacaoCompartilhada(n, pop_size, seed=seed, processos=config['processos_reproducao'])
+    else:
+        pop = Populacao(n, pop_size, rng=rng, reproducao=config.get('reproducao', 'escalar'))
+
+    try:
+        if config.get('inicializacao', 'aleatoria') == 'aleatoria':
+            pop.inicializa()
+        else:
+            pop.inicializa(
+                config['inicializacao'],
+                config.get('proporcao_heuristica', 1.0),
+                **config.get('inicializacao_args', {})
+            )
+        pop.avalia()
+
+        max_pairs = n * (n - 1) // 2
+
+        # Controle de estagnação (opcional, bloco 'estagnacao' da config)
+        controlador = ControladorEstagnacao.from_config(config)
+
+        # Diversidade a cada `intervalo` gerações (opcional, bloco 'diversidade')
+        intervalo_diversidade = config.get('diversidade', {}).get('intervalo')
+        serie_diversidade = []
+
+        # Estatísticas e checagem da geração 0
+        gen = 0
+        max_f, mean_f, min_f = pop.estatisticas()
+        if controlador:
+            controlador.observa(gen, max_f, pop, operadores)
+        registro.geracao(gen, max_f, mean_f, min_f)
+        if perfil:
+            perfil.geracao(gen)
+        if gravador:
+            gravador.registra(gen, pop)
+        if intervalo_diversidade:
+            serie_diversidade.append((gen, diversidade(pop)))
+
+        # Loop de gerações
+        while max_f < max_pairs and gen < max_gens:
+            if parada is not None and parada.is_set():
+                break
+            gen += 1
+            pop.gera_nova_geracao(**operadores)
+            for operador in adaptativos.values():
+                operador.fecha_geracao(gen)
+            max_f, mean_f, min_f = pop.estatisticas()
+            registro.geracao(gen, max_f, mean_f, min_f)
+            if perfil:
+                perfil.geracao(gen)
+            if gravador:
+                gravador.registra(gen, pop)
+            if intervalo_diversidade and gen % intervalo_diversidade == 0:
+                serie_diversidade.append((gen, diversidade(pop)))
+            if controlador and max_f < max_pairs:
+                n_eventos = len(controlador.eventos)
+                controlador.observa(gen, max_f, pop, operadores)
+                for evento in controlador.eventos[n_eventos:]:
+                    registro.estagnacao(evento)
+
+        if gravador:
+            gravador.registra(gen, pop, forcar=True)  # última geração sempre gravada
+        if intervalo_diversidade and serie_diversidade[-1][0] != gen:
+            serie_diversidade.append((gen, diversidade(pop)))
+        best = pop.melhor()
+    finally:
+        if gravador:
+            gravador.fecha()
+        if isinstance(pop, (PopulacaoCompartilhada, PopulacaoCelular)):
+            pop.fecha()
+    solucionado = best.fitness_value == max_pairs
+    if solucionado:
+        registro.solucao(gen, best.genes)
+
+    resumo = {
+        'n': n,
+        'seed': seed,
+        'inicializacao': config.get('inicializacao', 'aleatoria'),
+        'melhor_fitness': best.fitness_value,
+        'max_pairs': max_pairs,
+        'solucionado': solucionado,
+        'geracoes': gen,
+        'avaliacoes': pop.avaliacoes + sum(op.avaliacoes for op in adaptativos.values()),
+        'tempo_s': time.perf_counter() - inicio,
+        'genes': best.genes,
+    }
+    resumo['avaliacoes_por_s'] = resumo['avaliacoes'] / max(resumo['tempo_s'], 1e-9)
+    resumo['geracoes_por_s'] = gen / max(resumo['tempo_s'], 1e-9)
+    resumo['contadores'] = pop.contadores()
+    if parada is not None:
+        resumo['interrompido'] = not solucionado and gen < max_gens
+    if controlador:
+        resumo['eventos_estagnacao'] = controlador.eventos
+    if intervalo_diversidade:
+        resumo['diversidade'] = serie_diversidade
+    if perfil:
+        resumo['memoria'] = perfil.fim()
+    if adaptativos:
+        resumo['usos_operadores'] = {tipo: op.usos_totais() for tipo, op in adaptativos.items()}
+        if config.get('arquivo_traco_operadores'):
+            salva_traco_csv(adaptativos, n, config['arquivo_traco_operadores'])
+    registro.fim(gen, solucionado, resumo['tempo_s'], avaliacoes=resumo['avaliacoes'],
+                 melhor_fitness=best.fitness_value)
+    if proprio_registro:
+        registro.fecha()
+    return resumo
+
+
+def executar_colheita(config, verbose=True, parada=None):
+    """
+    Modo colheita: continua após a primeira solução e coleta soluções
+    distintas (a menos de simetrias) até config['colheita']['solucoes']
+    ou o tempo limite (ou até `parada` ser sinalizado). Retorna o resumo
+    com o custo de cada nova solução.
+    """
+    inicio = time.perf_counter()
+    params = config['colheita']
+    seed = config.get('seed')
+    n = config['n']
+    operadores = monta_operadores(config)
+
+    pop = Populacao(n, config['pop_size'], rng=cria_fluxo(seed))
     pop.inicializa()
     pop.avalia()
+    indice, gen = colhe(
+        pop, operadores, params.get('solucoes', 10),
+        tempo_limite=params.get('tempo_limite'), max_gens=config.get('max_gens'),
+        verbose=verbose, parada=parada
+    )
 
-    max_pairs = n * (n - 1) // 2
+    if verbose:
+        print(f'{len(indice)} soluções únicas em {gen} gerações.')
+    if params.get('arquivo_solucoes'):
+        with open(params['arquivo_solucoes'], 'w', encoding='utf-8') as f:
+            for registro in indice.registros:
+                f.write(json.dumps({'n': n, **registro}) + '\n')
 
-    # Estatísticas e checagem da geração 0
-    fitness_vals = [ind.fitness_value for ind in pop.individuos]
-    print(f'Geração 0: f_max = {max(fitness_vals)}, f_medio = {sum(fitness_vals)/len(fitness_vals):.2f}, f_min = {min(fitness_vals)}')
-    if max(fitness_vals) == max_pairs:
-        best = pop.melhor()
-        print('\nSolução encontrada na geração 0:')
-        print_tabuleiro(best.genes)
-        sys.exit(0)
-
-    # Loop de gerações
-    for gen in range(1, max_gens + 1):
-        pop.gera_nova_geracao(
-            selecao=selecao,
-            crossover=crossover,
-            p_crossover=p_crossover,
-            mutacao=mutacao,
-            p_mutacao=p_mutacao,
-            elitismo=elitismo,
-            elitismo_args=elitismo_args
-        )
-        fitness_vals = [ind.fitness_value for ind in pop.individuos]
-        max_f = max(fitness_vals)
-        min_f = min(fitness_vals)
-        mean_f = sum(fitness_vals) / len(fitness_vals)
-        print(f'Geração {gen}: f_max = {max_f}, f_medio = {mean_f:.2f}, f_min = {min_f}')
-
-        if max_f == max_pairs:
-            best = pop.melhor()
-            print(f'\nSolução encontrada na geração {gen}:')
-            print_tabuleiro(best.genes)
-            break
+    resumo = {
+        'n': n,
+        'seed': seed,
+        'solucoes_unicas': len(indice),
+        'geracoes': gen,
+        'avaliacoes': pop.avaliacoes,
+        'tempo_s': time.perf_counter() - inicio,
+        'custos': [
+            {chave: registro[chave] for chave in ('geracao', 'custo_tempo_s', 'custo_avaliacoes')}
+            for registro in indice.registros
+        ],
+    }
+    if parada is not None:
+        resumo['interrompido'] = parada.is_set()
+    return resumo
+
+
+def executar_tempering(config, verbose=True, parada=None):
+    """
+    Motor alternativo ao AG: parallel tempering (ver tempering.py), com os
+    parâmetros do bloco 'tempering' da config. Retorna o mesmo resumo do AG.
+    `parada` encerra as réplicas ao fim da rodada de troca corrente.
+    """
+    params = config.get('tempering', {})
+    resumo = resolve_tempering(
+        config['n'],
+        replicas=params.get('replicas', 4),
+        t_min=params.get('t_min', 0.2),
+        t_max=params.get('t_max', 2.0),
+        passos_por_troca=params.get('passos_por_troca', 1000),
+        max_trocas=config.get('max_gens', 1000),
+        tempo_limite=params.get('tempo_limite'),
+        seed=config.get('seed'),
+        parada=parada,
+    )
+    if verbose:
+        if resumo['solucionado']:
+            print(f"\nSolução encontrada após {resumo['geracoes']} rodadas de troca ({resumo['tempo_s']:.2f}s):")
+            print_tabuleiro(resumo['genes'])
+        else:
+            print(f"Nenhuma solução perfeita encontrada; melhor fitness {resumo['melhor_fitness']}.")
+    return resumo
+
+
+def executar_modo(config, verbose=True, registro=None, parada=None):
+    """
+    Escolhe o modo de execução a partir da configuração. Todos os modos
+    atendem `parada` e encerram os próprios processos ao parar.
+    """
+    if config.get('colheita'):
+        return executar_colheita(config, verbose, parada)
+    if config.get('motor', 'ag') == 'tempering':
+        return executar_tempering(config, verbose, parada)
+    return executar(config, verbose, registro, parada)
+
+
+def cria_processos(config):
+    """
+    Se a execução abre os próprios processos (réplicas do tempering, Pool da
+    reprodução paralela ou dos blocos celulares). Essas não podem rodar dentro de um worker
+    daemônico de multiprocessing.Pool.
+    """
+    return (config.get('motor', 'ag') == 'tempering' or bool(config.get('processos_reproducao'))
+            or (config.get('celular') or {}).get('processos', 0) > 1)
+
+
+def executar_com_historico(config, verbose=True):
+    """
+    Como executar_modo, mas também devolve as estatísticas por geração
+    (lista de (geração, f_max, f_medio, f_min)) em resumo['historico'],
+    para o banco de resultados.
+    """
+    coletor = ColetorGeracoes()
+    with RegistroEventos.from_config(config, verbose) as registro:
+        registro.renderizadores.append(coletor)
+        resumo = executar_modo(config, verbose, registro)
+    return {**resumo, 'historico': coletor.geracoes}
+
+
+def _executar_indexado(item):
+    """
+    Executa uma configuração do lote em um worker, sem saída por geração.
+    Execuções já presentes no cache (se houver) não são refeitas. Com
+    `diretorio_perfil`, a execução roda sob cProfile (ver perfilador.py).
+    """
+    indice, config, diretorio_cache, diretorio_perfil = item
+    cache = CacheResultados(diretorio_cache, ativo=diretorio_cache is not None)
+
+    def executa():
+        return cache.executa(config, config.get('seed'), lambda: executar_com_historico(config, verbose=False))
+
+    if diretorio_perfil:
+        resumo, do_cache = perfila(executa, diretorio_perfil, f'execucao_{indice:05d}')
+    else:
+        resumo, do_cache = executa()
+    return {'indice': indice, 'config': config, 'do_cache': do_cache, **resumo}
+
+
+def executar_lote(configs, workers=1, saida='resultados_lote.jsonl', cache=DIRETORIO_PADRAO, perfil=None,
+                  banco=BANCO_PADRAO):
+    """
+    Executa várias configurações e grava um registro JSON por execução.
+    Com workers > 1 usa um Pool: cada processo importa os módulos uma única
+    vez e é reaproveitado para todas as configurações que receber.
+    `cache` é o diretório do CacheResultados (None desliga o cache),
+    `perfil`, se dado, o diretório dos .pstats de cada execução e `banco`
+    o arquivo SQLite onde as execuções são registradas (None desliga).
+    """
+    itens = [(indice, config, cache, perfil) for indice, config in enumerate(configs)]
+    # Configs que abrem os próprios processos rodam no processo principal,
+    # depois do Pool (os workers do Pool são daemônicos e não podem ter filhos)
+    if workers > 1:
+        no_pool = [item for item in itens if not cria_processos(item[1])]
+        locais = [item for item in itens if cria_processos(item[1])]
+    else:
+        no_pool, locais = [], itens
+    resultados = BancoResultados(banco) if banco else None
+
+    def grava(registro):
+        historico = registro.pop('historico', None)
+        f.write(json.dumps(registro) + '\n')
+        f.flush()
+        if resultados and not registro['do_cache']:  # do cache: já registrada da primeira vez
+            config = registro['config']
+            resultados.registra('lote', variante_de(config),
+                                {chave: valor for chave, valor in registro.items() if chave != 'config'},
+                                config, historico)
+
+    try:
+        with open(saida, 'w', encoding='utf-8') as f:
+            if no_pool:
+                with multiprocessing.Pool(processes=workers) as pool:
+                    for registro in pool.imap_unordered(_executar_indexado, no_pool):
+                        grava(registro)
+            for item in locais:
+                grava(_executar_indexado(item))
+    finally:
+        if resultados:
+            resultados.fecha()
+    print(f'{len(itens)} execuções salvas em {saida}' + (f' e em {banco}' if banco else ''))
+    if perfil:
+        print(f'Perfis em {perfil}; relatório: python perfilador.py {perfil}')
+
+
+def nome_membro(config):
+    """Identificador de um membro do portfólio: variante e seed."""
+    return f"{variante_de(config)}#{config.get('seed')}"
+
+
+def _membro_portfolio(indice, config, parada, fila):
+    """Processo de um membro do portfólio: executa e devolve o resumo pela fila."""
+    # Se o membro for terminado (não parou no prazo), o SIGTERM vira
+    # SystemExit: os finally de cada modo ainda fecham réplicas e pools
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(1))
+    try:
+        resumo = executar_modo(config, verbose=False, parada=parada)
+        fila.put({'indice': indice, **resumo})
+    except Exception as erro:
+        fila.put({'indice': indice, 'erro': repr(erro)})
+
+
+def vitorias_portfolio(log):
+    """Quantas corridas cada membro já venceu, segundo o log do portfólio."""
+    vitorias = {}
+    if os.path.exists(log):
+        with open(log, encoding='utf-8') as f:
+            for linha in f:
+                vencedor = json.loads(linha).get('vencedor')
+                if vencedor:
+                    vitorias[vencedor] = vitorias.get(vencedor, 0) + 1
+    return vitorias
+
+
+def executar_portfolio(configs, banco=BANCO_PADRAO, log=LOG_PORTFOLIO, espera_cancelamento=10.0):
+    """
+    Corrida de portfólio: cada configuração roda no seu próprio processo e
+    a primeira a atingir max_pairs vence. As demais são avisadas por um
+    Event e param ao fim da geração corrente (liberando memória
+    compartilhada e pools dos seus backends); quem não parar em
+    `espera_cancelamento` segundos é terminado. O vencedor e o estado de
+    cada membro vão para `log` (JSONL) e, se `banco`, para o banco de
+    resultados, para que o portfólio possa ser ajustado com o tempo.
+    Retorna o resumo do vencedor (ou do melhor membro, se nenhum resolver).
+    """
+    inicio = time.perf_counter()
+    parada = multiprocessing.Event()
+    fila = multiprocessing.Queue()
+    processos = [
+        multiprocessing.Process(target=_membro_portfolio, args=(indice, config, parada, fila))
+        for indice, config in enumerate(configs)
+    ]
+    for processo in processos:
+        processo.start()
+
+    resumos = {}
+    vencedor = None
+    fim_corrida = None
+
+    def recebe(resumo):
+        nonlocal vencedor, fim_corrida
+        resumos[resumo['indice']] = resumo
+        if vencedor is None and resumo.get('solucionado'):
+            vencedor = resumo['indice']
+            fim_corrida = time.perf_counter()
+            parada.set()
+
+    try:
+        while len(resumos) < len(processos):
+            # Depois do vencedor, só espera os demais até o prazo de cancelamento
+            if vencedor is not None and time.perf_counter() - fim_corrida >= espera_cancelamento:
+                break
+            try:
+                recebe(fila.get(timeout=INTERVALO_PORTFOLIO))
+                continue
+            except queue.Empty:
+                pass
+            # Membros mortos sem resultado (OOM, sinal, os._exit) nunca postam:
+            # não espera por eles. A fila é esvaziada antes, porque um membro
+            # pode postar e sair entre o get e o is_alive.
+            mortos = [indice for indice, processo in enumerate(processos)
+                      if indice not in resumos and not processo.is_alive()]
+            if not mortos:
+                continue
+            try:
+                while True:
+                    recebe(fila.get(timeout=INTERVALO_PORTFOLIO))
+            except queue.Empty:
+                pass
+            for indice in mortos:
+                if indice not in resumos:
+                    resumos[indice] = {'indice': indice, 'erro': f'morreu (exitcode {processos[indice].exitcode})'}
+    finally:
+        parada.set()
+        for processo in processos:
+            processo.join(timeout=1.0)
+            if processo.is_alive():
+                processo.terminate()  # SIGTERM: o membro ainda fecha os seus processos
+                processo.join(timeout=espera_cancelamento)
+            if processo.is_alive():
+                processo.kill()
+                processo.join()
+    tempo = time.perf_counter() - inicio if vencedor is None else fim_corrida - inicio
+
+    membros = []
+    for indice, config in enumerate(configs):
+        resumo = resumos.get(indice, {'indice': indice, 'erro': 'terminado'})
+        membros.append({
+            'membro': nome_membro(config),
+            'venceu': indice == vencedor,
+            **{chave: resumo.get(chave) for chave in
+               ('solucionado', 'interrompido', 'melhor_fitness', 'geracoes', 'avaliacoes', 'tempo_s', 'erro')},
+        })
+    entrada = {
+        'data': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'n': configs[0].get('n'),
+        'vencedor': None if vencedor is None else nome_membro(configs[vencedor]),
+        'tempo_s': tempo,
+        'membros': membros,
+    }
+    with open(log, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entrada) + '\n')
+    if banco:
+        with BancoResultados(banco) as resultados:
+            for indice, config in enumerate(configs):
+                if indice in resumos and 'erro' not in resumos[indice]:
+                    registro = {chave: valor for chave, valor in resumos[indice].items() if chave != 'indice'}
+                    resultados.registra('portfolio', nome_membro(config),
+                                        {**registro, 'venceu': indice == vencedor}, config)
+
+    for membro in membros:
+        situacao = 'venceu' if membro['venceu'] else membro['erro'] or (
+            'interrompido' if membro['interrompido'] else f"fitness {membro['melhor_fitness']}")
+        print(f"{membro['membro']:<40} gerações: {membro['geracoes']}, {situacao}")
+    if vencedor is None:
+        print(f'Nenhum membro resolveu em {tempo:.2f}s')
+        validos = [resumo for resumo in resumos.values() if 'erro' not in resumo]
+        melhor = max(validos, key=lambda resumo: resumo['melhor_fitness'], default=None)
+    else:
+        melhor = resumos[vencedor]
+        print(f"Vencedor: {entrada['vencedor']} em {tempo:.2f}s")
+        print_tabuleiro(melhor['genes'])
+    vitorias = vitorias_portfolio(log)
+    print('Vitórias acumuladas: ' + ', '.join(
+        f'{nome}={total}' for nome, total in sorted(vitorias.items(), key=lambda item: -item[1])))
+    if melhor is None:
+        return None
+    return {**melhor, 'vencedor': entrada['vencedor'], 'tempo_portfolio_s': tempo, 'membros': membros}
+
+
+def main():
+    args = parse_args()
+    banco = None if args.sem_banco else args.banco
+    if args.portfolio:
+        executar_portfolio(load_configs_lote(args.portfolio), banco=banco, log=args.log_portfolio)
+    elif args.lote:
+        executar_lote(load_configs_lote(args.lote), workers=args.workers, saida=args.saida,
+                      cache=None if args.sem_cache else args.cache, perfil=args.perfil, banco=banco)
     else:
-        print('Nenhuma solução perfeita encontrada até o limite de gerações.')
+        config = load_config(args.config)
+        resumo = executar_com_historico(config)
+        if banco:
+            with BancoResultados(banco) as resultados:
+                resultados.registra('execucao', variante_de(config), resumo, config, resumo.pop('historico'))
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
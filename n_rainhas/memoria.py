@@ -0,0 +1,210 @@
+import argparse
+import csv
+import functools
+import multiprocessing
+import os
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Perfil de memória (opcional) das execuções do AG. A cada `intervalo`
+# gerações registra o RSS do processo e um snapshot do tracemalloc, com as
+# alocações vivas agrupadas pelo arquivo em que foram feitas:
+#   genomas      - listas de genes e atributos criados em Individuo
+#   descendentes - objetos Individuo e listas da população, criados pela
+#                  população ou pelos operadores (filhos)
+#   outros       - o resto
+# Temporários dos operadores não sobrevivem até o fim da geração, então são
+# medidos à parte: nas gerações amostradas, crossover e mutação são
+# envolvidos e o pico do tracemalloc acima do uso antes da chamada é
+# registrado como `temporarios_operadores`.
+#
+# O tracemalloc deixa o AG até ~10x mais lento enquanto está ativo. Por
+# padrão ele só fica ligado nas gerações amostradas, e o custo cai para
+# ~1/intervalo. Assim, objetos criados antes da janela (p.ex. elitistas que
+# sobrevivem) não aparecem no snapshot; com `continuo=True` o rastreamento
+# cobre a execução toda e a atribuição é completa. Use o perfil para
+# dimensionar memória, não para medir tempo.
+
+CATEGORIAS_ARQUIVO = {
+    'individuo.py': 'genomas',
+    'populacao.py': 'descendentes',
+    'operadores.py': 'descendentes',
+    'lote.py': 'descendentes',
+    'armazenamento.py': 'descendentes',
+    'paralelo.py': 'descendentes',
+    'inicializacao.py': 'genomas',
+}
+CATEGORIAS = ['genomas', 'descendentes', 'temporarios_operadores', 'outros']
+
+
+def rss_atual():
+    """RSS atual do processo em bytes (Linux), ou None se não disponível."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def rss_pico():
+    """Pico de RSS do processo em bytes, ou None se não disponível."""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class PerfilMemoria:
+    """
+    Amostras de memória de uma execução. Uso: inicio(), mede() nos
+    operadores, geracao(g) ao fim de cada geração, fim() -> resumo.
+    """
+
+    def __init__(self, intervalo=10, continuo=False):
+        self.intervalo = max(1, intervalo)
+        self.continuo = continuo
+        self.amostras = []
+        self._amostrando = False
+        self._pico_traced = 0
+        self._temporarios = 0
+        self._iniciou_trace = False
+
+    @classmethod
+    def from_config(cls, config):
+        """Cria o perfil a partir do bloco 'perfil_memoria' da config, ou None."""
+        params = config.get('perfil_memoria')
+        if not params:
+            return None
+        return cls(intervalo=params.get('intervalo', 10), continuo=params.get('continuo', False))
+
+    def inicio(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._iniciou_trace = True
+        else:
+            self.continuo = True  # rastreamento de fora: não liga/desliga
+        tracemalloc.reset_peak()
+        self._amostrando = True  # a geração 0 (inicialização) também é amostrada
+
+    def _atualiza_pico(self):
+        if tracemalloc.is_tracing():
+            _, pico = tracemalloc.get_traced_memory()
+            self._pico_traced = max(self._pico_traced, pico)
+
+    def mede(self, operador):
+        """Envolve um operador para medir os temporários nas gerações amostradas."""
+        @functools.wraps(operador)
+        def medido(*args, **kwargs):
+            if not self._amostrando:
+                return operador(*args, **kwargs)
+            self._atualiza_pico()
+            antes, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            try:
+                return operador(*args, **kwargs)
+            finally:
+                _, pico = tracemalloc.get_traced_memory()
+                self._pico_traced = max(self._pico_traced, pico)
+                self._temporarios = max(self._temporarios, pico - antes)
+        return medido
+
+    def geracao(self, geracao):
+        """Registra uma amostra se a geração for amostrada e prepara a próxima."""
+        if self._amostrando:
+            self.amostras.append(self._amostra(geracao))
+        self._amostrando = (geracao + 1) % self.intervalo == 0
+        if not self.continuo:
+            if self._amostrando and not tracemalloc.is_tracing():
+                tracemalloc.start()
+            elif not self._amostrando and tracemalloc.is_tracing():
+                self._atualiza_pico()
+                tracemalloc.stop()
+
+    def _amostra(self, geracao):
+        self._atualiza_pico()
+        atual, _ = tracemalloc.get_traced_memory()
+        por_categoria = dict.fromkeys(CATEGORIAS, 0)
+        for estatistica in tracemalloc.take_snapshot().statistics('filename'):
+            arquivo = os.path.basename(estatistica.traceback[0].filename)
+            por_categoria[CATEGORIAS_ARQUIVO.get(arquivo, 'outros')] += estatistica.size
+        por_categoria['temporarios_operadores'] = self._temporarios
+        self._temporarios = 0
+        return {'geracao': geracao, 'rss': rss_atual(), 'traced': atual, **por_categoria}
+
+    def fim(self):
+        """Encerra o tracemalloc (se foi iniciado aqui) e retorna o resumo."""
+        self._atualiza_pico()
+        if self._iniciou_trace and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        return {
+            'pico_rss': rss_pico(),
+            'pico_traced': self._pico_traced,
+            **{f'pico_{categoria}': max((a[categoria] for a in self.amostras), default=0)
+               for categoria in CATEGORIAS},
+            'amostras': self.amostras,
+        }
+
+
+def _executa_perfilado(item):
+    """Uma execução por processo (Pool com maxtasksperchild=1), para o pico de RSS ser dela."""
+    from main import executar
+    config, intervalo = item
+    resumo = executar({**config, 'perfil_memoria': {'intervalo': intervalo}}, verbose=False)
+    memoria = resumo['memoria']
+    return {
+        'n': config['n'],
+        'pop_size': config['pop_size'],
+        'geracoes': resumo['geracoes'],
+        **{chave: valor for chave, valor in memoria.items() if chave != 'amostras'},
+    }
+
+
+def tabela_escala(base_config, valores_n, valores_pop, intervalo=10):
+    """Executa o AG para cada (n, pop_size) e retorna uma linha de memória por combinação."""
+    itens = [({**base_config, 'n': n, 'pop_size': pop}, intervalo)
+             for n in valores_n for pop in valores_pop]
+    with multiprocessing.Pool(processes=1, maxtasksperchild=1) as pool:
+        return list(pool.imap(_executa_perfilado, itens))
+
+
+def _kb(valor):
+    return '-' if valor is None else f'{valor / 1024:.0f}'
+
+
+def imprime_tabela(linhas):
+    print(f"{'n':>6} {'pop':>6} {'gerações':>9} {'RSS pico':>10} {'traced pico':>12} "
+          f"{'genomas':>9} {'descend.':>9} {'temp. op.':>10}   (KiB)")
+    for linha in linhas:
+        print(f"{linha['n']:>6} {linha['pop_size']:>6} {linha['geracoes']:>9} "
+              f"{_kb(linha['pico_rss']):>10} {_kb(linha['pico_traced']):>12} "
+              f"{_kb(linha['pico_genomas']):>9} {_kb(linha['pico_descendentes']):>9} "
+              f"{_kb(linha['pico_temporarios_operadores']):>10}")
+
+
+def salva_tabela_csv(linhas, filename):
+    with open(filename, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=linhas[0].keys())
+        writer.writeheader()
+        writer.writerows(linhas)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Tabela de memória do AG por n e pop_size')
+    parser.add_argument('--config', default='config.json', help='Configuração base (n e pop_size são substituídos)')
+    parser.add_argument('--n', type=int, nargs='+', default=[25, 50, 100, 200])
+    parser.add_argument('--pop', type=int, nargs='+', default=[50, 100, 200, 400])
+    parser.add_argument('--geracoes', type=int, default=20, help='max_gens de cada execução')
+    parser.add_argument('--intervalo', type=int, default=5, help='Gerações entre amostras')
+    parser.add_argument('--saida', default='resultados_memoria.csv')
+    args = parser.parse_args()
+
+    from main import load_config
+    base = {**load_config(args.config), 'max_gens': args.geracoes}
+    base.pop('log_eventos', None)
+    linhas = tabela_escala(base, args.n, args.pop, args.intervalo)
+    imprime_tabela(linhas)
+    salva_tabela_csv(linhas, args.saida)
+    print(f'Tabela salva em {args.saida}')
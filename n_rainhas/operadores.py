@@ -1,17 +1,22 @@
 import random
 import math
 from individuo import Individuo
+from indice_conflitos import IndiceConflitos
+
+# Todos os operadores aleatórios aceitam `rng`: qualquer objeto com a
+# interface do módulo random (por padrão o próprio módulo global, ou um
+# aleatorio.FluxoAleatorio para execuções reprodutíveis).
 
 # Seleção
 
-def selecao_roleta(populacao):
+def selecao_roleta(populacao, rng=random):
     """
     (Clássico) Seleção por roleta (fitness-proporcional):
     cada indivíduo é sorteado com probabilidade proporcional ao seu valor de fitness.
     """
     soma = sum(ind.fitness_value for ind in populacao)
     def seleciona_um():
-        ponto = random.uniform(0, soma)
+        ponto = rng.uniform(0, soma)
         acumulado = 0
         for ind in populacao:
             acumulado += ind.fitness_value
@@ -21,18 +26,18 @@ def selecao_roleta(populacao):
     return seleciona_um(), seleciona_um()
 
 
-def selecao_torneio(populacao, k=3):
+def selecao_torneio(populacao, k=3, rng=random):
     """
     (Clássico) Seleção por torneio:
     escolhe k competidores aleatórios e retorna o melhor. Repete para dois pais.
     """
     def torneio():
-        competidores = random.sample(populacao, k)
+        competidores = rng.sample(populacao, k)
         return max(competidores, key=lambda ind: ind.fitness_value)
     return torneio(), torneio()
 
 
-def selecao_truncamento(populacao, taxa=0.5):
+def selecao_truncamento(populacao, taxa=0.5, rng=random):
     """
     (Clássico) Seleção por truncamento (dizimação):
     descarta os piores (1-taxa)% e seleciona pais aleatoriamente
@@ -41,10 +46,10 @@ def selecao_truncamento(populacao, taxa=0.5):
     k = max(2, int(len(populacao) * taxa))
     ordenados = sorted(populacao, key=lambda ind: ind.fitness_value, reverse=True)
     pool = ordenados[:k]
-    return random.choice(pool), random.choice(pool)
+    return rng.choice(pool), rng.choice(pool)
 
 
-def selecao_ranking(populacao):
+def selecao_ranking(populacao, rng=random):
     """
     (Clássico) Seleção por ranking:
     atribui probabilidade de seleção proporcional à posição no ranking,
@@ -54,7 +59,7 @@ def selecao_ranking(populacao):
     n = len(ordenados)
     soma_ranks = n * (n + 1) / 2
     def select_one():
-        ponto = random.uniform(1, soma_ranks)
+        ponto = rng.uniform(1, soma_ranks)
         acumulado = 0
         for rank, ind in enumerate(ordenados, start=1):
             acumulado += rank
@@ -65,25 +70,25 @@ def selecao_ranking(populacao):
 
 # Crossover
 
-def crossover_ponto_unico(pai1, pai2):
+def crossover_ponto_unico(pai1, pai2, rng=random):
     """
     (Clássico) Crossover de ponto único:
     seleciona um ponto e combine prefixo de um pai com sufixo do outro.
     """
     n = pai1.n
-    ponto = random.randrange(1, n)
+    ponto = rng.randrange(1, n)
     g1 = pai1.genes[:ponto] + [g for g in pai2.genes if g not in pai1.genes[:ponto]]
     g2 = pai2.genes[:ponto] + [g for g in pai1.genes if g not in pai2.genes[:ponto]]
     return Individuo(n, g1), Individuo(n, g2)
 
 
-def crossover_ordem(pai1, pai2):
+def crossover_ordem(pai1, pai2, rng=random):
     """
     (Clássico) Order Crossover (OX):
     preserva a ordem relativa de um segmento contínuo de genes.
     """
     n = pai1.n
-    i, j = sorted(random.sample(range(n), 2))
+    i, j = sorted(rng.sample(range(n), 2))
     def ox(p1, p2):
         segmento = p1.genes[i:j]
         restante = [g for g in p2.genes if g not in segmento]
@@ -91,13 +96,13 @@ def crossover_ordem(pai1, pai2):
     return Individuo(n, ox(pai1, pai2)), Individuo(n, ox(pai2, pai1))
 
 
-def crossover_pmx(pai1, pai2):
+def crossover_pmx(pai1, pai2, rng=random):
     """
     (Clássico) Partially Mapped Crossover (PMX):
     mapeia elementos de um segmento entre pais para manter consistência.
     """
     n = pai1.n
-    i, j = sorted(random.sample(range(n), 2))
+    i, j = sorted(rng.sample(range(n), 2))
     def pmx(p1, p2):
         filho = [None] * n
         for idx in range(i, j):
@@ -119,13 +124,13 @@ def crossover_pmx(pai1, pai2):
     return Individuo(n, pmx(pai1, pai2)), Individuo(n, pmx(pai2, pai1))
 
 
-def crossover_uniforme(pai1, pai2):
+def crossover_uniforme(pai1, pai2, rng=random):
     """
     (Clássico) Crossover uniforme:
     para cada posição, escolhe aleatoriamente de qual pai virá o gene.
     """
     n = pai1.n
-    mask = [random.random() < 0.5 for _ in range(n)]
+    mask = [rng.random() < 0.5 for _ in range(n)]
     g1 = [None] * n
     g2 = [None] * n
     for idx in range(n):
@@ -142,50 +147,109 @@ def crossover_uniforme(pai1, pai2):
 
 # Mutação
 
-def mutacao_swap(individuo):
+def mutacao_swap(individuo, rng=random):
     """
     (Clássico) Mutação swap:
     troca aleatoriamente dois genes de lugar.
     """
-    i, j = random.sample(range(individuo.n), 2)
+    i, j = rng.sample(range(individuo.n), 2)
     individuo.genes[i], individuo.genes[j] = individuo.genes[j], individuo.genes[i]
 
 
-def mutacao_deslocamento(individuo):
+def mutacao_deslocamento(individuo, rng=random):
     """
     (Clássico) Mutação por deslocamento:
     remove um gene e o reinsera em outra posição.
     """
     genes = individuo.genes
-    i, j = random.sample(range(individuo.n), 2)
+    i, j = rng.sample(range(individuo.n), 2)
     gene = genes.pop(i)
     genes.insert(j, gene)
     individuo.genes = genes
 
 
-def mutacao_inversao(individuo):
+def mutacao_inversao(individuo, rng=random):
     """
     (Clássico) Mutação inversão:
     inverte a ordem de um segmento contínuo de genes.
     """
     genes = individuo.genes
-    i, j = sorted(random.sample(range(individuo.n), 2))
+    i, j = sorted(rng.sample(range(individuo.n), 2))
     genes[i:j] = reversed(genes[i:j])
     individuo.genes = genes
 
 
-def mutacao_scramble(individuo):
+def mutacao_scramble(individuo, rng=random):
     """
     (Clássico) Mutação scramble:
     embaralha aleatoriamente os genes em um segmento selecionado.
     """
     genes = individuo.genes
-    i, j = sorted(random.sample(range(individuo.n), 2))
+    i, j = sorted(rng.sample(range(individuo.n), 2))
     segment = genes[i:j]
-    random.shuffle(segment)
+    rng.shuffle(segment)
     genes[i:j] = segment
     individuo.genes = genes
 
+# Mutação dirigida a conflitos: as posições vêm do IndiceConflitos do
+# indivíduo (sorteio O(log n) proporcional aos conflitos de cada rainha).
+# O índice é construído em O(n) a cada mutação (os filhos do crossover são
+# indivíduos novos), continua valendo após a troca e faz a avaliação
+# seguinte do filho no lugar do recálculo O(n²), que então o libera.
+
+def _parceiro_uniforme(n, i, rng):
+    j = rng.randrange(n - 1)
+    return j + 1 if j >= i else j
+
+
+def mutacao_swap_conflitos(individuo, rng=random):
+    """
+    Swap dirigido: uma das colunas é sorteada com probabilidade
+    proporcional aos seus conflitos e a outra uniformemente.
+    Sem conflitos, equivale a mutacao_swap.
+    """
+    indice = IndiceConflitos.de(individuo)
+    i = indice.sorteia(rng)
+    if i is None:
+        i = rng.randrange(individuo.n)
+    indice.troca(i, _parceiro_uniforme(individuo.n, i, rng))
+
+
+def mutacao_par_conflitos(individuo, rng=random):
+    """
+    Swap entre duas rainhas em conflito, ambas sorteadas com probabilidade
+    proporcional aos seus conflitos. Sem conflitos, equivale a mutacao_swap.
+    """
+    indice = IndiceConflitos.de(individuo)
+    i = indice.sorteia(rng)
+    if i is None:
+        i = rng.randrange(individuo.n)
+        j = _parceiro_uniforme(individuo.n, i, rng)
+    else:
+        j = indice.sorteia(rng, exceto=i)
+    indice.troca(i, j)
+
+
+def mutacao_min_conflitos(individuo, rng=random, candidatos=8):
+    """
+    Swap dirigido com parceiro guloso: sorteia a coluna pelos conflitos e,
+    entre `candidatos` parceiros uniformes, troca com o de menor variação
+    de conflitos (O(1) cada). Sem conflitos, equivale a mutacao_swap.
+    """
+    indice = IndiceConflitos.de(individuo)
+    i = indice.sorteia(rng)
+    if i is None:
+        i = rng.randrange(individuo.n)
+        indice.troca(i, _parceiro_uniforme(individuo.n, i, rng))
+        return
+    melhor_j, melhor_delta = None, None
+    for _ in range(min(candidatos, individuo.n - 1)):
+        j = _parceiro_uniforme(individuo.n, i, rng)
+        delta = indice.variacao_troca(i, j)
+        if melhor_delta is None or delta < melhor_delta:
+            melhor_j, melhor_delta = j, delta
+    indice.troca(i, melhor_j)
+
 # Elitismo
 
 def elitismo_none(populacao):
@@ -0,0 +1,204 @@
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+from individuo import Individuo
+from aleatorio import cria_fluxo
+from inicializacao import gera_genes
+from lote import fitness_lote, permutacoes_lote, elites_indices, reproduz_bloco
+
+GENES_DTYPE = np.dtype(np.int32)
+FITNESS_DTYPE = np.dtype(np.int64)
+
+# Blocos compartilhados anexados por cada worker (ver _inicializa_worker)
+_blocos_worker = []
+
+
+class BlocoPopulacao:
+    """Genes int32[tamanho, n] seguidos de fitness int64[tamanho] em um bloco de memória compartilhada."""
+
+    def __init__(self, shm, n, tamanho):
+        self.shm = shm
+        self.n = n
+        self.tamanho = tamanho
+        bytes_genes = tamanho * n * GENES_DTYPE.itemsize
+        self.genes = np.ndarray((tamanho, n), dtype=GENES_DTYPE, buffer=shm.buf)
+        self.fitness = np.ndarray((tamanho,), dtype=FITNESS_DTYPE, buffer=shm.buf, offset=bytes_genes)
+
+    @classmethod
+    def cria(cls, n, tamanho):
+        total = tamanho * (n * GENES_DTYPE.itemsize + FITNESS_DTYPE.itemsize)
+        return cls(shared_memory.SharedMemory(create=True, size=total), n, tamanho)
+
+    @classmethod
+    def anexa(cls, nome, n, tamanho):
+        # Os workers do Pool compartilham o resource_tracker do processo
+        # principal, que é quem faz o unlink em PopulacaoCompartilhada.fecha
+        return cls(shared_memory.SharedMemory(name=nome), n, tamanho)
+
+
+def _inicializa_worker(nomes, n, tamanho):
+    """Executado uma vez por worker: anexa os dois blocos da população."""
+    global _blocos_worker
+    _blocos_worker = [BlocoPopulacao.anexa(nome, n, tamanho) for nome in nomes]
+
+
+def _reproduz_fatia(tarefa):
+    """
+    Gera os filhos [ini, fim) da próxima geração direto no bloco de destino.
+    Só índices e nomes de operadores atravessam o pipe, nunca genes.
+    """
+    (origem, ini, fim, seed, geracao, selecao, crossover, p_crossover,
+     mutacao, p_mutacao) = tarefa
+    atual = _blocos_worker[origem]
+    destino = _blocos_worker[1 - origem]
+    # O fluxo depende só da seed, da geração e da fatia, não do worker
+    rng = cria_fluxo(seed, geracao, ini)
+    filhos, crossovers, mutacoes = reproduz_bloco(
+        atual.genes, atual.fitness, fim - ini, selecao, crossover, p_crossover,
+        mutacao, p_mutacao, rng
+    )
+    destino.genes[ini:fim] = filhos
+    destino.fitness[ini:fim] = fitness_lote(filhos)
+    return fim - ini, crossovers, mutacoes
+
+
+class PopulacaoCompartilhada:
+    """
+    População com reprodução paralela, com a mesma interface de Populacao.
+
+    A geração atual e a próxima ficam em dois blocos de
+    multiprocessing.shared_memory. A cada geração, o processo principal copia
+    os elitistas e divide o restante em fatias de `tamanho_fatia` filhos;
+    cada worker escreve a sua fatia direto no bloco da próxima geração.
+    Como as fatias e os fluxos aleatórios não dependem do número de
+    processos, a mesma seed produz a mesma evolução com qualquer `processos`.
+    """
+
+    def __init__(self, n, tamanho, seed=None, processos=None, tamanho_fatia=256):
+        if n < 4:
+            raise ValueError("Para n-rainhas, n deve ser >= 4")
+        self.n = n
+        self.tamanho = tamanho
+        self.seed = seed if seed is not None else np.random.SeedSequence().entropy
+        self.rng = cria_fluxo(self.seed)
+        self.tamanho_fatia = tamanho_fatia
+        # Contadores da execução (ver contadores())
+        self.avaliacoes = 0
+        self.avaliacoes_cache = 0
+        self.filhos = 0
+        self.crossovers = 0
+        self.mutacoes = 0
+        self.geracao = 0
+        self._blocos = [BlocoPopulacao.cria(n, tamanho), BlocoPopulacao.cria(n, tamanho)]
+        self._atual = 0
+        self._pool = multiprocessing.Pool(
+            processes=processos,
+            initializer=_inicializa_worker,
+            initargs=([b.shm.name for b in self._blocos], n, tamanho),
+        )
+
+    @property
+    def atual(self):
+        return self._blocos[self._atual]
+
+    def inicializa(self, estrategia=None, proporcao_heuristica=1.0, **estrategia_args):
+        """
+        Gera a população inicial: permutações aleatórias ou, com `estrategia`,
+        como em Populacao.inicializa.
+        """
+        if estrategia is None:
+            self.atual.genes[:] = permutacoes_lote(self.rng.gerador, self.tamanho, self.n)
+        else:
+            self.atual.genes[:] = gera_genes(
+                self.n, self.tamanho, estrategia, self.rng, proporcao_heuristica, **estrategia_args
+            )
+        self.geracao = 0
+
+    def avalia(self):
+        """Avalia o fitness de todos os indivíduos da geração atual."""
+        self.atual.fitness[:] = fitness_lote(self.atual.genes)
+        self.avaliacoes += self.tamanho
+
+    def contadores(self):
+        """Avaliações, acertos de cache, filhos, crossovers e mutações até agora."""
+        return {
+            'avaliacoes': self.avaliacoes,
+            'avaliacoes_cache': self.avaliacoes_cache,
+            'filhos': self.filhos,
+            'crossovers': self.crossovers,
+            'mutacoes': self.mutacoes,
+        }
+
+    def melhor(self):
+        """Retorna o indivíduo com maior fitness como um Individuo."""
+        idx = int(np.argmax(self.atual.fitness))
+        ind = Individuo(self.n, self.atual.genes[idx].tolist())
+        ind.fitness()
+        return ind
+
+    def estatisticas(self):
+        """Retorna (máximo, média, mínimo) do fitness da geração atual."""
+        fitness = self.atual.fitness
+        return int(fitness.max()), float(fitness.mean()), int(fitness.min())
+
+    def injeta_imigrantes(self, quantidade):
+        """Substitui os `quantidade` piores indivíduos por novos aleatórios."""
+        quantidade = min(quantidade, self.tamanho)
+        if quantidade <= 0:
+            return
+        piores = np.sort(np.argpartition(self.atual.fitness, quantidade - 1)[:quantidade])
+        novos = permutacoes_lote(self.rng.gerador, quantidade, self.n)
+        self.atual.genes[piores] = novos
+        self.atual.fitness[piores] = fitness_lote(novos)
+        self.avaliacoes += quantidade
+
+    def gera_nova_geracao(
+        self,
+        selecao,
+        crossover,
+        p_crossover,
+        mutacao,
+        p_mutacao,
+        elitismo,
+        elitismo_args=None
+    ):
+        """
+        Mesmos parâmetros de Populacao.gera_nova_geracao. Os operadores de
+        crossover e mutação precisam ser funções de módulo (picláveis por nome).
+        """
+        atual = self.atual
+        proxima = self._blocos[1 - self._atual]
+
+        elites = elites_indices(atual.fitness, elitismo, elitismo_args)[:self.tamanho]
+        k = len(elites)
+        self.avaliacoes_cache += k
+        proxima.genes[:k] = atual.genes[elites]
+        proxima.fitness[:k] = atual.fitness[elites]
+
+        self.geracao += 1
+        tarefas = [
+            (self._atual, ini, min(ini + self.tamanho_fatia, self.tamanho), self.seed,
+             self.geracao, selecao, crossover, p_crossover, mutacao, p_mutacao)
+            for ini in range(k, self.tamanho, self.tamanho_fatia)
+        ]
+        for filhos, crossovers, mutacoes in self._pool.map(_reproduz_fatia, tarefas):
+            self.avaliacoes += filhos
+            self.filhos += filhos
+            self.crossovers += crossovers
+            self.mutacoes += mutacoes
+        self._atual = 1 - self._atual
+
+    def fecha(self):
+        """Encerra os workers e libera os blocos de memória compartilhada."""
+        self._pool.close()
+        self._pool.join()
+        for bloco in self._blocos:
+            bloco.genes = bloco.fitness = None
+            bloco.shm.close()
+            bloco.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fecha()
@@ -10,8 +10,12 @@ from operadores import (
     mutacao_swap,
     elitismo_percentual
 )
-from populacao import Populacao
+from populacao import Populacao, metricas_vazao
 from individuo import Individuo
+from aleatorio import cria_fluxo
+from eventos import RegistroEventos, RenderizadorConsole
+from cache import CacheResultados
+from banco import BancoResultados
 
 
 # --- CONFIGURAÇÕES DO EXPERIMENTO ---
@@ -25,6 +29,14 @@ TAXAS_MUTACAO = [0.05, 0.1]
 TAXAS_CROSSOVER = [0.8, 1.0]
 TAXAS_ELITISMO = [0.02, 0.1]
 
+# Log de eventos: arquivo JSONL comprimido e amostragem das gerações
+ARQUIVO_EVENTOS = 'eventos_parte0.jsonl.gz'
+INTERVALO_LOG = 10
+
+# Sementes sorteadas a partir de uma semente fixa: reexecutar o script gera
+# as mesmas execuções, e as já concluídas vêm do cache de resultados
+SEMENTE_BASE = 0
+
 def rodar_experimento_parte0():
     """Orquestra a execução, salva o CSV detalhado e imprime um resumo."""
     nome_arquivo_csv = 'resultados_parte0.csv'
@@ -32,13 +44,22 @@ def rodar_experimento_parte0():
     cabecalho_csv = [
         "componente", "variante", "n_rainhas", "semente", "tempo_s", 
         "fitness_maximo", "fitness_medio", "fitness_minimo", 
-        "geracoes_para_solucao", "solucionado"
+        "geracoes_para_solucao", "solucionado",
+        "avaliacoes", "avaliacoes_por_s", "geracoes_por_s"
     ]
 
     melhor_config = None
     melhor_fitness_medio = float('-inf')  # Começa com o pior valor possível
 
-    with open(nome_arquivo_csv, 'w', newline='', encoding='utf-8') as csvfile:
+    sorteio_sementes = random.Random(SEMENTE_BASE)
+    cache = CacheResultados()
+
+    registro = RegistroEventos(
+        caminho=ARQUIVO_EVENTOS, intervalo=INTERVALO_LOG,
+        renderizadores=[RenderizadorConsole(mostra_tabuleiro=False)]
+    )
+
+    with registro, BancoResultados() as banco, open(nome_arquivo_csv, 'w', newline='', encoding='utf-8') as csvfile:
         writer = csv.writer(csvfile)
         writer.writerow(cabecalho_csv)
 
@@ -55,26 +76,33 @@ def rodar_experimento_parte0():
                             medias = []
                             
                             for i in range(N_EXECUCOES):
-                                semente_atual = random.randint(0, 100000)
+                                semente_atual = sorteio_sementes.randint(0, 100000)
                                 print(f" Execução {i+1}/{N_EXECUCOES} (Semente: {semente_atual})...")
-                                
-                                # Chama a função e recebe o dicionário de resultados
-                                resultados = executar_ag(
+
+                                parametros = dict(
                                     n_rainhas=N_RAINHAS, tam_pop=tam_pop, n_geracoes=n_geracoes,
                                     p_crossover=p_crossover, p_mutacao=p_mutacao,
                                     func_selecao=selecao_torneio, func_crossover=crossover_pmx,
                                     func_mutacao=mutacao_swap, func_elitismo=elitismo_percentual,
                                     elitismo_args={'taxa': taxa_elitismo},
-                                    semente=semente_atual,
-                                    verbose=True
                                 )
+                                # Chama a função e recebe o dicionário de resultados
+                                # (ou o resultado guardado, se a execução já foi feita)
+                                resultados, do_cache = cache.executa(
+                                    parametros, semente_atual,
+                                    lambda: executar_ag(**parametros, semente=semente_atual,
+                                                        verbose=True, registro=registro)
+                                )
+                                if do_cache:
+                                    print("  (resultado do cache)")
 
                                 medias.append(resultados['fitness_medio'])
+                                variante = f"Torn.{p_crossover:.2f}C.{p_mutacao:.2f}M.{taxa_elitismo:.2f}E"
 
                                 # Escreve no CSV
                                 writer.writerow([
                                     "Baseline",
-                                    f"Torn.{p_crossover:.2f}C.{p_mutacao:.2f}M.{taxa_elitismo:.2f}E",
+                                    variante,
                                     N_RAINHAS,
                                     semente_atual,
                                     f"{resultados['tempo_s']:.4f}",
@@ -82,8 +110,21 @@ def rodar_experimento_parte0():
                                     f"{resultados['fitness_medio']:.2f}",
                                     resultados['fitness_minimo'],
                                     resultados['geracoes_para_solucao'],
-                                    resultados['solucionado']
+                                    resultados['solucionado'],
+                                    resultados['avaliacoes'],
+                                    f"{resultados['avaliacoes_por_s']:.1f}",
+                                    f"{resultados['geracoes_por_s']:.2f}"
                                 ])
+                                # E no banco, com as estatísticas por geração (uma
+                                # execução do cache já foi registrada da primeira vez)
+                                if not do_cache:
+                                    historico = resultados.get('historico')
+                                    banco.registra(
+                                        'parte0', variante,
+                                        {'componente': 'Baseline', 'n_rainhas': N_RAINHAS, 'semente': semente_atual,
+                                         **{chave: valor for chave, valor in resultados.items() if chave != 'historico'}},
+                                        {**parametros, 'seed': semente_atual}, historico
+                                    )
 
                             media_geral = statistics.mean(medias)
 
@@ -109,22 +150,29 @@ def rodar_experimento_parte0():
         print(f"  - Taxa de elitismo: {melhor_config['taxa_elitismo']}")
         print(f"  - Fitness médio: {melhor_config['fitness_medio']:.2f}")
 
-def executar_ag(n_rainhas, tam_pop, n_geracoes, p_crossover, p_mutacao, func_selecao, func_crossover, func_mutacao, func_elitismo, elitismo_args, semente=None, verbose=True):
+def executar_ag(n_rainhas, tam_pop, n_geracoes, p_crossover, p_mutacao, func_selecao, func_crossover, func_mutacao, func_elitismo, elitismo_args, semente=None, verbose=True, registro=None):
     """
     Executa uma rodada do AG e retorna um dicionário com métricas detalhadas.
+    Com verbose, os eventos vão para `registro` (por padrão, só o console).
     """
-    if semente is not None:
-        random.seed(semente)
+    rng = cria_fluxo(semente)
+    if verbose and registro is None:
+        registro = RegistroEventos(renderizadores=[RenderizadorConsole(mostra_tabuleiro=False)])
+    if verbose:
+        registro.inicio({'n': n_rainhas, 'pop_size': tam_pop, 'max_gens': n_geracoes,
+                         'p_crossover': p_crossover, 'p_mutacao': p_mutacao,
+                         'elitismo_args': elitismo_args, 'seed': semente})
 
     inicio = time.time()
 
-    pop = Populacao(n=n_rainhas, tamanho=tam_pop)
+    pop = Populacao(n=n_rainhas, tamanho=tam_pop, rng=rng)
     pop.inicializa()
     pop.avalia()
 
     max_fitness_possivel = n_rainhas * (n_rainhas - 1) // 2
     solucionado = False
     geracoes_para_solucao = -1
+    historico = []
     
     for geracao in range(n_geracoes):
         pop.gera_nova_geracao(
@@ -137,32 +185,38 @@ def executar_ag(n_rainhas, tam_pop, n_geracoes, p_crossover, p_mutacao, func_sel
             elitismo_args=elitismo_args
         )
         
+        estatisticas = pop.estatisticas()
+        historico.append((geracao + 1, *estatisticas))
         if verbose:
-            fitness_geracao = [ind.fitness_value for ind in pop.individuos]
-            print(f"  [Geração {geracao + 1:03d}] "
-                  f"Melhor Fitness: {max(fitness_geracao)} | "
-                  f"Fitness Médio: {statistics.mean(fitness_geracao):.2f} | "
-                  f"Pior Fitness: {min(fitness_geracao)}")
+            registro.geracao(geracao + 1, *estatisticas)
 
         if not solucionado and pop.melhor().fitness_value == max_fitness_possivel:
             solucionado = True
             geracoes_para_solucao = geracao + 1
             if verbose:
-                print(f"  Solução ótima encontrada na geração {geracao + 1}!")
+                registro.solucao(geracao + 1, pop.melhor().genes)
             # Continua executando até o final para ter as métricas da última geração
     
     fim = time.time()
     
     # Coleta as métricas finais
     fitness_final_pop = [ind.fitness_value for ind in pop.individuos]
-    
+    if verbose:
+        registro.fim(n_geracoes, solucionado, fim - inicio)
+
+    vazao = metricas_vazao(pop, n_geracoes, fim - inicio)
+
     return {
         "tempo_s": fim - inicio,
         "fitness_maximo": max(fitness_final_pop),
         "fitness_medio": statistics.mean(fitness_final_pop),
         "fitness_minimo": min(fitness_final_pop),
         "solucionado": "sim" if solucionado else "nao",
-        "geracoes_para_solucao": geracoes_para_solucao
+        "geracoes_para_solucao": geracoes_para_solucao,
+        "avaliacoes": vazao['evaluations'],
+        "avaliacoes_por_s": vazao['evals_per_sec'],
+        "geracoes_por_s": vazao['gens_per_sec'],
+        "historico": historico
     }
 
 
@@ -5,7 +5,10 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import time
 import csv
 from individuo import Individuo
-from populacao import Populacao
+from populacao import Populacao, metricas_vazao
+from aleatorio import cria_fluxo
+from cache import CacheResultados
+from banco import BancoResultados
 from operadores import (
     selecao_torneio, crossover_uniforme, crossover_pmx, mutacao_swap, elitismo_percentual
 )
@@ -29,6 +32,8 @@ BASE_CONFIG = {
 def experimenta_com_crossover():
     crossovers = [crossover_pmx, crossover_uniforme]  # PMX e Crossover uniforme
     resultados = []  
+    cache = CacheResultados()
+    banco = BancoResultados()  # registra as execuções em lotes
 
     for crossover_func in crossovers:
         cfg = BASE_CONFIG.copy()
@@ -36,12 +41,14 @@ def experimenta_com_crossover():
         
         for i in range(20):  
             print(f"Executando experimento {i+1} com {crossover_func.__name__}...")
-            start = time.time()
-            stats = run_experiment(cfg)  
-            duration = time.time() - start
+            cfg['seed'] = i  # Semente da execução: reexecutar pula as já concluídas
+            stats, do_cache = cache.executa(cfg, cfg['seed'], lambda: run_experiment_cronometrado(cfg))
+            duration = stats.pop('tempo')
+            historico = stats.pop('historico', None)
             
             # Exibindo no console os resultados de cada execução
-            print(f"Execução {i+1} - Tempo: {duration:.2f}s, Max Fitness: {stats['max_fitness']}, Solved: {stats['solved']}")
+            origem = ' (cache)' if do_cache else ''
+            print(f"Execução {i+1}{origem} - Tempo: {duration:.2f}s, Max Fitness: {stats['max_fitness']}, Solved: {stats['solved']}")
             
             # Armazenar os resultados de cada execução
             entry = {
@@ -51,7 +58,11 @@ def experimenta_com_crossover():
                 **stats
             }
             resultados.append(entry)
+            if not do_cache:  # a execução já está no banco desde a primeira vez
+                banco.registra('crossover', entry['crossover'], entry, cfg, historico)
     
+    banco.fecha()
+
     # Salvar os resultados em CSV
     filename = 'resultados_crossover.csv'
     with open(filename, 'w', newline='') as f:
@@ -60,10 +71,19 @@ def experimenta_com_crossover():
         writer.writerows(resultados)
     print(f'Experimentos salvos em {filename}')
 
+def run_experiment_cronometrado(cfg):
+    """Roda o experimento e inclui a duração ('tempo') nas estatísticas."""
+    historico = []
+    start = time.time()
+    stats = run_experiment(cfg, historico)
+    return {'tempo': time.time() - start, **stats, 'historico': historico}
+
+
 # Função para rodar o experimento com a configuração fornecida
-def run_experiment(cfg):
+def run_experiment(cfg, historico=None):
     """
     Roda o experimento com a configuração fornecida e retorna as estatísticas.
+    Se `historico` for uma lista, recebe (geração, max, média, min) de cada geração.
     Essa função depende da implementação dos seus algoritmos genéticos.
     """
     n = cfg['n']  
@@ -81,7 +101,8 @@ def run_experiment(cfg):
         elitismo_args = {}
 
     
-    pop = Populacao(n, pop_size)
+    inicio = time.time()
+    pop = Populacao(n, pop_size, rng=cria_fluxo(cfg['seed']))
     pop.inicializa()
     pop.avalia()
     
@@ -94,7 +115,8 @@ def run_experiment(cfg):
             'mean_fitness': sum(fitness_vals)/len(fitness_vals),
             'min_fitness': min(fitness_vals),
             'gens_to_solve': 0,
-            'solved': True
+            'solved': True,
+            **metricas_vazao(pop, 0, time.time() - inicio)
         }
     
     # Evolução por gerações
@@ -114,6 +136,8 @@ def run_experiment(cfg):
         max_fitness = max(fitness_vals)
         mean_fitness = sum(fitness_vals) / len(fitness_vals)
         min_fitness = min(fitness_vals)
+        if historico is not None:
+            historico.append((gen, max_fitness, mean_fitness, min_fitness))
         
         print(f"Geração {gen} - Máximo Fitness: {max_fitness}, Fitness Médio: {mean_fitness:.2f}, Mínimo Fitness: {min_fitness}")
         
@@ -123,7 +147,8 @@ def run_experiment(cfg):
                 'mean_fitness': mean_fitness,
                 'min_fitness': min_fitness,
                 'gens_to_solve': gen,
-                'solved': True
+                'solved': True,
+                **metricas_vazao(pop, gen, time.time() - inicio)
             }
     
     return {
@@ -131,7 +156,8 @@ def run_experiment(cfg):
         'mean_fitness': mean_fitness,
         'min_fitness': min_fitness,
         'gens_to_solve': None,
-        'solved': False
+        'solved': False,
+        **metricas_vazao(pop, max_gens, time.time() - inicio)
     }
 
 
@@ -5,7 +5,10 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import time
 import csv
 from individuo import Individuo
-from populacao import Populacao
+from populacao import Populacao, metricas_vazao
+from aleatorio import cria_fluxo
+from cache import CacheResultados
+from banco import BancoResultados
 from operadores import (
     elitismo_fixo, crossover_pmx, mutacao_swap, elitismo_percentual, selecao_torneio
 )
@@ -28,6 +31,8 @@ BASE_CONFIG = {
 def experimenta_com_elitismo():
     elitismos = [elitismo_percentual, elitismo_fixo]  # Elitismo percentual e elitismo fixo
     resultados = []  
+    cache = CacheResultados()
+    banco = BancoResultados()  # registra as execuções em lotes
 
     for elitismo_func in elitismos:
         cfg = BASE_CONFIG.copy()
@@ -35,12 +40,14 @@ def experimenta_com_elitismo():
         
         for i in range(20): 
             print(f"Executando experimento {i+1} com {elitismo_func.__name__}...")
-            start = time.time()
-            stats = run_experiment(cfg) 
-            duration = time.time() - start
+            cfg['seed'] = i  # Semente da execução: reexecutar pula as já concluídas
+            stats, do_cache = cache.executa(cfg, cfg['seed'], lambda: run_experiment_cronometrado(cfg))
+            duration = stats.pop('tempo')
+            historico = stats.pop('historico', None)
             
             # Exibindo no console os resultados de cada execução
-            print(f"Execução {i+1} - Tempo: {duration:.2f}s, Max Fitness: {stats['max_fitness']}, Solved: {stats['solved']}")
+            origem = ' (cache)' if do_cache else ''
+            print(f"Execução {i+1}{origem} - Tempo: {duration:.2f}s, Max Fitness: {stats['max_fitness']}, Solved: {stats['solved']}")
             
             # Armazenar os resultados de cada execução
             entry = {
@@ -50,7 +57,11 @@ def experimenta_com_elitismo():
                 **stats
             }
             resultados.append(entry)
+            if not do_cache:  # a execução já está no banco desde a primeira vez
+                banco.registra('elitismo', entry['elitismo'], entry, cfg, historico)
     
+    banco.fecha()
+
   #Salvar os resultados em CSV
     filename = 'resultados_elitismo.csv'
     with open(filename, 'w', newline='') as f:
@@ -59,10 +70,19 @@ def experimenta_com_elitismo():
         writer.writerows(resultados)
     print(f'Experimentos salvos em {filename}')
 
+def run_experiment_cronometrado(cfg):
+    """Roda o experimento e inclui a duração ('tempo') nas estatísticas."""
+    historico = []
+    start = time.time()
+    stats = run_experiment(cfg, historico)
+    return {'tempo': time.time() - start, **stats, 'historico': historico}
+
+
 # Função para rodar o experimento com a configuração fornecida
-def run_experiment(cfg):
+def run_experiment(cfg, historico=None):
     """
     Roda o experimento com a configuração fornecida e retorna as estatísticas.
+    Se `historico` for uma lista, recebe (geração, max, média, min) de cada geração.
     Essa função depende da implementação dos seus algoritmos genéticos.
     """
     n = cfg['n']  
@@ -82,7 +102,8 @@ def run_experiment(cfg):
 
 
     # Criar a população
-    pop = Populacao(n, pop_size)
+    inicio = time.time()
+    pop = Populacao(n, pop_size, rng=cria_fluxo(cfg['seed']))
     pop.inicializa()
     pop.avalia()
     
@@ -95,7 +116,8 @@ def run_experiment(cfg):
             'mean_fitness': sum(fitness_vals)/len(fitness_vals),
             'min_fitness': min(fitness_vals),
             'gens_to_solve': 0,
-            'solved': True
+            'solved': True,
+            **metricas_vazao(pop, 0, time.time() - inicio)
         }
     
     # Evolução por gerações
@@ -115,6 +137,8 @@ def run_experiment(cfg):
         max_fitness = max(fitness_vals)
         mean_fitness = sum(fitness_vals) / len(fitness_vals)
         min_fitness = min(fitness_vals)
+        if historico is not None:
+            historico.append((gen, max_fitness, mean_fitness, min_fitness))
         
         print(f"Geração {gen} - Máximo Fitness: {max_fitness}, Fitness Médio: {mean_fitness:.2f}, Mínimo Fitness: {min_fitness}")
         
@@ -124,7 +148,8 @@ def run_experiment(cfg):
                 'mean_fitness': mean_fitness,
                 'min_fitness': min_fitness,
                 'gens_to_solve': gen,
-                'solved': True
+                'solved': True,
+                **metricas_vazao(pop, gen, time.time() - inicio)
             }
     
     return {
@@ -132,7 +157,8 @@ def run_experiment(cfg):
         'mean_fitness': mean_fitness,
         'min_fitness': min_fitness,
         'gens_to_solve': None,
-        'solved': False
+        'solved': False,
+        **metricas_vazao(pop, max_gens, time.time() - inicio)
     }
 
 
@@ -2,9 +2,19 @@ import sys
 import os
 import time
 import csv
+import argparse
+import functools
 import multiprocessing
 from individuo import Individuo
-from populacao import Populacao
+from populacao import Populacao, metricas_vazao
+from aleatorio import cria_fluxo
+from inicializacao import estende_populacao
+from cache import CacheResultados
+from banco import BancoResultados
+from perfilador import perfila
+from distribuido import (
+    HOST_PADRAO, inicia_coordenador, trabalhador, endereco_de_texto
+)
 from operadores import (
     crossover_pmx, mutacao_scramble, elitismo_percentual,
     selecao_torneio, mutacao_swap
@@ -17,7 +27,7 @@ BASE_CONFIG_CROSS = {
     'n': 10,  # Número de rainhas (10)
     'pop_size': 150,  # Tamanho da população
     'max_gens': 1000,  # Número de gerações
-    'seed': None,      # Semente aleatória
+    'seed': 1,         # Semente (cada n usa um fluxo derivado dela)
     'p_crossover': 0.8,  # Taxa de crossover
     'p_mutacao': 0.05,  # Taxa de mutação
     'selecao': selecao_torneio,
@@ -30,7 +40,7 @@ BASE_CONFIG_ELITE = {
     'n': 10,  # Número de rainhas (10)
     'pop_size': 150,  # Tamanho da população
     'max_gens': 1000,  # Número de gerações
-    'seed': None,      # Semente aleatória
+    'seed': 2,         # Semente (cada n usa um fluxo derivado dela)
     'p_crossover': 0.8,  # Taxa de crossover
     'p_mutacao': 0.05,  # Taxa de mutação
     'selecao': selecao_torneio,
@@ -43,7 +53,7 @@ BASE_CONFIG_MUTA = {
     'n': 10,  # Número de rainhas (10)
     'pop_size': 150,  # Tamanho da população
     'max_gens': 1000,  # Número de gerações
-    'seed': None,      # Semente aleatória
+    'seed': 3,         # Semente (cada n usa um fluxo derivado dela)
     'p_crossover': 0.8,  # Taxa de crossover
     'p_mutacao': 0.05,  # Taxa de mutação
     'selecao': selecao_torneio,
@@ -55,7 +65,7 @@ BASE_CONFIG_SELE = {
     'n': 10,  # Número de rainhas (10)
     'pop_size': 150,  # Tamanho da população
     'max_gens': 1000,  # Número de gerações
-    'seed': None,      # Semente aleatória
+    'seed': 4,         # Semente (cada n usa um fluxo derivado dela)
     'p_crossover': 0.8,  # Taxa de crossover
     'p_mutacao': 0.05,  # Taxa de mutação
     'selecao': selecao_torneio,
@@ -75,11 +85,41 @@ def atualizar_config(base_cfg, n):
     cfg['n'] = n
     return cfg
 
+# Variação com warm start: a população de cada n (exceto o primeiro) parte da
+# população final do n anterior, estendida (ver inicializacao.estende_populacao);
+# a fração `proporcao` vem da extensão e o resto é aleatório. 'n_inicial' entra
+# na config para o cache distinguir cadeias que começam em n diferentes.
+def config_warm_start(base_cfg, proporcao):
+    return {**base_cfg, 'warm_start': proporcao, 'n_inicial': base_cfg['n']}
+
+# Executa uma tarefa (variação, cfg, população final do n anterior ou None);
+# execuções já concluídas (mesma config, seed e versão do motor) vêm do cache.
+# Com diretorio_perfil, a execução roda sob cProfile e grava
+# <variação>_n<n>.pstats (ver perfilador.py)
+def executa_tarefa(tarefa, diretorio_perfil=None):
+    nome_base, cfg, populacao_anterior = tarefa
+    def executa():
+        return CacheResultados().executa(
+            cfg, cfg['seed'], lambda: run_experiment_com_historico(cfg, populacao_anterior))
+    if diretorio_perfil:
+        result, do_cache = perfila(executa, diretorio_perfil, f"{nome_base}_n{cfg['n']}")
+    else:
+        result, do_cache = executa()
+    if do_cache:
+        print(f"[{nome_base}] n={cfg['n']}: resultado do cache")
+    return {**result, 'do_cache': do_cache}
+
+# Incrementa n se resolveu ou atingiu o limite de gerações
+def deve_continuar(cfg, result):
+    return result['solved'] or cfg['max_gens'] == result.get('gens_to_solve', cfg['max_gens'])
+
 # Função para rodar o experimento e retornar os resultados
 def run_experiment_wrapper(args):
-    base_cfg, nome_base = args
+    base_cfg, nome_base, diretorio_perfil = args
     n = base_cfg['n']
     start_global = time.time()
+    banco = BancoResultados()
+    populacao = None
 
     while True:
         # Checar se o tempo limite foi excedido
@@ -88,30 +128,162 @@ def run_experiment_wrapper(args):
             break
 
         cfg = atualizar_config(base_cfg, n)
-        result = run_experiment(cfg)
-        salvar_resultado_em_csv({
-            'variacao': nome_base,
-            'n': n,
-            **result
-        })
+        result = executa_tarefa((nome_base, cfg, populacao), diretorio_perfil)
+        populacao = result.pop('populacao_final', None)
+        salvar_resultado(banco, nome_base, cfg, result)
 
-        # Incrementa n se resolveu ou atingiu o limite de gerações
-        if result['solved'] or cfg['max_gens'] == result.get('gens_to_solve', cfg['max_gens']):
+        if deve_continuar(cfg, result):
             n += 1
         else:
             break  # Ou continue para testar o mesmo n novamente
+    banco.fecha()
+
+# Modo coordenador: mesma lógica de run_experiment_wrapper, mas cada
+# (variação, n) é uma tarefa entregue a trabalhadores via TCP (distribuido.py).
+# O próximo n de uma variação só entra na fila quando chega o resultado do anterior.
+def coordena(configs, porta, host=HOST_PADRAO, chave=None, trabalhadores_locais=0, tempo_limite_batimento=10.0,
+             diretorio_perfil=None):
+    gerente, coordenador = inicia_coordenador(porta, host, chave, tempo_limite_batimento)
+    porta_real = gerente.address[1]
+    print(f"Coordenador ouvindo em {host or '*'}:{porta_real}")
+
+    locais = [
+        multiprocessing.Process(target=trabalhador, args=(
+            (host if host else 'localhost', porta_real),
+            functools.partial(executa_tarefa, diretorio_perfil=diretorio_perfil), gerente.chave))
+        for _ in range(trabalhadores_locais)
+    ]
+    for processo in locais:
+        processo.start()
+
+    inicio_variacao = {}
+    for base_cfg, nome_base in configs:
+        inicio_variacao[nome_base] = time.time()
+        coordenador.adiciona((nome_base, atualizar_config(base_cfg, base_cfg['n']), None))
+
+    banco = BancoResultados()
+    try:
+        while coordenador.pendentes() > 0:
+            for (nome_base, cfg, _), result in coordenador.coleta():
+                if 'erro' in result:
+                    # A variação para neste n: as tentativas se esgotaram
+                    print(f"[{nome_base}] n={cfg['n']} falhou após {result['tentativas']} tentativas:\n"
+                          f"{result['erro']}")
+                    continue
+                populacao = result.pop('populacao_final', None)
+                salvar_resultado(banco, nome_base, cfg, result)
+                if not deve_continuar(cfg, result):
+                    continue
+                if time.time() - inicio_variacao[nome_base] > TEMPO_LIMITE:
+                    print(f"[{nome_base}] Tempo limite de execução atingido. Encerrando...")
+                    continue
+                coordenador.adiciona((nome_base, atualizar_config(cfg, cfg['n'] + 1), populacao))
+            time.sleep(0.2)
+        print(f"Coordenador: {coordenador.estado()}")
+        coordenador.encerra()
+        for processo in locais:
+            processo.join()
+    finally:
+        banco.fecha()
+        gerente.shutdown()
+
+# Salva o resultado de (variação, n) no CSV e no banco (com as estatísticas por
+# geração). Resultados do cache já foram registrados no banco da primeira vez.
+def salvar_resultado(banco, nome_base, cfg, result):
+    historico = result.pop('historico', None)
+    do_cache = result.pop('do_cache', False)
+    dados = {'variacao': nome_base, 'n': cfg['n'], **result}
+    salvar_resultado_em_csv(dados)
+    if not do_cache:
+        banco.registra('variacoes', nome_base, dados, cfg, historico)
 
-# Salvar resultados incrementalmente em CSV
+# Salvar resultados incrementalmente em CSV. Se o arquivo existente tem um
+# cabeçalho sem alguma coluna nova (CSVs antigos, sem as métricas de
+# vazão), ele é reescrito uma vez com as colunas antigas seguidas das novas;
+# as linhas antigas ficam com essas colunas vazias.
 def salvar_resultado_em_csv(dados, filename='resultados_variacoes.csv'):
-    file_exists = os.path.isfile(filename)
-    with open(filename, 'a', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=dados.keys())
-        if not file_exists:
+    cabecalho = None
+    if os.path.isfile(filename):
+        with open(filename, newline='') as f:
+            cabecalho = next(csv.reader(f), None)
+    if cabecalho is None:
+        cabecalho = list(dados)
+        with open(filename, 'w', newline='') as f:
+            csv.DictWriter(f, fieldnames=cabecalho).writeheader()
+    elif any(campo not in cabecalho for campo in dados):
+        with open(filename, newline='') as f:
+            linhas = list(csv.DictReader(f))
+        cabecalho = cabecalho + [campo for campo in dados if campo not in cabecalho]
+        with open(filename, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=cabecalho, restval='')
             writer.writeheader()
-        writer.writerow(dados)
+            writer.writerows(linhas)
+    with open(filename, 'a', newline='') as f:
+        csv.DictWriter(f, fieldnames=cabecalho, restval='').writerow(dados)
+
+# Economia do warm start por passo: compara, para cada n, a última execução
+# de cada variação <X>_WARM com a da variação <X> (partida a frio)
+def economia_warm_start(filename='resultados_variacoes.csv'):
+    ultimas = {}
+    with open(filename, newline='') as f:
+        for linha in csv.DictReader(f):
+            ultimas[(linha['variacao'], int(linha['n']))] = linha
+    def geracoes(linha):
+        return int(linha['gens_to_solve']) if linha['gens_to_solve'] else None
+    comparacao = []
+    for (variacao, n), quente in sorted(ultimas.items()):
+        frio = ultimas.get((variacao[:-len('_WARM')], n)) if variacao.endswith('_WARM') else None
+        if frio is None:
+            continue
+        g_frio, g_quente = geracoes(frio), geracoes(quente)
+        t_frio, t_quente = float(frio['tempo_execucao']), float(quente['tempo_execucao'])
+        comparacao.append({
+            'variacao': variacao[:-len('_WARM')],
+            'n': n,
+            'geracoes_frio': g_frio,
+            'geracoes_warm': g_quente,
+            'geracoes_economizadas': g_frio - g_quente if g_frio is not None and g_quente is not None else None,
+            'tempo_frio': t_frio,
+            'tempo_warm': t_quente,
+            'tempo_economizado': t_frio - t_quente,
+        })
+    return comparacao
+
+def imprime_economia_warm_start(comparacao):
+    print(f"\n{'variação':<12} {'n':>4} {'ger. frio':>10} {'ger. warm':>10} {'economia':>9} "
+          f"{'t frio':>9} {'t warm':>9} {'economia':>9}")
+    for linha in comparacao:
+        def texto(valor):
+            return '-' if valor is None else str(valor)
+        print(f"{linha['variacao']:<12} {linha['n']:>4} {texto(linha['geracoes_frio']):>10} "
+              f"{texto(linha['geracoes_warm']):>10} {texto(linha['geracoes_economizadas']):>9} "
+              f"{linha['tempo_frio']:>8.2f}s {linha['tempo_warm']:>8.2f}s {linha['tempo_economizado']:>8.2f}s")
+    for variacao in sorted({linha['variacao'] for linha in comparacao}):
+        linhas = [linha for linha in comparacao if linha['variacao'] == variacao]
+        economizadas = [linha['geracoes_economizadas'] for linha in linhas if linha['geracoes_economizadas'] is not None]
+        print(f"{variacao}: {sum(economizadas)} gerações e "
+              f"{sum(linha['tempo_economizado'] for linha in linhas):.2f}s economizados em {len(linhas)} passos")
+
+def run_experiment_com_historico(cfg, populacao_anterior=None):
+    historico = []
+    populacao_final = [] if cfg.get('warm_start') else None
+    result = run_experiment(cfg, historico, populacao_anterior, populacao_final)
+    result['historico'] = historico
+    if populacao_final is not None:
+        result['populacao_final'] = populacao_final
+    return result
 
-# Função principal do experimento
-def run_experiment(cfg):
+# Genes da população, do melhor para o pior, em `destino` (se for uma lista)
+def _guarda_populacao(pop, destino):
+    if destino is not None:
+        ordenados = sorted(pop.individuos, key=lambda ind: ind.fitness_value, reverse=True)
+        destino[:] = [ind.genes for ind in ordenados]
+
+# Função principal do experimento; se `historico` for uma lista, recebe
+# (geração, max, média, min) de cada geração. Com warm start na cfg e
+# `populacao_anterior` (genes do n - 1), a população inicial é estendida dela,
+# e `populacao_final` (lista) recebe a população ao fim, para o próximo n
+def run_experiment(cfg, historico=None, populacao_anterior=None, populacao_final=None):
     n = cfg['n']
     pop_size = cfg['pop_size']
     max_gens = cfg['max_gens']
@@ -125,24 +297,34 @@ def run_experiment(cfg):
     else:
         elitismo_args = {}
 
-    pop = Populacao(n, pop_size)
-    pop.inicializa()
+    # O tempo inclui a inicialização, para contar o custo da extensão no warm start
+    start = time.time()
+    pop = Populacao(n, pop_size, rng=cria_fluxo(cfg['seed'], n))
+    if populacao_anterior and cfg.get('warm_start'):
+        pop.individuos = [
+            Individuo(n, genes)
+            for genes in estende_populacao(populacao_anterior, pop_size, pop.rng, cfg['warm_start'])
+        ]
+    else:
+        pop.inicializa()
     pop.avalia()
 
     max_pairs = n * (n - 1) // 2
     fitness_vals = [ind.fitness_value for ind in pop.individuos]
 
     if max(fitness_vals) == max_pairs:
+        duration = time.time() - start
+        _guarda_populacao(pop, populacao_final)
         return {
             'max_fitness': max(fitness_vals),
             'mean_fitness': sum(fitness_vals)/len(fitness_vals),
             'min_fitness': min(fitness_vals),
             'gens_to_solve': 0,
             'solved': True,
-            'tempo_execucao': 0
+            'tempo_execucao': duration,
+            **metricas_vazao(pop, 0, duration)
         }
 
-    start = time.time()
     for gen in range(1, max_gens + 1):
         pop.gera_nova_geracao(
             selecao=selecao,
@@ -155,28 +337,58 @@ def run_experiment(cfg):
         )
         fitness_vals = [ind.fitness_value for ind in pop.individuos]
         max_fitness = max(fitness_vals)
+        if historico is not None:
+            historico.append((gen, max_fitness, sum(fitness_vals) / len(fitness_vals), min(fitness_vals)))
 
         if max_fitness == max_pairs:
             duration = time.time() - start
+            _guarda_populacao(pop, populacao_final)
             return {
                 'max_fitness': max_fitness,
                 'mean_fitness': sum(fitness_vals)/len(fitness_vals),
                 'min_fitness': min(fitness_vals),
                 'gens_to_solve': gen,
                 'solved': True,
-                'tempo_execucao': duration
+                'tempo_execucao': duration,
+                **metricas_vazao(pop, gen, duration)
             }
 
     duration = time.time() - start
+    _guarda_populacao(pop, populacao_final)
     return {
         'max_fitness': max(fitness_vals),
         'mean_fitness': sum(fitness_vals)/len(fitness_vals),
         'min_fitness': min(fitness_vals),
         'gens_to_solve': None,
         'solved': False,
-        'tempo_execucao': duration
+        'tempo_execucao': duration,
+        **metricas_vazao(pop, max_gens, duration)
     }
 
+def parse_args():
+    parser = argparse.ArgumentParser(description='Tamanho máximo viável por variação')
+    modo = parser.add_mutually_exclusive_group()
+    modo.add_argument('--coordenador', action='store_true',
+                      help='Distribui as execuções a trabalhadores conectados por TCP')
+    modo.add_argument('--trabalhador', metavar='HOST:PORTA',
+                      help='Conecta a um coordenador e executa as tarefas que receber')
+    parser.add_argument('--porta', type=int, default=50000)
+    parser.add_argument('--host', default=HOST_PADRAO,
+                        help="Interface em que o coordenador escuta (padrão: só loopback; '' = todas)")
+    parser.add_argument('--chave',
+                        help='Chave de autenticação compartilhada; obrigatória para trabalhadores e para '
+                             'coordenadores fora do loopback (sem ela, só os trabalhadores locais se conectam)')
+    parser.add_argument('--trabalhadores-locais', type=int, default=0,
+                        help='Trabalhadores iniciados nesta máquina pelo coordenador')
+    parser.add_argument('--perfil', metavar='DIRETORIO',
+                        help='Roda cada execução sob cProfile no worker e grava um .pstats por execução')
+    parser.add_argument('--tempo-limite-batimento', type=float, default=10.0,
+                        help='Segundos sem batimento até as tarefas de um trabalhador voltarem para a fila')
+    parser.add_argument('--warm-start', type=float, nargs='?', const=0.5, metavar='PROPORCAO',
+                        help='Roda também cada variação com warm start entre valores de n '
+                             '(fração da população estendida do n anterior; padrão 0.5) e compara')
+    return parser.parse_args()
+
 if __name__ == "__main__":
     # Configurações iniciais para as variações
     configs = [
@@ -185,7 +397,23 @@ if __name__ == "__main__":
         (BASE_CONFIG_MUTA, 'MUTACAO'),
         (BASE_CONFIG_SELE, 'SELECAO')
     ]
+    args = parse_args()
+    chave = args.chave.encode() if args.chave else None
+    if args.trabalhador and chave is None:
+        raise SystemExit('--trabalhador exige --chave (a mesma do coordenador)')
+    if args.warm_start:
+        configs += [(config_warm_start(cfg, args.warm_start), nome + '_WARM') for cfg, nome in configs]
 
-    # Executar em paralelo
-    with multiprocessing.Pool(processes=4) as pool:
-        pool.map(run_experiment_wrapper, configs)
+    if args.coordenador:
+        coordena(configs, args.porta, args.host, chave, args.trabalhadores_locais, args.tempo_limite_batimento,
+                 args.perfil)
+    elif args.trabalhador:
+        tarefa = functools.partial(executa_tarefa, diretorio_perfil=args.perfil)
+        executadas = trabalhador(endereco_de_texto(args.trabalhador), tarefa, chave)
+        print(f"Trabalhador encerrado após {executadas} tarefas")
+    else:
+        # Executar em paralelo
+        with multiprocessing.Pool(processes=len(configs)) as pool:
+            pool.map(run_experiment_wrapper, [(cfg, nome, args.perfil) for cfg, nome in configs])
+    if args.warm_start and not args.trabalhador:
+        imprime_economia_warm_start(economia_warm_start())
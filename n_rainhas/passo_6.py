@@ -0,0 +1,78 @@
+import csv
+from main import executar_com_historico
+from cache import CacheResultados
+from banco import BancoResultados
+
+# --- CONFIGURAÇÕES DO EXPERIMENTO ---
+N_EXECUCOES = 20
+VALORES_N = [25, 50, 100]
+
+BASE_CONFIG = {
+    'pop_size': 100,
+    'max_gens': 500,
+    'selecao': 'torneio',
+    'crossover': 'pmx',
+    'mutacao': 'swap',
+    'elitismo': 'percentual',
+    'p_crossover': 0.8,
+    'p_mutacao': 0.05,
+}
+
+# (nome da variante, estratégia, proporção de indivíduos heurísticos)
+VARIANTES = [
+    ('aleatoria', 'aleatoria', 1.0),
+    ('gulosa', 'gulosa', 1.0),
+    ('gulosa_50', 'gulosa', 0.5),
+    ('construtiva', 'construtiva', 1.0),
+    ('construtiva_50', 'construtiva', 0.5),
+]
+
+
+def experimenta_com_inicializacao():
+    """Compara o tempo até a solução para cada estratégia de inicialização."""
+    resultados = []
+    cache = CacheResultados()
+    banco = BancoResultados()
+
+    for n in VALORES_N:
+        for nome, estrategia, proporcao in VARIANTES:
+            for i in range(N_EXECUCOES):
+                cfg = {
+                    **BASE_CONFIG,
+                    'n': n,
+                    'seed': i,
+                    'inicializacao': estrategia,
+                    'proporcao_heuristica': proporcao,
+                }
+                resumo, do_cache = cache.executa(cfg, cfg['seed'], lambda: executar_com_historico(cfg, verbose=False))
+                origem = ' (cache)' if do_cache else ''
+                print(f"n={n} {nome} execução {i+1}{origem} - Tempo: {resumo['tempo_s']:.2f}s, "
+                      f"Gerações: {resumo['geracoes']}, Solved: {resumo['solucionado']}")
+                entry = {
+                    'inicializacao': nome,
+                    'n': n,
+                    'execucao': i + 1,
+                    'tempo': resumo['tempo_s'],
+                    'max_fitness': resumo['melhor_fitness'],
+                    'gens_to_solve': resumo['geracoes'] if resumo['solucionado'] else None,
+                    'solved': resumo['solucionado'],
+                    'evaluations': resumo['avaliacoes'],
+                    'evals_per_sec': resumo['avaliacoes_por_s'],
+                    'gens_per_sec': resumo['geracoes_por_s'],
+                }
+                resultados.append(entry)
+                if not do_cache:  # a execução já está no banco desde a primeira vez
+                    banco.registra('inicializacao', nome, entry, cfg, resumo.get('historico'))
+
+    banco.fecha()
+
+    filename = 'resultados_inicializacao.csv'
+    with open(filename, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=resultados[0].keys())
+        writer.writeheader()
+        writer.writerows(resultados)
+    print(f'Experimentos salvos em {filename}')
+
+
+if __name__ == '__main__':
+    experimenta_com_inicializacao()
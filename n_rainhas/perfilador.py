@@ -0,0 +1,101 @@
+import argparse
+import cProfile
+import glob
+import io
+import os
+import pstats
+
+# Perfil de CPU das execuções feitas em workers (Pool, trabalhadores do
+# passo_5): cada execução roda sob cProfile no próprio worker e grava um
+# .pstats. O relatório junta todos os arquivos de um diretório e mostra as
+# funções com maior tempo acumulado e o tempo próprio por módulo, com os
+# módulos do AG em destaque.
+
+MODULOS_AG = ['individuo', 'operadores', 'populacao']
+
+
+def perfila(funcao, diretorio, nome):
+    """Executa funcao() sob cProfile, grava <diretorio>/<nome>.pstats e retorna o resultado."""
+    os.makedirs(diretorio, exist_ok=True)
+    perfil = cProfile.Profile()
+    try:
+        return perfil.runcall(funcao)
+    finally:
+        perfil.dump_stats(os.path.join(diretorio, nome + '.pstats'))
+
+
+def carrega(diretorio):
+    """Junta os .pstats do diretório: retorna (pstats.Stats ou None, número de arquivos)."""
+    arquivos = sorted(glob.glob(os.path.join(diretorio, '*.pstats')))
+    if not arquivos:
+        return None, 0
+    stats = pstats.Stats(arquivos[0], stream=io.StringIO())
+    for arquivo in arquivos[1:]:
+        stats.add(arquivo)
+    return stats, len(arquivos)
+
+
+def modulo_de(arquivo):
+    """Nome do módulo a partir do caminho do arquivo; '~' são funções embutidas."""
+    if arquivo == '~':
+        return '<embutidas>'
+    return os.path.splitext(os.path.basename(arquivo))[0]
+
+
+def agrupa_por_modulo(stats):
+    """
+    Retorna {módulo: {'tempo_proprio', 'chamadas', 'funcoes'}}, onde
+    'funcoes' é a lista (tempo acumulado, tempo próprio, chamadas, nome).
+    """
+    modulos = {}
+    for (arquivo, linha, funcao), (_, chamadas, proprio, acumulado, _) in stats.stats.items():
+        grupo = modulos.setdefault(modulo_de(arquivo), {'tempo_proprio': 0.0, 'chamadas': 0, 'funcoes': []})
+        grupo['tempo_proprio'] += proprio
+        grupo['chamadas'] += chamadas
+        grupo['funcoes'].append((acumulado, proprio, chamadas, f'{funcao}:{linha}'))
+    return modulos
+
+
+def relatorio(diretorio, top=20):
+    """Monta o relatório agregado como texto."""
+    stats, total_arquivos = carrega(diretorio)
+    if stats is None:
+        return f'Nenhum .pstats em {diretorio}'
+    saida = io.StringIO()
+    print(f'{total_arquivos} execuções perfiladas em {diretorio}, '
+          f'{stats.total_tt:.2f}s de CPU no total\n', file=saida)
+
+    modulos = agrupa_por_modulo(stats)
+    print('Tempo próprio por módulo:', file=saida)
+    for nome, grupo in sorted(modulos.items(), key=lambda item: -item[1]['tempo_proprio'])[:top]:
+        destaque = '*' if nome in MODULOS_AG else ' '
+        print(f" {destaque} {nome:<24} {grupo['tempo_proprio']:>10.3f}s "
+              f"{100 * grupo['tempo_proprio'] / max(stats.total_tt, 1e-9):>6.1f}%  "
+              f"{grupo['chamadas']:>12} chamadas", file=saida)
+
+    for nome in MODULOS_AG:
+        if nome not in modulos:
+            continue
+        print(f'\n[{nome}] funções por tempo acumulado:', file=saida)
+        for acumulado, proprio, chamadas, funcao in sorted(modulos[nome]['funcoes'], reverse=True)[:top]:
+            print(f'   {funcao:<40} acum {acumulado:>9.3f}s  próprio {proprio:>9.3f}s  {chamadas:>12} chamadas',
+                  file=saida)
+
+    print(f'\nTop {top} funções por tempo acumulado (todas as execuções):', file=saida)
+    stats.stream = saida
+    stats.files = []  # sem a lista de arquivos no cabeçalho
+    stats.strip_dirs().sort_stats('cumulative').print_stats(top)
+    return saida.getvalue()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Relatório agregado dos .pstats gravados pelos workers')
+    parser.add_argument('diretorio', help='Diretório com os arquivos .pstats')
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--saida', help='Grava o relatório neste arquivo')
+    args = parser.parse_args()
+    texto = relatorio(args.diretorio, args.top)
+    print(texto)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            f.write(texto)
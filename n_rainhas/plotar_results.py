@@ -1,10 +1,31 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import os
+from banco import BANCO_PADRAO, consulta_runs
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 IMG_DIR = os.path.join(BASE_DIR, 'imgs_resultados')
 os.makedirs(IMG_DIR, exist_ok=True)
+BANCO = os.path.join(BASE_DIR, BANCO_PADRAO)
+
+
+def carrega(nome_arquivo, coluna_variante, colunas):
+    """
+    Lê só as colunas usadas no gráfico: do banco de resultados (experimento =
+    nome do CSV sem 'resultados_'), se ele tiver o experimento, senão do CSV.
+    Retorna None se nenhum dos dois existir.
+    """
+    if os.path.exists(BANCO):
+        experimento = nome_arquivo[len('resultados_'):-len('.csv')]
+        df = consulta_runs(BANCO, experimento, colunas, coluna_variante)
+        if not df.empty:
+            return df
+    caminho = os.path.join(BASE_DIR, nome_arquivo)
+    if not os.path.exists(caminho):
+        print(f'Arquivo não encontrado: {caminho}')
+        return None
+    return pd.read_csv(caminho, usecols=[coluna_variante, *colunas])
+
 
 # Gráficos simples (gerações e população)
 arquivos_simples = {
@@ -13,12 +34,11 @@ arquivos_simples = {
 }
 
 for nome_arquivo, (eixo_x, titulo) in arquivos_simples.items():
-    caminho = os.path.join(BASE_DIR, nome_arquivo)
-    if not os.path.exists(caminho):
-        print(f'Arquivo não encontrado: {caminho}')
+    df = carrega(nome_arquivo, eixo_x, ['mean_fitness'])
+    if df is None:
         continue
 
-    df = pd.read_csv(caminho).dropna(subset=['mean_fitness'])
+    df = df.dropna(subset=['mean_fitness'])
     if df[eixo_x].dtype == object:
         df[eixo_x] = pd.to_numeric(df[eixo_x], errors='coerce')
 
@@ -43,12 +63,11 @@ arquivos_execucao = {
 }
 
 for nome_arquivo, (coluna_categoria, titulo) in arquivos_execucao.items():
-    caminho = os.path.join(BASE_DIR, nome_arquivo)
-    if not os.path.exists(caminho):
-        print(f'Arquivo não encontrado: {caminho}')
+    df = carrega(nome_arquivo, coluna_categoria, ['execucao', 'mean_fitness'])
+    if df is None:
         continue
 
-    df = pd.read_csv(caminho).dropna(subset=['mean_fitness'])
+    df = df.dropna(subset=['mean_fitness'])
 
     plt.figure(figsize=(10, 6))
     for cat in df[coluna_categoria].unique():
@@ -67,9 +86,10 @@ for nome_arquivo, (coluna_categoria, titulo) in arquivos_execucao.items():
     print('Gerado:', nome_img)
 
 # Gráficos a partir de resultados_variacoes.csv
-variacoes_path = os.path.join(BASE_DIR, 'resultados_variacoes.csv')
-if os.path.exists(variacoes_path):
-    df = pd.read_csv(variacoes_path)
+df_variacoes = carrega('resultados_variacoes.csv', 'variacao',
+                       ['n', 'mean_fitness', 'solved', 'gens_to_solve', 'tempo_execucao'])
+if df_variacoes is not None:
+    df = df_variacoes
 
     # 1. Relação tamanho de n entre variações (fitness médio por n e variação)
     pivot = df.groupby(['n', 'variacao'])['mean_fitness'].mean().unstack()
@@ -116,5 +136,62 @@ if os.path.exists(variacoes_path):
     plt.savefig(os.path.join(IMG_DIR, 'fitness_medio_por_n.png'))
     plt.close()
     print('Gerado: fitness_medio_por_n.png')
-else:
-    print('Arquivo resultados_variacoes.csv não encontrado')
+
+# AG x backtracking exato (backtracking.py): tempo até a solução por n
+df_bt = carrega('resultados_backtracking.csv', 'variacao', ['n', 'tempo_primeira_solucao', 'tempo_execucao'])
+if df_bt is not None:
+    df_bt = df_bt.groupby('n')[['tempo_primeira_solucao', 'tempo_execucao']].median()
+    plt.figure(figsize=(8, 5))
+    plt.plot(df_bt.index, df_bt['tempo_primeira_solucao'], marker='o', label='Backtracking – 1ª solução')
+    plt.plot(df_bt.index, df_bt['tempo_execucao'], marker='o', label='Backtracking – todas as soluções')
+    if df_variacoes is not None:
+        df_ag = df_variacoes[df_variacoes['solved'] == True]
+        for variacao, dados in df_ag.groupby('variacao'):
+            tempos = dados.groupby('n')['tempo_execucao'].median()
+            plt.plot(tempos.index, tempos.values, marker='x', linestyle='--', label=f'AG – {variacao}')
+    plt.yscale('log')
+    plt.xlabel('n')
+    plt.ylabel('Tempo (s)')
+    plt.title('Tempo até a Solução: AG x Backtracking')
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+    plt.savefig(os.path.join(IMG_DIR, 'ag_vs_backtracking.png'))
+    plt.close()
+    print('Gerado: ag_vs_backtracking.png')
+
+# Tempo até a solução por estratégia de inicialização (passo_6.py)
+df = carrega('resultados_inicializacao.csv', 'inicializacao', ['n', 'tempo'])
+if df is not None:
+    pivot = df.groupby(['n', 'inicializacao'])['tempo'].median().unstack()
+    pivot.plot(marker='o')
+    plt.xlabel('n')
+    plt.ylabel('Tempo Mediano (s)')
+    plt.title('Tempo até a Solução por Inicialização')
+    plt.grid(True)
+    plt.tight_layout()
+    plt.savefig(os.path.join(IMG_DIR, 'inicializacao_tempo_por_n.png'))
+    plt.close()
+    print('Gerado: inicializacao_tempo_por_n.png')
+
+# Histogramas de fitness a partir dos arquivos memmap (ver armazenamento.py).
+# Os arquivos são mapeados direto do disco, sem cópia nem desserialização.
+memmap_dir = os.path.join(BASE_DIR, 'populacao_memmap')
+if os.path.isdir(memmap_dir):
+    from armazenamento import ArmazenamentoMemmap
+
+    for nome_arquivo in sorted(os.listdir(memmap_dir)):
+        if not nome_arquivo.endswith('.bin'):
+            continue
+        snap = ArmazenamentoMemmap.abre(os.path.join(memmap_dir, nome_arquivo))
+        plt.figure(figsize=(8, 5))
+        plt.hist(snap.fitness, bins=50, color='purple')
+        plt.xlabel('Fitness')
+        plt.ylabel('Indivíduos')
+        plt.title(f'Distribuição de Fitness – n={snap.n}, geração {snap.geracao}')
+        plt.grid(axis='y')
+        plt.tight_layout()
+        nome_img = f'memmap_{nome_arquivo[:-4]}_fitness.png'
+        plt.savefig(os.path.join(IMG_DIR, nome_img))
+        plt.close()
+        print('Gerado:', nome_img)
@@ -1,24 +1,75 @@
 import random
+import numpy as np
 from individuo import Individuo
+from inicializacao import gera_genes
+from lote import conflitos_lote, reproduz_bloco
 
 class Populacao:
-    """Gerencia uma população de indivíduos/tabuleiros."""
-    def __init__(self, n, tamanho):
+    """
+    Gerencia uma população de indivíduos/tabuleiros.
+    `rng` é o gerador da execução (módulo random por padrão) e é repassado
+    à inicialização e a todos os operadores aleatórios.
+    Com reproducao='lote', os filhos de cada geração são gerados e avaliados
+    de uma vez por lote.reproduz_bloco (operadores NumPy quando existirem);
+    exige um aleatorio.FluxoAleatorio como `rng`.
+    """
+    def __init__(self, n, tamanho, rng=None, reproducao='escalar'):
         if n < 4:
             raise ValueError("Para n-rainhas, n deve ser >= 4")
+        if reproducao not in ('escalar', 'lote'):
+            raise ValueError(f"Reprodução desconhecida: {reproducao}")
+        if reproducao == 'lote' and not hasattr(rng, 'gerador'):
+            raise ValueError("A reprodução em lote exige um aleatorio.FluxoAleatorio como rng")
         self.n = n
         self.tamanho = tamanho
+        self.rng = rng if rng is not None else random
+        self.reproducao = reproducao
         self.individuos = []
+        # Contadores da execução (ver contadores())
+        self.avaliacoes = 0
+        self.avaliacoes_cache = 0
+        self.filhos = 0
+        self.crossovers = 0
+        self.mutacoes = 0
 
-    def inicializa(self):
-        """Gera a população inicial com indivíduos aleatórios."""
-        self.individuos = [Individuo(self.n) for _ in range(self.tamanho)]
+    def inicializa(self, estrategia=None, proporcao_heuristica=1.0, **estrategia_args):
+        """
+        Gera a população inicial. Sem `estrategia`, com indivíduos aleatórios;
+        caso contrário usa uma das estratégias de inicializacao.INICIALIZACOES
+        na fração `proporcao_heuristica` da população.
+        """
+        if estrategia is None:
+            self.individuos = [Individuo(self.n, rng=self.rng) for _ in range(self.tamanho)]
+            return
+        self.individuos = [
+            Individuo(self.n, genes) for genes in gera_genes(
+                self.n, self.tamanho, estrategia, self.rng, proporcao_heuristica, **estrategia_args
+            )
+        ]
 
     def avalia(self):
-        """Avalia o fitness de todos os indivíduos da população."""
+        """
+        Avalia o fitness de todos os indivíduos da população.
+        Só contam como avaliação os indivíduos sem conflitos em cache;
+        os demais (ex.: elitistas) contam como acerto de cache.
+        """
         for ind in self.individuos:
+            if ind.conflitos is None:
+                self.avaliacoes += 1
+            else:
+                self.avaliacoes_cache += 1
             ind.fitness()
 
+    def contadores(self):
+        """Avaliações, acertos de cache, filhos, crossovers e mutações até agora."""
+        return {
+            'avaliacoes': self.avaliacoes,
+            'avaliacoes_cache': self.avaliacoes_cache,
+            'filhos': self.filhos,
+            'crossovers': self.crossovers,
+            'mutacoes': self.mutacoes,
+        }
+
     def melhor(self):
         """Retorna o indivíduo com maior fitness."""
         return max(
@@ -26,6 +77,45 @@ class Populacao:
             key=lambda ind: ind.fitness_value if ind.fitness_value is not None else ind.fitness()
         )
 
+    def estatisticas(self):
+        """Retorna (máximo, média, mínimo) do fitness da população."""
+        fitness_vals = [ind.fitness_value for ind in self.individuos]
+        return max(fitness_vals), sum(fitness_vals) / len(fitness_vals), min(fitness_vals)
+
+    def injeta_imigrantes(self, quantidade):
+        """Substitui os `quantidade` piores indivíduos por novos aleatórios."""
+        quantidade = min(quantidade, self.tamanho)
+        if quantidade <= 0:
+            return
+        self.individuos.sort(key=lambda ind: ind.fitness_value, reverse=True)
+        self.individuos[self.tamanho - quantidade:] = [
+            Individuo(self.n, rng=self.rng) for _ in range(quantidade)
+        ]
+        self.avalia()
+
+    def _filhos_lote(self, pais, quantidade, selecao, crossover, p_crossover, mutacao, p_mutacao):
+        """
+        `quantidade` filhos de `pais` via lote.reproduz_bloco, já avaliados
+        (conflitos_lote) e contados como avaliações.
+        """
+        genes = np.array([ind.genes for ind in pais], dtype=np.int32)
+        fitness = np.array([ind.fitness_value for ind in pais], dtype=np.int64)
+        filhos, crossovers, mutacoes = reproduz_bloco(
+            genes, fitness, quantidade, selecao, crossover, p_crossover, mutacao, p_mutacao, self.rng
+        )
+        max_pairs = self.n * (self.n - 1) // 2
+        novos = []
+        for linha, conflitos in zip(filhos.tolist(), conflitos_lote(filhos).tolist()):
+            filho = Individuo(self.n, linha)
+            filho.conflitos = conflitos
+            filho.fitness_value = max_pairs - conflitos
+            novos.append(filho)
+        self.avaliacoes += quantidade
+        self.filhos += quantidade
+        self.crossovers += crossovers
+        self.mutacoes += mutacoes
+        return novos
+
     def gera_nova_geracao(
         self,
         selecao,
@@ -40,10 +130,10 @@ class Populacao:
         Aplica seleção, crossover, mutação e elitismo para formar a próxima geração.
 
         Parâmetros:
-        - selecao: função(população) -> (pai1, pai2)
-        - crossover: função(pai1, pai2) -> (filho1, filho2)
+        - selecao: função(população, rng) -> (pai1, pai2)
+        - crossover: função(pai1, pai2, rng) -> (filho1, filho2)
         - p_crossover: float, probabilidade de aplicar crossover
-        - mutacao: função(ind) -> None (altera o indivíduo)
+        - mutacao: função(ind, rng) -> None (altera o indivíduo)
         - p_mutacao: float, probabilidade de mutação
         - elitismo: função(população[, **args]) -> lista de indivíduos elitistas
         - elitismo_args: dict de parâmetros para elitismo (opcional)
@@ -55,20 +145,34 @@ class Populacao:
             elites = elitismo(self.individuos)
         nova_pop = elites.copy()
 
+        if self.reproducao == 'lote':
+            quantidade = max(0, self.tamanho - len(nova_pop))
+            if quantidade:
+                nova_pop.extend(self._filhos_lote(self.individuos, quantidade, selecao, crossover,
+                                                  p_crossover, mutacao, p_mutacao))
+            self.individuos = nova_pop[:self.tamanho]
+            self.avaliacoes_cache += min(len(elites), self.tamanho)
+            return
+
         while len(nova_pop) < self.tamanho:
-            pai1, pai2 = selecao(self.individuos)
+            pai1, pai2 = selecao(self.individuos, rng=self.rng)
             # Crossover ou clonagem
-            if random.random() < p_crossover:
-                f1, f2 = crossover(pai1, pai2)
+            if self.rng.random() < p_crossover:
+                f1, f2 = crossover(pai1, pai2, rng=self.rng)
+                self.crossovers += 1
             else:
                 f1 = Individuo(self.n, pai1.genes)
                 f2 = Individuo(self.n, pai2.genes)
-            # Mutação
-            if random.random() < p_mutacao:
-                mutacao(f1)
-            if random.random() < p_mutacao:
-                mutacao(f2)
+            # Mutação (o fitness já calculado, p.ex. pelo crossover adaptativo, deixa de
+            # valer, a menos que a própria mutação reavalie o filho, como a adaptativa)
+            for filho in (f1, f2):
+                if self.rng.random() < p_mutacao:
+                    mutacao(filho, rng=self.rng)
+                    if not getattr(mutacao, 'avalia_mutado', False):
+                        filho.conflitos = filho.fitness_value = None
+                    self.mutacoes += 1
             nova_pop.extend([f1, f2])
+            self.filhos += 2
 
         self.individuos = nova_pop[:self.tamanho]
         self.avalia()
@@ -87,10 +191,10 @@ class Populacao:
         Variante sem permitir duplicação dos elitistas via seleção e clonagem.
 
         Parâmetros:
-        - selecao: função(população) -> (pai1, pai2)
-        - crossover: função(pai1, pai2) -> (filho1, filho2)
+        - selecao: função(população, rng) -> (pai1, pai2)
+        - crossover: função(pai1, pai2, rng) -> (filho1, filho2)
         - p_crossover: float, probabilidade de aplicar crossover
-        - mutacao: função(ind) -> None (altera o indivíduo)
+        - mutacao: função(ind, rng) -> None (altera o indivíduo)
         - p_mutacao: float, probabilidade de mutação
         - elitismo: função(população[, **args]) -> lista de indivíduos elitistas
         - elitismo_args: dict de parâmetros para elitismo (opcional)
@@ -106,20 +210,47 @@ class Populacao:
         if not pool:
             pool = self.individuos.copy()
 
+        if self.reproducao == 'lote':
+            quantidade = max(0, self.tamanho - len(nova_pop))
+            if quantidade:
+                nova_pop.extend(self._filhos_lote(pool, quantidade, selecao, crossover,
+                                                  p_crossover, mutacao, p_mutacao))
+            self.individuos = nova_pop[:self.tamanho]
+            self.avaliacoes_cache += min(len(elites), self.tamanho)
+            return
+
         while len(nova_pop) < self.tamanho:
-            pai1, pai2 = selecao(pool)
+            pai1, pai2 = selecao(pool, rng=self.rng)
             # Crossover ou clonagem
-            if random.random() < p_crossover:
-                f1, f2 = crossover(pai1, pai2)
+            if self.rng.random() < p_crossover:
+                f1, f2 = crossover(pai1, pai2, rng=self.rng)
+                self.crossovers += 1
             else:
                 f1 = Individuo(self.n, pai1.genes)
                 f2 = Individuo(self.n, pai2.genes)
-            # Mutação
-            if random.random() < p_mutacao:
-                mutacao(f1)
-            if random.random() < p_mutacao:
-                mutacao(f2)
+            # Mutação (o fitness já calculado, p.ex. pelo crossover adaptativo, deixa de
+            # valer, a menos que a própria mutação reavalie o filho, como a adaptativa)
+            for filho in (f1, f2):
+                if self.rng.random() < p_mutacao:
+                    mutacao(filho, rng=self.rng)
+                    if not getattr(mutacao, 'avalia_mutado', False):
+                        filho.conflitos = filho.fitness_value = None
+                    self.mutacoes += 1
             nova_pop.extend([f1, f2])
+            self.filhos += 2
 
         self.individuos = nova_pop[:self.tamanho]
-        self.avalia()
\ No newline at end of file
+        self.avalia()
+
+
+def metricas_vazao(pop, geracoes, tempo_s):
+    """
+    Avaliações, avaliações/s e gerações/s de uma execução, com os nomes
+    de coluna usados nos CSVs dos passos.
+    """
+    tempo_s = max(tempo_s, 1e-9)
+    return {
+        'evaluations': pop.avaliacoes,
+        'evals_per_sec': pop.avaliacoes / tempo_s,
+        'gens_per_sec': geracoes / tempo_s,
+    }
@@ -0,0 +1,191 @@
+import argparse
+import csv
+import itertools
+import math
+import numpy as np
+
+# Relatório estatístico dos CSVs resultados_*.csv: por variante, taxa de
+# sucesso e medianas de gerações e de tempo até a solução (só execuções
+# resolvidas; as demais param no limite de gerações e entram apenas na
+# taxa de sucesso), com intervalos de confiança por bootstrap, mais testes
+# de postos (Mann-Whitney) entre cada par de variantes.
+
+# Os CSVs têm esquemas diferentes; estas são as colunas aceitas para cada papel
+COLUNAS_VARIANTE = ['variante', 'variacao', 'selecao', 'crossover', 'elitismo',
+                    'mutacao', 'inicializacao', 'max_gens', 'pop_size']
+COLUNAS_SUCESSO = ['solved', 'solucionado']
+COLUNAS_GERACOES = ['gens_to_solve', 'geracoes_para_solucao']
+COLUNAS_TEMPO = ['tempo', 'tempo_s', 'tempo_execucao']
+
+
+def _primeira_coluna(colunas, opcoes):
+    for opcao in opcoes:
+        if opcao in colunas:
+            return opcao
+    return None
+
+
+def _booleano(valor):
+    return str(valor).strip().lower() in ('true', 'sim', '1')
+
+
+def _numero(valor):
+    try:
+        numero = float(valor)
+    except (TypeError, ValueError):
+        return math.nan
+    return numero if numero >= 0 else math.nan  # -1 marca "não resolveu" em parte0
+
+
+def carrega_variantes(caminho):
+    """
+    Lê um resultados_*.csv e agrupa as execuções por variante (e por n, se
+    o arquivo tiver vários). Retorna {variante: {'sucesso', 'geracoes', 'tempo'}};
+    gerações e tempo são NaN nas execuções não resolvidas.
+    """
+    with open(caminho, newline='', encoding='utf-8') as f:
+        linhas = list(csv.DictReader(f))
+    if not linhas:
+        return {}
+    colunas = linhas[0].keys()
+    col_variante = _primeira_coluna(colunas, COLUNAS_VARIANTE)
+    col_sucesso = _primeira_coluna(colunas, COLUNAS_SUCESSO)
+    col_geracoes = _primeira_coluna(colunas, COLUNAS_GERACOES)
+    col_tempo = _primeira_coluna(colunas, COLUNAS_TEMPO)
+    col_n = _primeira_coluna(colunas, ['n', 'n_rainhas'])
+    varios_n = col_n is not None and len({linha[col_n] for linha in linhas}) > 1
+
+    grupos = {}
+    for linha in linhas:
+        variante = linha[col_variante] if col_variante else 'todas'
+        if varios_n:
+            variante = f'{variante} (n={linha[col_n]})'
+        grupo = grupos.setdefault(variante, {'sucesso': [], 'geracoes': [], 'tempo': []})
+        sucesso = _booleano(linha[col_sucesso]) if col_sucesso else False
+        grupo['sucesso'].append(sucesso)
+        grupo['geracoes'].append(_numero(linha[col_geracoes]) if col_geracoes and sucesso else math.nan)
+        grupo['tempo'].append(_numero(linha[col_tempo]) if col_tempo and sucesso else math.nan)
+    return {
+        variante: {chave: np.array(valores, dtype=float) for chave, valores in grupo.items()}
+        for variante, grupo in grupos.items()
+    }
+
+
+def bootstrap(amostra, estatistica, reamostragens, gerador, confianca=0.95):
+    """
+    IC percentil por bootstrap, vetorizado: sorteia todas as reamostragens
+    em uma única matriz (reamostragens x tamanho) e aplica a estatística
+    ao longo do eixo 1. Retorna (estimativa, inferior, superior).
+    """
+    amostra = amostra[~np.isnan(amostra)]
+    if amostra.size == 0:
+        return math.nan, math.nan, math.nan
+    indices = gerador.integers(0, amostra.size, size=(reamostragens, amostra.size))
+    valores = estatistica(amostra[indices], axis=1)
+    alfa = (1 - confianca) / 2
+    inferior, superior = np.quantile(valores, [alfa, 1 - alfa])
+    return float(estatistica(amostra)), float(inferior), float(superior)
+
+
+def mann_whitney(x, y):
+    """
+    Teste U de Mann-Whitney bilateral (aproximação normal, com correção de
+    empates). Retorna (U, p-valor).
+    """
+    x = x[~np.isnan(x)]
+    y = y[~np.isnan(y)]
+    n1, n2 = x.size, y.size
+    if n1 == 0 or n2 == 0:
+        return math.nan, math.nan
+    juntos = np.concatenate([x, y])
+    ordem = np.argsort(juntos, kind='mergesort')
+    ordenados = juntos[ordem]
+    # Postos médios para empates
+    _, inicio, contagem = np.unique(ordenados, return_index=True, return_counts=True)
+    postos_grupo = inicio + (contagem + 1) / 2
+    postos = np.empty_like(juntos)
+    postos[ordem] = np.repeat(postos_grupo, contagem)
+    u = postos[:n1].sum() - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variancia = n1 * n2 / 12 * ((n + 1) - (contagem ** 3 - contagem).sum() / (n * (n - 1)))
+    if variancia <= 0:
+        return float(u), 1.0
+    z = (u - n1 * n2 / 2) / math.sqrt(variancia)
+    return float(u), math.erfc(abs(z) / math.sqrt(2))
+
+
+def gera_relatorio(caminhos, reamostragens=100_000, seed=0):
+    """Monta as linhas do resumo por variante e dos testes entre pares."""
+    gerador = np.random.default_rng(seed)
+    resumo = []
+    testes = []
+    for caminho in caminhos:
+        variantes = carrega_variantes(caminho)
+        for variante, dados in variantes.items():
+            sucesso = bootstrap(dados['sucesso'], np.mean, reamostragens, gerador)
+            geracoes = bootstrap(dados['geracoes'], np.median, reamostragens, gerador)
+            tempo = bootstrap(dados['tempo'], np.median, reamostragens, gerador)
+            resumo.append({
+                'arquivo': caminho, 'variante': variante, 'execucoes': dados['sucesso'].size,
+                'taxa_sucesso': sucesso[0], 'taxa_sucesso_ic': sucesso[1:],
+                'mediana_geracoes': geracoes[0], 'mediana_geracoes_ic': geracoes[1:],
+                'mediana_tempo': tempo[0], 'mediana_tempo_ic': tempo[1:],
+            })
+        for (nome_a, a), (nome_b, b) in itertools.combinations(variantes.items(), 2):
+            _, p_tempo = mann_whitney(a['tempo'], b['tempo'])
+            _, p_geracoes = mann_whitney(a['geracoes'], b['geracoes'])
+            testes.append({'arquivo': caminho, 'variante_a': nome_a, 'variante_b': nome_b,
+                           'p_tempo': p_tempo, 'p_geracoes': p_geracoes})
+    return resumo, testes
+
+
+def _intervalo(estimativa, ic, formato):
+    if math.isnan(estimativa):
+        return '-'
+    return f'{estimativa:{formato}} [{ic[0]:{formato}}, {ic[1]:{formato}}]'
+
+
+def imprime_relatorio(resumo, testes):
+    cabecalho = f"{'variante':<32} {'execuções':>9}  {'sucesso (IC 95%)':<24} {'gerações (IC 95%)':<26} {'tempo s (IC 95%)':<28}"
+    arquivo_atual = None
+    for linha in resumo:
+        if linha['arquivo'] != arquivo_atual:
+            arquivo_atual = linha['arquivo']
+            print(f'\n== {arquivo_atual} ==')
+            print(cabecalho)
+        print(f"{linha['variante']:<32} {linha['execucoes']:>9}  "
+              f"{_intervalo(linha['taxa_sucesso'], linha['taxa_sucesso_ic'], '.2f'):<24} "
+              f"{_intervalo(linha['mediana_geracoes'], linha['mediana_geracoes_ic'], '.1f'):<26} "
+              f"{_intervalo(linha['mediana_tempo'], linha['mediana_tempo_ic'], '.3f'):<28}")
+    if testes:
+        print('\nMann-Whitney entre pares (p-valores):')
+        for teste in testes:
+            print(f"  {teste['variante_a']} x {teste['variante_b']}: "
+                  f"tempo p={teste['p_tempo']:.4f}, gerações p={teste['p_geracoes']:.4f}")
+
+
+def salva_relatorio_csv(resumo, filename):
+    with open(filename, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['arquivo', 'variante', 'execucoes',
+                         'taxa_sucesso', 'taxa_sucesso_inf', 'taxa_sucesso_sup',
+                         'mediana_geracoes', 'mediana_geracoes_inf', 'mediana_geracoes_sup',
+                         'mediana_tempo', 'mediana_tempo_inf', 'mediana_tempo_sup'])
+        for linha in resumo:
+            writer.writerow([linha['arquivo'], linha['variante'], linha['execucoes'],
+                             linha['taxa_sucesso'], *linha['taxa_sucesso_ic'],
+                             linha['mediana_geracoes'], *linha['mediana_geracoes_ic'],
+                             linha['mediana_tempo'], *linha['mediana_tempo_ic']])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Relatório bootstrap dos resultados_*.csv')
+    parser.add_argument('arquivos', nargs='+', help='CSVs de resultados')
+    parser.add_argument('--reamostragens', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--saida', help='Grava o resumo por variante em CSV')
+    args = parser.parse_args()
+    resumo, testes = gera_relatorio(args.arquivos, args.reamostragens, args.seed)
+    imprime_relatorio(resumo, testes)
+    if args.saida:
+        salva_relatorio_csv(resumo, args.saida)
@@ -0,0 +1,177 @@
+import math
+import multiprocessing
+import time
+from array import array
+from individuo import Individuo
+from aleatorio import cria_fluxo
+
+# Parallel tempering (replica exchange): R cadeias de recozimento em
+# temperaturas diferentes, cada uma em um processo, aplicando trocas de
+# duas colunas (como mutacao_swap). A cada rodada o coordenador tenta
+# trocar as configurações de cadeias vizinhas; só a energia e o genoma
+# compactado (array de int32) atravessam o pipe.
+
+
+class EstadoDiagonais:
+    """
+    Individuo com contagem de rainhas por diagonal, para calcular em O(1)
+    a variação de conflitos de uma troca de colunas. Vale para permutações,
+    em que não há duas rainhas na mesma linha.
+    """
+
+    def __init__(self, individuo):
+        self.individuo = individuo
+        n = individuo.n
+        self.principal = [0] * (2 * n - 1)
+        self.secundaria = [0] * (2 * n - 1)
+        for col, linha in enumerate(individuo.genes):
+            self.principal[linha + col] += 1
+            self.secundaria[linha - col + n - 1] += 1
+        self.energia = individuo.calc_conflitos()
+
+    def _move(self, col, linha, sinal):
+        """Tira (sinal=-1) ou põe (sinal=+1) a rainha e retorna a variação de conflitos."""
+        n = self.individuo.n
+        d1 = linha + col
+        d2 = linha - col + n - 1
+        if sinal < 0:
+            self.principal[d1] -= 1
+            self.secundaria[d2] -= 1
+            return -(self.principal[d1] + self.secundaria[d2])
+        variacao = self.principal[d1] + self.secundaria[d2]
+        self.principal[d1] += 1
+        self.secundaria[d2] += 1
+        return variacao
+
+    def troca(self, i, j):
+        """Troca as colunas i e j e retorna a variação de energia."""
+        genes = self.individuo.genes
+        a, b = genes[i], genes[j]
+        delta = self._move(i, a, -1) + self._move(j, b, -1)
+        delta += self._move(i, b, +1) + self._move(j, a, +1)
+        genes[i], genes[j] = b, a
+        self.energia += delta
+        return delta
+
+
+def _cadeia(indice, n, temperatura, seed, passos_por_troca, conexao):
+    """Processo de uma réplica: recozimento em temperatura fixa entre as rodadas de troca."""
+    rng = cria_fluxo(seed, indice)
+    estado = EstadoDiagonais(Individuo(n, rng=rng))
+    while True:
+        passos = 0
+        for _ in range(passos_por_troca):
+            if estado.energia == 0:
+                break
+            passos += 1
+            i = rng.randrange(n)
+            j = rng.randrange(n - 1)
+            if j >= i:
+                j += 1
+            delta = estado.troca(i, j)
+            if delta > 0 and rng.random() >= math.exp(-delta / temperatura):
+                estado.troca(i, j)  # rejeitada: desfaz
+        conexao.send((estado.energia, array('i', estado.individuo.genes).tobytes(), passos))
+        mensagem = conexao.recv()
+        if mensagem is None:
+            break
+        if mensagem:
+            estado = EstadoDiagonais(Individuo(n, array('i', mensagem).tolist()))
+    conexao.close()
+
+
+def temperaturas_geometricas(replicas, t_min, t_max):
+    if replicas == 1:
+        return [t_min]
+    razao = (t_max / t_min) ** (1 / (replicas - 1))
+    return [t_min * razao ** k for k in range(replicas)]
+
+
+def resolve(n, replicas=4, t_min=0.2, t_max=2.0, passos_por_troca=1000,
+            max_trocas=1000, tempo_limite=None, seed=None, parada=None):
+    """
+    Executa o parallel tempering até alguma réplica chegar a 0 conflitos,
+    ou até `max_trocas` rodadas / `tempo_limite` segundos. Retorna um resumo
+    no mesmo formato de main.executar (gerações = rodadas de troca,
+    avaliações = movimentos avaliados). `parada` (um multiprocessing.Event)
+    encerra as réplicas ao fim da rodada corrente quando sinalizado.
+    """
+    inicio = time.perf_counter()
+    if seed is None:
+        seed = cria_fluxo().gerador.integers(2 ** 63)
+    rng = cria_fluxo(seed, replicas)
+    temperaturas = temperaturas_geometricas(replicas, t_min, t_max)
+
+    conexoes = []
+    processos = []
+    for indice, temperatura in enumerate(temperaturas):
+        pai, filho = multiprocessing.Pipe()
+        processo = multiprocessing.Process(
+            target=_cadeia, args=(indice, n, temperatura, seed, passos_por_troca, filho), daemon=True
+        )
+        processo.start()
+        filho.close()
+        conexoes.append(pai)
+        processos.append(processo)
+
+    rodadas = 0
+    avaliacoes = 0
+    trocas_aceitas = 0
+    melhor_energia, melhor_genes = None, None
+    try:
+        while True:
+            estados = [conexao.recv() for conexao in conexoes]
+            rodadas += 1
+            for energia, genes, passos in estados:
+                avaliacoes += passos
+                if melhor_energia is None or energia < melhor_energia:
+                    melhor_energia, melhor_genes = energia, genes
+            fim = (melhor_energia == 0 or rodadas >= max_trocas
+                   or (tempo_limite is not None and time.perf_counter() - inicio >= tempo_limite)
+                   or (parada is not None and parada.is_set()))
+            if fim:
+                for conexao in conexoes:
+                    conexao.send(None)
+                break
+
+            # Tenta trocar vizinhos alternando pares (0,1),(2,3)... e (1,2),(3,4)...
+            novos = [b''] * replicas
+            for k in range(rodadas % 2, replicas - 1, 2):
+                (e_i, g_i, _), (e_j, g_j, _) = estados[k], estados[k + 1]
+                expoente = (e_i - e_j) * (1 / temperaturas[k] - 1 / temperaturas[k + 1])
+                if expoente >= 0 or rng.random() < math.exp(expoente):
+                    novos[k], novos[k + 1] = g_j, g_i
+                    trocas_aceitas += 1
+            for conexao, mensagem in zip(conexoes, novos):
+                conexao.send(mensagem)
+    except BaseException:
+        # Saída por exceção (ou SIGTERM num membro do portfólio): as réplicas
+        # não vão receber None e ficariam esperando
+        for processo in processos:
+            processo.terminate()
+        raise
+    finally:
+        for processo in processos:
+            processo.join()
+
+    tempo_s = time.perf_counter() - inicio
+    melhor = Individuo(n, array('i', melhor_genes).tolist())
+    max_pairs = n * (n - 1) // 2
+    resumo = {
+        'n': n,
+        'seed': int(seed),
+        'melhor_fitness': melhor.fitness(),
+        'max_pairs': max_pairs,
+        'solucionado': melhor.fitness_value == max_pairs,
+        'geracoes': rodadas,
+        'avaliacoes': avaliacoes,
+        'tempo_s': tempo_s,
+        'genes': melhor.genes,
+        'avaliacoes_por_s': avaliacoes / tempo_s if tempo_s > 0 else 0.0,
+        'geracoes_por_s': rodadas / tempo_s if tempo_s > 0 else 0.0,
+        'trocas_aceitas': trocas_aceitas,
+        'temperaturas': temperaturas,
+    }
+    if parada is not None:
+        resumo['interrompido'] = not resumo['solucionado'] and parada.is_set()
+    return resumo
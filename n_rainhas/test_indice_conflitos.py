@@ -0,0 +1,72 @@
+import random
+from collections import Counter
+from individuo import Individuo
+from indice_conflitos import IndiceConflitos
+from operadores import mutacao_min_conflitos, mutacao_par_conflitos, mutacao_swap_conflitos
+
+
+def _conflitos_por_rainha(genes):
+    n = len(genes)
+    return [
+        sum(1 for j in range(n) if j != i and abs(genes[i] - genes[j]) == abs(i - j))
+        for i in range(n)
+    ]
+
+
+def _confere(indice):
+    genes = indice.individuo.genes
+    assert indice.linhas == genes
+    pesos = _conflitos_por_rainha(genes)
+    assert indice.pesos == pesos
+    assert indice.energia == Individuo(indice.n, genes).calc_conflitos()
+    # Cada nó da Fenwick soma o seu intervalo de pesos
+    for i in range(1, indice.n + 1):
+        assert indice.arvore[i] == sum(pesos[i - (i & -i):i])
+
+
+def test_trocas_mantem_energia_e_fenwick():
+    rng = random.Random(0)
+    for n in (4, 5, 8, 13, 32):
+        ind = Individuo(n, rng=rng)
+        indice = IndiceConflitos.de(ind)
+        _confere(indice)
+        for _ in range(200):
+            i, j = rng.sample(range(n), 2)
+            antes = indice.energia
+            previsto = indice.variacao_troca(i, j)
+            assert indice.troca(i, j) == previsto == indice.energia - antes
+            _confere(indice)
+
+
+def test_sorteio_proporcional_aos_conflitos():
+    rng = random.Random(1)
+    ind = Individuo(10, rng=rng)
+    indice = IndiceConflitos.de(ind)
+    pesos = list(indice.pesos)
+    sorteios = 20000
+    contagem = Counter(indice.sorteia(rng) for _ in range(sorteios))
+    for col, peso in enumerate(pesos):
+        esperado = sorteios * peso / sum(pesos)
+        assert abs(contagem[col] - esperado) <= 5 * esperado ** 0.5 + 1
+    exceto = max(range(10), key=pesos.__getitem__)
+    assert all(indice.sorteia(rng, exceto=exceto) != exceto for _ in range(2000))
+    assert indice.pesos == pesos
+
+
+def test_sem_conflitos_nao_sorteia():
+    ind = Individuo(4, [1, 3, 0, 2])
+    indice = IndiceConflitos.de(ind)
+    assert indice.energia == 0
+    assert indice.sorteia(random.Random(0)) is None
+
+
+def test_mutacoes_dirigidas_e_avaliacao_liberam_o_indice():
+    rng = random.Random(2)
+    for mutacao in (mutacao_swap_conflitos, mutacao_par_conflitos, mutacao_min_conflitos):
+        for _ in range(50):
+            ind = Individuo(16, rng=rng)
+            mutacao(ind, rng=rng)
+            assert sorted(ind.genes) == list(range(16))
+            assert ind.indice is not None
+            assert ind.calc_conflitos() == Individuo(16, ind.genes).calc_conflitos()
+            assert ind.indice is None
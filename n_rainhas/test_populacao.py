@@ -0,0 +1,59 @@
+from individuo import Individuo
+from populacao import Populacao
+from aleatorio import cria_fluxo
+from adaptativo import CrossoverAdaptativo
+from main import CROSSOVERS, monta_operadores
+
+
+def _confere_fitness(pop):
+    for ind in pop.individuos:
+        assert ind.fitness_value == Individuo(pop.n, ind.genes).fitness(), ind
+
+
+def test_fitness_em_dia_com_crossover_adaptativo_e_mutacao():
+    # O crossover adaptativo avalia os filhos antes da mutação; o fitness
+    # guardado não pode sobreviver à mutação
+    pop = Populacao(12, 40, rng=cria_fluxo(0))
+    pop.inicializa()
+    pop.avalia()
+    operadores = monta_operadores({'selecao': 'torneio', 'mutacao': 'swap', 'elitismo': 'percentual'})
+    operadores['crossover'] = CrossoverAdaptativo(dict(CROSSOVERS))
+    operadores['p_mutacao'] = 0.5
+    for _ in range(20):
+        pop.gera_nova_geracao(**operadores)
+        _confere_fitness(pop)
+
+
+
+def test_reproducao_em_lote_avalia_os_filhos():
+    pop = Populacao(12, 41, rng=cria_fluxo(1), reproducao='lote')
+    pop.inicializa()
+    pop.avalia()
+    operadores = monta_operadores({'selecao': 'torneio', 'crossover': 'pmx', 'mutacao': 'swap',
+                                   'elitismo': 'percentual', 'elitismo_taxa': 0.1})
+    for _ in range(10):
+        pop.gera_nova_geracao(**operadores)
+        assert len(pop.individuos) == 41
+        assert all(sorted(ind.genes) == list(range(12)) for ind in pop.individuos)
+        _confere_fitness(pop)
+    assert pop.avaliacoes == 41 + 10 * (41 - 5)
+
+
+def test_mutacao_adaptativa_nao_reavalia_o_filho():
+    # A mutação adaptativa já deixa o filho avaliado: a população não o
+    # recalcula, e toda avaliação feita é contada uma única vez
+    pop = Populacao(12, 40, rng=cria_fluxo(2))
+    pop.inicializa()
+    pop.avalia()
+    operadores = monta_operadores({'selecao': 'torneio', 'crossover': 'pmx', 'mutacao': 'adaptativo',
+                                   'elitismo': 'percentual'})
+    operadores['p_mutacao'] = 0.5
+    mutacao = operadores['mutacao']
+    for _ in range(20):
+        avaliacoes = pop.avaliacoes + mutacao.avaliacoes
+        mutacoes = pop.mutacoes
+        pop.gera_nova_geracao(**operadores)
+        _confere_fitness(pop)
+        filhos = len(pop.individuos) - 4  # 10% de elitistas; número par, nenhum filho descartado
+        # Antes e depois da mutação, na mutação; os demais filhos, na população
+        assert pop.avaliacoes + mutacao.avaliacoes - avaliacoes == filhos + (pop.mutacoes - mutacoes)
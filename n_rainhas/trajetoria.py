@@ -0,0 +1,204 @@
+import argparse
+import struct
+import zlib
+from collections import namedtuple
+import numpy as np
+
+# Gravação da trajetória de uma execução: a população (genes e fitness) a
+# cada `intervalo` gerações, num arquivo binário compacto.
+#
+# Formato: cabeçalho MAGICO + (n, tamanho) em int32; depois um quadro por
+# snapshot: (geração uint32, tipo uint8, bytes uint32) e o conteúdo
+# comprimido com zlib. Conteúdo de um quadro:
+#   origem  int32[tamanho] - índice da linha idêntica no snapshot anterior,
+#                            ou -1 se a linha é nova
+#   novos   uint16/uint32[novas, n] - para as linhas novas, (genes - genes
+#                            da mesma linha no snapshot anterior) mod n
+#   fitness int32[tamanho]
+# Em quadros completos (a cada `intervalo_completo` snapshots) a referência
+# é uma matriz de zeros, então cada um pode ser lido sem os anteriores.
+
+MAGICO = b'NRTRAJ01'
+_CABECALHO = struct.Struct('<8sii')
+_QUADRO = struct.Struct('<IBI')
+COMPLETO, DELTA = 0, 1
+
+Snapshot = namedtuple('Snapshot', ['geracao', 'genes', 'fitness'])
+
+
+def matrizes_populacao(pop):
+    """(genes, fitness) da população atual como arrays, para qualquer backend."""
+    if hasattr(pop, 'atual'):  # PopulacaoMemmap, PopulacaoCompartilhada
+        return np.asarray(pop.atual.genes), np.asarray(pop.atual.fitness)
+    genes = np.array([ind.genes for ind in pop.individuos], dtype=np.int32)
+    fitness = np.array([ind.fitness_value for ind in pop.individuos], dtype=np.int32)
+    return genes, fitness
+
+
+def _tipo_delta(n):
+    return np.uint16 if n <= np.iinfo(np.uint16).max else np.uint32
+
+
+class GravadorTrajetoria:
+    """Grava snapshots da população em `caminho` (ver o formato acima)."""
+
+    def __init__(self, caminho, intervalo=10, intervalo_completo=50, nivel=1):
+        self.caminho = caminho
+        self.intervalo = max(1, intervalo)
+        self.intervalo_completo = max(1, intervalo_completo)
+        self.nivel = nivel
+        self._arquivo = None
+        self._anterior = None
+        self._snapshots = 0
+        self._ultima = None
+
+    @classmethod
+    def from_config(cls, config):
+        """Cria o gravador a partir do bloco 'trajetoria' da config, ou None."""
+        params = config.get('trajetoria')
+        if not params:
+            return None
+        return cls(params['arquivo'], params.get('intervalo', 10),
+                   params.get('intervalo_completo', 50), params.get('nivel', 1))
+
+    def registra(self, geracao, pop, forcar=False):
+        """Grava a população se a geração for múltipla do intervalo (ou se `forcar`)."""
+        if geracao == self._ultima or not (forcar or geracao % self.intervalo == 0):
+            return
+        genes, fitness = matrizes_populacao(pop)
+        self.grava(geracao, genes, fitness)
+
+    def grava(self, geracao, genes, fitness):
+        genes = np.ascontiguousarray(genes, dtype=np.int32)
+        tamanho, n = genes.shape
+        if self._arquivo is None:
+            self._arquivo = open(self.caminho, 'wb')
+            self._arquivo.write(_CABECALHO.pack(MAGICO, n, tamanho))
+
+        completo = self._anterior is None or self._snapshots % self.intervalo_completo == 0
+        if completo:
+            origem = np.full(tamanho, -1, dtype=np.int32)
+            referencia = np.zeros_like(genes)
+        else:
+            # Linhas que já existiam no snapshot anterior viram só um índice
+            anteriores = {linha.tobytes(): i for i, linha in enumerate(self._anterior)}
+            origem = np.fromiter((anteriores.get(linha.tobytes(), -1) for linha in genes),
+                                 dtype=np.int32, count=tamanho)
+            referencia = self._anterior
+        novas = origem < 0
+        delta = ((genes[novas] - referencia[novas]) % n).astype(_tipo_delta(n))
+        conteudo = zlib.compress(
+            origem.tobytes() + delta.tobytes() + np.asarray(fitness, dtype=np.int32).tobytes(),
+            self.nivel
+        )
+        self._arquivo.write(_QUADRO.pack(geracao, COMPLETO if completo else DELTA, len(conteudo)))
+        self._arquivo.write(conteudo)
+
+        self._anterior = genes.copy()
+        self._snapshots += 1
+        self._ultima = geracao
+
+    def fecha(self):
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fecha()
+
+
+class Trajetoria:
+    """
+    Leitura de um arquivo gravado por GravadorTrajetoria. Iterar devolve
+    os Snapshot(geracao, genes, fitness) em ordem, decodificando um por vez;
+    em(geracao) decodifica só a partir do quadro completo mais próximo.
+    """
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        with open(caminho, 'rb') as f:
+            magico, self.n, self.tamanho = _CABECALHO.unpack(f.read(_CABECALHO.size))
+        if magico != MAGICO:
+            raise ValueError(f"{caminho} não é um arquivo de trajetória")
+        self._indice = None
+
+    def _quadros(self, f):
+        """Percorre (geração, tipo, posição do conteúdo, bytes) sem descomprimir."""
+        f.seek(_CABECALHO.size)
+        while True:
+            bruto = f.read(_QUADRO.size)
+            if len(bruto) < _QUADRO.size:
+                return
+            geracao, tipo, comprimento = _QUADRO.unpack(bruto)
+            posicao = f.tell()
+            yield geracao, tipo, posicao, comprimento
+            f.seek(posicao + comprimento)
+
+    def indice(self):
+        """Lista de (geração, tipo) de todos os snapshots."""
+        if self._indice is None:
+            with open(self.caminho, 'rb') as f:
+                self._indice = list(self._quadros(f))
+        return [(geracao, tipo) for geracao, tipo, _, _ in self._indice]
+
+    def geracoes(self):
+        return [geracao for geracao, _ in self.indice()]
+
+    def _decodifica(self, conteudo, anterior):
+        dados = zlib.decompress(conteudo)
+        tamanho, n = self.tamanho, self.n
+        origem = np.frombuffer(dados, dtype=np.int32, count=tamanho)
+        novas = origem < 0
+        tipo_delta = _tipo_delta(n)
+        inicio_delta = 4 * tamanho
+        delta = np.frombuffer(dados, dtype=tipo_delta, count=int(novas.sum()) * n,
+                              offset=inicio_delta).reshape(-1, n)
+        fitness = np.frombuffer(dados, dtype=np.int32, count=tamanho,
+                                offset=inicio_delta + delta.nbytes)
+        genes = np.empty((tamanho, n), dtype=np.int32)
+        referencia = anterior if anterior is not None else np.zeros((tamanho, n), dtype=np.int32)
+        genes[novas] = (referencia[novas] + delta) % n
+        if not novas.all():
+            genes[~novas] = anterior[origem[~novas]]
+        return genes, fitness.copy()
+
+    def _le(self, f, quadros):
+        anterior = None
+        for geracao, tipo, posicao, comprimento in quadros:
+            f.seek(posicao)
+            conteudo = f.read(comprimento)
+            genes, fitness = self._decodifica(conteudo, None if tipo == COMPLETO else anterior)
+            anterior = genes
+            yield Snapshot(geracao, genes, fitness)
+
+    def __iter__(self):
+        with open(self.caminho, 'rb') as f:
+            yield from self._le(f, list(self._quadros(f)))
+
+    def em(self, geracao):
+        """Snapshot da geração pedida (precisa ter sido gravada)."""
+        self.indice()
+        alvo = next((i for i, q in enumerate(self._indice) if q[0] == geracao), None)
+        if alvo is None:
+            raise KeyError(f"Geração {geracao} não foi gravada")
+        inicio = max(i for i in range(alvo + 1) if self._indice[i][1] == COMPLETO)
+        with open(self.caminho, 'rb') as f:
+            for snapshot in self._le(f, self._indice[inicio:alvo + 1]):
+                pass
+        return snapshot
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Resumo de uma trajetória gravada')
+    parser.add_argument('arquivo')
+    args = parser.parse_args()
+    trajetoria = Trajetoria(args.arquivo)
+    print(f"n = {trajetoria.n}, população = {trajetoria.tamanho}")
+    print(f"{'geração':>8} {'f_max':>8} {'f_medio':>10} {'f_min':>8} {'distintos':>10}")
+    for snapshot in trajetoria:
+        distintos = len(np.unique(snapshot.genes, axis=0))
+        print(f"{snapshot.geracao:>8} {snapshot.fitness.max():>8} {snapshot.fitness.mean():>10.2f} "
+              f"{snapshot.fitness.min():>8} {distintos:>10}")